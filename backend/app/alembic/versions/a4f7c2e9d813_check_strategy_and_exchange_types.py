@@ -0,0 +1,62 @@
+"""check strategy and exchange types
+
+Revision ID: a4f7c2e9d813
+Revises: c3d5e8f1a2b4
+Create Date: 2026-10-16 09:12:44.503118
+
+strategy_type and exchange_type used to be free-form VARCHAR columns (the
+routes only uppercased them). The models now load them through non-native
+SAEnum(StrategyType/ExchangeType), which raises LookupError on any value
+outside the enum. This revision uppercases stray values and refuses to
+proceed while a row still holds an unknown type, so the problem surfaces
+here instead of as a 500 on the first read.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f7c2e9d813'
+down_revision = 'c3d5e8f1a2b4'
+branch_labels = None
+depends_on = None
+
+
+# 이 리비전 시점의 StrategyType / ExchangeType 값 (모델 enum을 import하지 않고 고정)
+TYPE_COLUMNS = {
+    ('tradingstrategy', 'strategy_type'): ('GRID', 'REBALANCING', 'DCA'),
+    ('userapikey', 'exchange_type'): ('KIS', 'UPBIT'),
+}
+
+
+def upgrade():
+    conn = op.get_bind()
+    unknown = []
+    for (table, column), allowed in TYPE_COLUMNS.items():
+        conn.execute(
+            sa.text(
+                f'UPDATE {table} SET {column} = upper({column}) '
+                f'WHERE {column} <> upper({column})'
+            )
+        )
+        rows = conn.execute(
+            sa.text(
+                f'SELECT {column}, count(*) FROM {table} '
+                f'WHERE {column} NOT IN :allowed GROUP BY {column}'
+            ).bindparams(sa.bindparam('allowed', expanding=True)),
+            {'allowed': list(allowed)},
+        ).all()
+        unknown.extend(f'{table}.{column}={value!r} ({count} rows)' for value, count in rows)
+
+    if unknown:
+        raise RuntimeError(
+            'Rows with types outside the enum must be migrated or deleted first: '
+            + ', '.join(unknown)
+        )
+
+
+def downgrade():
+    # 대문자 정규화는 되돌릴 필요가 없음 (기존 라우트도 대문자로 저장)
+    pass
@@ -0,0 +1,39 @@
+"""add price data covering index
+
+Revision ID: b7e4d2c91a05
+Revises: 3f1c2a9b7d41
+Create Date: 2026-01-06 09:41:27.552903
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7e4d2c91a05'
+down_revision = '3f1c2a9b7d41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # pricedata는 대용량 테이블이므로 쓰기를 막지 않도록 CONCURRENTLY로 생성
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_price_data_symbol_tf_time_ohlcv',
+            'pricedata',
+            ['symbol_id', 'timeframe', sa.text('timestamp DESC')],
+            unique=False,
+            postgresql_include=['open_price', 'high_price', 'low_price', 'close_price', 'volume'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'idx_price_data_symbol_tf_time_ohlcv',
+            table_name='pricedata',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,70 @@
+"""extend price data covering index
+
+Revision ID: c3d5e8f1a2b4
+Revises: f740008df14b
+Create Date: 2026-10-15 23:52:08.114203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3d5e8f1a2b4'
+down_revision = 'f740008df14b'
+branch_labels = None
+depends_on = None
+
+
+OHLCV_COLUMNS = ['open_price', 'high_price', 'low_price', 'close_price', 'volume']
+
+
+def upgrade():
+    # 새 인덱스를 먼저 만든 뒤 기존 인덱스를 제거해 조회가 인덱스 없이 도는 구간을 없앰
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_price_data_symbol_tf_time_id_ohlcv',
+            'pricedata',
+            ['symbol_id', 'timeframe', sa.text('timestamp DESC'), sa.text('id DESC')],
+            unique=False,
+            postgresql_include=OHLCV_COLUMNS,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'idx_price_data_symbol_tf_time_ohlcv',
+            table_name='pricedata',
+            postgresql_concurrently=True,
+        )
+        # 새 인덱스의 키 (symbol_id, timeframe, timestamp DESC, id DESC)가 기존
+        # keyset 인덱스 (symbol_id, timeframe, timestamp, id)를 양방향 스캔으로
+        # 완전히 대체하므로, 쓰기 부하가 큰 pricedata에서 중복 인덱스를 제거
+        op.drop_index(
+            'idx_price_data_symbol_tf_time_id',
+            table_name='pricedata',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'idx_price_data_symbol_tf_time_id',
+            'pricedata',
+            ['symbol_id', 'timeframe', 'timestamp', 'id'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'idx_price_data_symbol_tf_time_ohlcv',
+            'pricedata',
+            ['symbol_id', 'timeframe', sa.text('timestamp DESC')],
+            unique=False,
+            postgresql_include=OHLCV_COLUMNS,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'idx_price_data_symbol_tf_time_id_ohlcv',
+            table_name='pricedata',
+            postgresql_concurrently=True,
+        )
@@ -0,0 +1,137 @@
+"""store api credentials as one token
+
+Revision ID: f740008df14b
+Revises: f269f366bfb6
+Create Date: 2026-10-15 23:18:40.682387
+
+"""
+import hashlib
+import os
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = 'f740008df14b'
+down_revision = 'f269f366bfb6'
+branch_labels = None
+depends_on = None
+
+
+userapikey = sa.table(
+    'userapikey',
+    sa.column('id', sa.Integer),
+    sa.column('encrypted_api_key', sa.String),
+    sa.column('encrypted_api_secret', sa.String),
+    sa.column('encrypted_credentials', sa.String),
+)
+
+
+# Frozen copy of app.core.encryption as of this revision, so later changes to
+# the live module cannot change what this migration reads or writes.
+_TOKEN_PREFIX = "v2:"
+_NONCE_SIZE = 12
+_CREDENTIALS_SEPARATOR = "\x1f"
+
+
+def _aead():
+    return AESGCM(
+        HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"wombat-api-credentials",
+        ).derive(settings.SECRET_KEY.encode())
+    )
+
+
+def _fernet():
+    key = settings.SECRET_KEY.encode()
+    if len(key) < 32:
+        key = key.ljust(32, b"0")
+    try:
+        return Fernet(key)
+    except Exception:
+        return Fernet(urlsafe_b64encode(hashlib.sha256(settings.SECRET_KEY.encode()).digest()))
+
+
+def _encrypt(aead, plain_text):
+    if not plain_text:
+        return ""
+    nonce = os.urandom(_NONCE_SIZE)
+    encrypted = aead.encrypt(nonce, plain_text.encode(), None)
+    return _TOKEN_PREFIX + urlsafe_b64encode(nonce + encrypted).decode()
+
+
+def _decrypt(aead, fernet, encrypted_text):
+    if not encrypted_text:
+        return ""
+    if not encrypted_text.startswith(_TOKEN_PREFIX):
+        return fernet.decrypt(encrypted_text.encode()).decode()
+    data = urlsafe_b64decode(encrypted_text[len(_TOKEN_PREFIX):])
+    return aead.decrypt(data[:_NONCE_SIZE], data[_NONCE_SIZE:], None).decode()
+
+
+def upgrade():
+    op.add_column('userapikey', sa.Column('encrypted_credentials', sqlmodel.sql.sqltypes.AutoString(length=3000), nullable=True))
+
+    # Re-encrypt the separately stored key/secret (AES-GCM or legacy Fernet) as one token
+    aead, fernet = _aead(), _fernet()
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(userapikey.c.id, userapikey.c.encrypted_api_key, userapikey.c.encrypted_api_secret)
+    ).all()
+    for row in rows:
+        plain_key = _decrypt(aead, fernet, row.encrypted_api_key)
+        plain_secret = _decrypt(aead, fernet, row.encrypted_api_secret)
+        if _CREDENTIALS_SEPARATOR in plain_key:
+            raise ValueError(f"API key {row.id} contains the \\x1f character")
+        conn.execute(
+            userapikey.update()
+            .where(userapikey.c.id == row.id)
+            .values(
+                encrypted_credentials=_encrypt(
+                    aead, plain_key + _CREDENTIALS_SEPARATOR + plain_secret
+                )
+            )
+        )
+
+    op.alter_column('userapikey', 'encrypted_credentials', nullable=False)
+    op.drop_column('userapikey', 'encrypted_api_secret')
+    op.drop_column('userapikey', 'encrypted_api_key')
+
+
+def downgrade():
+    op.add_column('userapikey', sa.Column('encrypted_api_key', sa.VARCHAR(length=1000), autoincrement=False, nullable=True))
+    op.add_column('userapikey', sa.Column('encrypted_api_secret', sa.VARCHAR(length=1000), autoincrement=False, nullable=True))
+
+    aead, fernet = _aead(), _fernet()
+    conn = op.get_bind()
+    rows = conn.execute(
+        sa.select(userapikey.c.id, userapikey.c.encrypted_credentials)
+    ).all()
+    for row in rows:
+        plain_key, _, plain_secret = _decrypt(
+            aead, fernet, row.encrypted_credentials
+        ).partition(_CREDENTIALS_SEPARATOR)
+        conn.execute(
+            userapikey.update()
+            .where(userapikey.c.id == row.id)
+            .values(
+                encrypted_api_key=_encrypt(aead, plain_key),
+                encrypted_api_secret=_encrypt(aead, plain_secret),
+            )
+        )
+
+    op.alter_column('userapikey', 'encrypted_api_key', nullable=False)
+    op.alter_column('userapikey', 'encrypted_api_secret', nullable=False)
+    op.drop_column('userapikey', 'encrypted_credentials')
@@ -1,30 +1,24 @@
+from importlib import import_module
+
 from fastapi import APIRouter
 
-from app.api.routes import (
-    exchanges,
-    login,
-    price_data,
-    private,
-    realtime_price,
-    symbols,
-    trading_strategies,
-    user_api_keys,
-    users,
-    utils,
-)
 from app.core.config import settings
 
-api_router = APIRouter()
-api_router.include_router(login.router)
-api_router.include_router(users.router)
-api_router.include_router(utils.router)
-api_router.include_router(exchanges.router)
-api_router.include_router(symbols.router)
-api_router.include_router(price_data.router)
-api_router.include_router(realtime_price.router)
-api_router.include_router(user_api_keys.router)
-api_router.include_router(trading_strategies.router)
-
+# (module name under app.api.routes, enabled) - disabled modules are not imported
+ROUTER_SPECS: list[tuple[str, bool]] = [
+    ("login", True),
+    ("users", True),
+    ("utils", True),
+    ("exchanges", True),
+    ("symbols", True),
+    ("price_data", settings.ENABLE_PRICE_DATA),
+    ("realtime_price", settings.ENABLE_REALTIME_PRICE),
+    ("user_api_keys", True),
+    ("trading_strategies", settings.ENABLE_TRADING_STRATEGIES),
+    ("private", settings.ENVIRONMENT == "local"),
+]
 
-if settings.ENVIRONMENT == "local":
-    api_router.include_router(private.router)
+api_router = APIRouter()
+for name, enabled in ROUTER_SPECS:
+    if enabled:
+        api_router.include_router(import_module(f"app.api.routes.{name}").router)
@@ -1,12 +1,12 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import func, select
+from sqlalchemy.exc import IntegrityError
 
 from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.core.cache import exchanges_cache
 from app.crud import exchanges as crud_exchange
 from app.models.exchanges import (
-    Exchange,
     ExchangeCreate,
     ExchangePublic,
     ExchangesPublic,
@@ -19,18 +19,38 @@ router = APIRouter(prefix="/exchanges", tags=["exchanges"])
 
 @router.get("/", response_model=ExchangesPublic)
 def read_exchanges(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: int | None = None,
 ) -> Any:
     """
     Retrieve exchanges.
+
+    Pass the previous page's `next_cursor` as `after_id` for keyset pagination;
+    `count` is always the total number of exchanges.
     """
-    count_statement = select(func.count()).select_from(Exchange)
-    count = session.exec(count_statement).one()
+    cache_key = (skip, limit, after_id)
+    cached = exchanges_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    statement = select(Exchange).offset(skip).limit(limit)
-    exchanges = session.exec(statement).all()
+    exchanges, count = crud_exchange.get_exchanges(
+        session=session, skip=skip, limit=limit, after_id=after_id
+    )
+    has_more = (
+        len(exchanges) == limit
+        if after_id is not None
+        else skip + len(exchanges) < count
+    )
+    next_cursor = exchanges[-1].id if exchanges and has_more else None
 
-    return {"data": exchanges, "count": count}
+    result = ExchangesPublic.model_validate(
+        {"data": exchanges, "count": count, "next_cursor": next_cursor}
+    )
+    exchanges_cache.set(cache_key, result)
+    return result
 
 
 @router.post(
@@ -42,10 +62,7 @@ def create_exchange(*, session: SessionDep, exchange_in: ExchangeCreate) -> Any:
     """
     Create new exchange.
     """
-    exchange = crud_exchange.get_exchange_by_code(
-        session=session, code=exchange_in.code
-    )
-    if exchange:
+    if crud_exchange.get_exchange_id_by_code(session=session, code=exchange_in.code):
         raise HTTPException(
             status_code=400,
             detail="The exchange with this code already exists in the system.",
@@ -54,6 +71,7 @@ def create_exchange(*, session: SessionDep, exchange_in: ExchangeCreate) -> Any:
     exchange = crud_exchange.create_exchange(
         session=session, exchange_create=exchange_in
     )
+    exchanges_cache.clear()
     return exchange
 
 
@@ -97,25 +115,22 @@ def update_exchange(
     """
     Update an exchange.
     """
-    db_exchange = crud_exchange.get_exchange(session=session, exchange_id=exchange_id)
+    # Let the unique index on code reject collisions atomically
+    try:
+        db_exchange = crud_exchange.update_exchange_by_id(
+            session=session, exchange_id=exchange_id, exchange_in=exchange_in
+        )
+    except IntegrityError:
+        session.rollback()
+        raise HTTPException(
+            status_code=409, detail="Exchange with this code already exists"
+        )
     if not db_exchange:
         raise HTTPException(
             status_code=404,
             detail="The exchange with this id does not exist in the system",
         )
-
-    if exchange_in.code:
-        existing_exchange = crud_exchange.get_exchange_by_code(
-            session=session, code=exchange_in.code
-        )
-        if existing_exchange and existing_exchange.id != exchange_id:
-            raise HTTPException(
-                status_code=409, detail="Exchange with this code already exists"
-            )
-
-    db_exchange = crud_exchange.update_exchange(
-        session=session, db_exchange=db_exchange, exchange_in=exchange_in
-    )
+    exchanges_cache.clear()
     return db_exchange
 
 
@@ -124,13 +139,11 @@ def delete_exchange(session: SessionDep, exchange_id: int) -> Message:
     """
     Delete an exchange.
     """
-    exchange = crud_exchange.get_exchange(session=session, exchange_id=exchange_id)
-    if not exchange:
-        raise HTTPException(status_code=404, detail="Exchange not found")
-
     success = crud_exchange.delete_exchange(session=session, exchange_id=exchange_id)
     if not success:
-        raise HTTPException(status_code=500, detail="Failed to delete exchange")
+        raise HTTPException(status_code=404, detail="Exchange not found")
+
+    exchanges_cache.clear()
 
     return Message(message="Exchange deleted successfully")
 
@@ -1,14 +1,25 @@
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import func, select
-
-from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from psycopg.errors import ForeignKeyViolation
+from pydantic_core import to_json
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from app.api.deps import (
+    CurrentUser,
+    SessionDep,
+    get_current_active_superuser,
+    get_current_user,
+)
+from app.core.cache import latest_price_data_cache, price_data_page_cache
+from app.core.db import engine
 from app.crud import price_data as crud_price_data
 from app.crud import symbols as crud_symbol
 from app.models.price_data import (
-    PriceData,
     PriceDataCreate,
     PriceDataListPublic,
     PriceDataPublic,
@@ -31,40 +42,123 @@ def read_price_data_by_symbol(
     end_time: datetime | None = Query(None, description="종료 시간 (ISO 8601 형식)"),
     skip: int = 0,
     limit: int = Query(default=100, le=1000),
+    after_timestamp: datetime | None = Query(
+        None, description="keyset 커서: 이전 페이지 마지막 행의 timestamp"
+    ),
+    after_id: int | None = Query(
+        None, description="keyset 커서: 이전 페이지의 next_cursor"
+    ),
+    fields: list[str] | None = Query(
+        None,
+        description="반환할 컬럼 (예: fields=close_price&fields=volume). "
+        "id, timestamp는 항상 포함",
+    ),
 ) -> Any:
     """
     특정 종목의 가격 데이터 조회
 
     시간 범위를 지정하여 필터링 가능
+    after_timestamp와 after_id를 함께 전달하면 OFFSET 대신 keyset 페이지네이션 사용
+    (next_cursor는 id만 담으므로 after_timestamp는 이전 페이지 마지막 행의 timestamp)
+    fields를 지정하면 해당 컬럼만 조회하여 반환
     """
     # 종목 존재 확인
-    symbol = crud_symbol.get_symbol(session=session, symbol_id=symbol_id)
-    if not symbol:
+    if not crud_symbol.symbol_exists(session=session, symbol_id=symbol_id):
         raise HTTPException(status_code=404, detail="Symbol not found")
 
-    # 조건에 맞는 전체 개수 조회
-    count_statement = select(func.count()).select_from(PriceData).where(
-        PriceData.symbol_id == symbol_id, PriceData.timeframe == timeframe
-    )
-    if start_time:
-        count_statement = count_statement.where(PriceData.timestamp >= start_time)
-    if end_time:
-        count_statement = count_statement.where(PriceData.timestamp <= end_time)
+    if (after_timestamp is None) != (after_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail="after_timestamp and after_id must be provided together",
+        )
+    is_keyset = after_id is not None
 
-    count = session.exec(count_statement).one()
+    if fields:
+        unknown_fields = set(fields) - crud_price_data.PRICE_DATA_FIELDS
+        if unknown_fields:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fields: {sorted(unknown_fields)}"
+            )
 
-    # 가격 데이터 조회
-    price_data_list = crud_price_data.get_price_data_by_symbol(
+    # 범위를 봉 격자에 맞춰 반복되는 대시보드 요청이 같은 캐시 키를 쓰도록 함
+    start_time, end_time = crud_price_data.snap_time_range(
+        start_time, end_time, timeframe
+    )
+    cache_key = (
+        symbol_id,
+        timeframe,
+        start_time,
+        end_time,
+        skip,
+        limit,
+        after_timestamp,
+        after_id,
+        tuple(fields) if fields else None,
+    )
+    cached = price_data_page_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
+    # 최대 1000행을 반환하는 읽기 전용 경로이므로 ORM 객체 생성과 response_model
+    # 재검증을 건너뛰고 Core 행 매핑을 pydantic-core로 바로 직렬화
+    # (스키마 문서는 response_model 유지)
+    rows, count = crud_price_data.get_price_data_fields_by_symbol(
         session=session,
         symbol_id=symbol_id,
         timeframe=timeframe,
+        fields=fields or None,
         start_time=start_time,
         end_time=end_time,
         skip=skip,
         limit=limit,
+        after_timestamp=after_timestamp,
+        after_id=after_id,
     )
+    # count는 커서와 무관한 전체 개수이므로 keyset 모드에서는 페이지가 꽉 찼는지로 판단
+    has_more = len(rows) == limit if is_keyset else skip + len(rows) < count
+    next_cursor = rows[-1]["id"] if rows and has_more else None
+    body = to_json({"data": rows, "count": count, "next_cursor": next_cursor})
+    price_data_page_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
+@router.get(
+    "/symbol/{symbol_id}/stream", dependencies=[Depends(get_current_user)]
+)
+def stream_price_data_by_symbol(
+    symbol_id: int,
+    session: SessionDep,
+    timeframe: str = Query(..., description="시간 프레임 (예: 1d, 1h, 5m)"),
+    start_time: datetime | None = Query(
+        None, description="시작 시간 (ISO 8601 형식)"
+    ),
+    end_time: datetime | None = Query(None, description="종료 시간 (ISO 8601 형식)"),
+    limit: int | None = Query(default=None, ge=1, description="최대 행 수"),
+) -> StreamingResponse:
+    """
+    특정 종목의 가격 데이터를 NDJSON으로 스트리밍
+
+    한 줄에 하나의 가격 데이터(JSON)를 최신순으로 전송하며, 서버 사이드 커서로
+    읽어 요청당 메모리 사용량이 결과 크기와 무관하게 일정
+    """
+    # 종목 존재 확인
+    if not crud_symbol.symbol_exists(session=session, symbol_id=symbol_id):
+        raise HTTPException(status_code=404, detail="Symbol not found")
+
+    def generate() -> Iterator[bytes]:
+        # 의존성 세션은 응답 전송 전에 닫히므로 스트리밍 동안 사용할 세션을 따로 연다
+        with Session(engine) as stream_session:
+            for row in crud_price_data.iter_price_data_by_symbol(
+                session=stream_session,
+                symbol_id=symbol_id,
+                timeframe=timeframe,
+                start_time=start_time,
+                end_time=end_time,
+                limit=limit,
+            ):
+                yield to_json(row) + b"\n"
 
-    return {"data": price_data_list, "count": count}
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @router.get("/symbol/{symbol_id}/latest", response_model=PriceDataPublic)
@@ -77,9 +171,13 @@ def read_latest_price_data(
     """
     특정 종목의 가장 최신 가격 데이터 조회
     """
+    cache_key = (symbol_id, timeframe)
+    cached = latest_price_data_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # 종목 존재 확인
-    symbol = crud_symbol.get_symbol(session=session, symbol_id=symbol_id)
-    if not symbol:
+    if not crud_symbol.symbol_exists(session=session, symbol_id=symbol_id):
         raise HTTPException(status_code=404, detail="Symbol not found")
 
     price_data = crud_price_data.get_latest_price_data(
@@ -92,7 +190,9 @@ def read_latest_price_data(
             detail=f"No price data found for symbol_id={symbol_id}, timeframe={timeframe}",
         )
 
-    return price_data
+    result = PriceDataPublic.model_validate(price_data)
+    latest_price_data_cache.set(cache_key, result)
+    return result
 
 
 @router.post(
@@ -105,8 +205,9 @@ def create_price_data(*, session: SessionDep, price_data_in: PriceDataCreate) ->
     새로운 가격 데이터 생성
     """
     # 종목 존재 확인
-    symbol = crud_symbol.get_symbol(session=session, symbol_id=price_data_in.symbol_id)
-    if not symbol:
+    if not crud_symbol.symbol_exists(
+        session=session, symbol_id=price_data_in.symbol_id
+    ):
         raise HTTPException(status_code=404, detail="Symbol not found")
 
     # 중복 확인
@@ -122,9 +223,21 @@ def create_price_data(*, session: SessionDep, price_data_in: PriceDataCreate) ->
             detail="Price data with this symbol_id, timestamp, and timeframe already exists",
         )
 
-    price_data = crud_price_data.create_price_data(
-        session=session, price_data_create=price_data_in
-    )
+    # symbol_exists는 프로세스별 캐시라 다른 워커에서 삭제된 종목은 FK 위반으로 드러남
+    try:
+        price_data = crud_price_data.create_price_data(
+            session=session, price_data_create=price_data_in
+        )
+    except IntegrityError as e:
+        session.rollback()
+        if isinstance(e.orig, ForeignKeyViolation):
+            raise HTTPException(status_code=404, detail="Symbol not found")
+        raise HTTPException(
+            status_code=400,
+            detail="Price data with this symbol_id, timestamp, and timeframe already exists",
+        )
+    latest_price_data_cache.delete((price_data_in.symbol_id, price_data_in.timeframe))
+    price_data_page_cache.clear()
     return price_data
 
 
@@ -144,34 +257,23 @@ def bulk_create_price_data(
     if not price_data_list:
         raise HTTPException(status_code=400, detail="Empty price data list")
 
-    # 모든 symbol_id 존재 확인
+    # 모든 symbol_id 존재 확인 (단일 IN 쿼리)
     symbol_ids = {item.symbol_id for item in price_data_list}
-    for symbol_id in symbol_ids:
-        symbol = crud_symbol.get_symbol(session=session, symbol_id=symbol_id)
-        if not symbol:
-            raise HTTPException(
-                status_code=404, detail=f"Symbol with id={symbol_id} not found"
-            )
-
-    # 중복 제거: 기존 데이터 필터링
-    filtered_list = []
-    for item in price_data_list:
-        existing = crud_price_data.get_price_data_by_timestamp(
-            session=session,
-            symbol_id=item.symbol_id,
-            timestamp=item.timestamp,
-            timeframe=item.timeframe,
+    missing_ids = symbol_ids - crud_symbol.get_existing_symbol_ids(
+        session=session, symbol_ids=symbol_ids
+    )
+    if missing_ids:
+        raise HTTPException(
+            status_code=404, detail=f"Symbols with ids={sorted(missing_ids)} not found"
         )
-        if not existing:
-            filtered_list.append(item)
-
-    if not filtered_list:
-        return {"data": [], "count": 0}
 
-    # 대량 삽입
+    # 대량 삽입 (기존 데이터와 중복된 항목은 DB에서 ON CONFLICT로 스킵)
     created_data = crud_price_data.bulk_create_price_data(
-        session=session, price_data_list=filtered_list
+        session=session, price_data_list=price_data_list
     )
+    for item in price_data_list:
+        latest_price_data_cache.delete((item.symbol_id, item.timeframe))
+    price_data_page_cache.clear()
 
     return {"data": created_data, "count": len(created_data)}
 
@@ -207,48 +309,34 @@ def update_price_data(
 
     주의: 일반적으로 가격 데이터는 불변이므로 이 API는 신중하게 사용해야 합니다
     """
-    db_price_data = crud_price_data.get_price_data(
-        session=session, price_data_id=price_data_id
-    )
+    # symbol_id가 전달된 경우 종목 존재 확인 (캐시 조회라 기존 행을 먼저 읽지 않음)
+    if "symbol_id" in price_data_in.model_fields_set:
+        if not crud_symbol.symbol_exists(
+            session=session, symbol_id=price_data_in.symbol_id
+        ):
+            raise HTTPException(status_code=404, detail="Symbol not found")
+
+    # 사전 조회 없이 UPDATE ... RETURNING 한 번으로 수정,
+    # unique constraint 위반은 DB가 UPDATE 시점에 원자적으로 검사
+    try:
+        db_price_data = crud_price_data.update_price_data_by_id(
+            session=session, price_data_id=price_data_id, price_data_in=price_data_in
+        )
+    except IntegrityError as e:
+        session.rollback()
+        if isinstance(e.orig, ForeignKeyViolation):
+            raise HTTPException(status_code=404, detail="Symbol not found")
+        raise HTTPException(
+            status_code=409,
+            detail="Price data with this symbol_id, timestamp, and timeframe already exists",
+        )
     if not db_price_data:
         raise HTTPException(
             status_code=404,
             detail="The price data with this id does not exist in the system",
         )
-
-    # symbol_id가 변경되는 경우 해당 symbol 존재 확인
-    if price_data_in.symbol_id and price_data_in.symbol_id != db_price_data.symbol_id:
-        symbol = crud_symbol.get_symbol(
-            session=session, symbol_id=price_data_in.symbol_id
-        )
-        if not symbol:
-            raise HTTPException(status_code=404, detail="Symbol not found")
-
-    # unique constraint 위반 확인
-    if (
-        price_data_in.symbol_id
-        or price_data_in.timestamp
-        or price_data_in.timeframe
-    ):
-        check_symbol_id = price_data_in.symbol_id or db_price_data.symbol_id
-        check_timestamp = price_data_in.timestamp or db_price_data.timestamp
-        check_timeframe = price_data_in.timeframe or db_price_data.timeframe
-
-        existing = crud_price_data.get_price_data_by_timestamp(
-            session=session,
-            symbol_id=check_symbol_id,
-            timestamp=check_timestamp,
-            timeframe=check_timeframe,
-        )
-        if existing and existing.id != price_data_id:
-            raise HTTPException(
-                status_code=409,
-                detail="Price data with this symbol_id, timestamp, and timeframe already exists",
-            )
-
-    db_price_data = crud_price_data.update_price_data(
-        session=session, db_price_data=db_price_data, price_data_in=price_data_in
-    )
+    latest_price_data_cache.clear()
+    price_data_page_cache.clear()
     return db_price_data
 
 
@@ -259,17 +347,14 @@ def delete_price_data(session: SessionDep, price_data_id: int) -> Message:
     """
     가격 데이터 삭제
     """
-    price_data = crud_price_data.get_price_data(
-        session=session, price_data_id=price_data_id
-    )
-    if not price_data:
-        raise HTTPException(status_code=404, detail="Price data not found")
-
     success = crud_price_data.delete_price_data(
         session=session, price_data_id=price_data_id
     )
     if not success:
-        raise HTTPException(status_code=500, detail="Failed to delete price data")
+        raise HTTPException(status_code=404, detail="Price data not found")
+
+    latest_price_data_cache.clear()
+    price_data_page_cache.clear()
 
     return Message(message="Price data deleted successfully")
 
@@ -291,13 +376,14 @@ def delete_price_data_by_symbol(
     timeframe을 지정하지 않으면 해당 종목의 모든 가격 데이터를 삭제합니다
     """
     # 종목 존재 확인
-    symbol = crud_symbol.get_symbol(session=session, symbol_id=symbol_id)
-    if not symbol:
+    if not crud_symbol.symbol_exists(session=session, symbol_id=symbol_id):
         raise HTTPException(status_code=404, detail="Symbol not found")
 
     deleted_count = crud_price_data.delete_price_data_by_symbol(
         session=session, symbol_id=symbol_id, timeframe=timeframe
     )
+    latest_price_data_cache.clear()
+    price_data_page_cache.clear()
 
     return Message(
         message=f"Deleted {deleted_count} price data records for symbol_id={symbol_id}"
@@ -1,13 +1,15 @@
+from datetime import datetime
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import func, select
+from psycopg.errors import ForeignKeyViolation
+from sqlalchemy.exc import IntegrityError
 
 from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.core.cache import realtime_price_cache
 from app.crud import realtime_price as crud_realtime_price
 from app.crud import symbols as crud_symbol
 from app.models.realtime_price import (
-    RealtimePrice,
     RealtimePriceCreate,
     RealtimePriceListPublic,
     RealtimePricePublic,
@@ -24,20 +26,41 @@ def read_realtime_prices(
     current_user: CurrentUser,
     skip: int = 0,
     limit: int = Query(default=100, le=1000),
+    after_updated_at: datetime | None = Query(
+        None, description="keyset 커서: 이전 페이지 마지막 행의 updated_at"
+    ),
+    after_id: int | None = Query(
+        None, description="keyset 커서: 이전 페이지의 next_cursor"
+    ),
 ) -> Any:
     """
     모든 실시간 가격 데이터 조회 (페이지네이션)
-    """
-    # 전체 개수 조회
-    count_statement = select(func.count()).select_from(RealtimePrice)
-    count = session.exec(count_statement).one()
 
-    # 실시간 가격 데이터 조회
-    realtime_prices = crud_realtime_price.get_realtime_prices(
-        session=session, skip=skip, limit=limit
+    after_updated_at와 after_id를 함께 전달하면 OFFSET 대신 keyset 페이지네이션 사용
+    (next_cursor는 id만 담으므로 after_updated_at은 이전 페이지 마지막 행의 updated_at)
+    """
+    if (after_updated_at is None) != (after_id is None):
+        raise HTTPException(
+            status_code=400,
+            detail="after_updated_at and after_id must be provided together",
+        )
+    # 실시간 가격 데이터와 전체 개수를 한 번에 조회
+    realtime_prices, count = crud_realtime_price.get_realtime_prices(
+        session=session,
+        skip=skip,
+        limit=limit,
+        after_updated_at=after_updated_at,
+        after_id=after_id,
+    )
+    is_keyset = after_id is not None
+    has_more = (
+        len(realtime_prices) == limit
+        if is_keyset
+        else skip + len(realtime_prices) < count
     )
+    next_cursor = realtime_prices[-1].id if realtime_prices and has_more else None
 
-    return {"data": realtime_prices, "count": count}
+    return {"data": realtime_prices, "count": count, "next_cursor": next_cursor}
 
 
 @router.get("/symbol/{symbol_id}", response_model=RealtimePricePublic)
@@ -49,9 +72,12 @@ def read_realtime_price_by_symbol(
     """
     특정 종목의 실시간 가격 데이터 조회
     """
+    cached = realtime_price_cache.get(symbol_id)
+    if cached is not None:
+        return cached
+
     # 종목 존재 확인
-    symbol = crud_symbol.get_symbol(session=session, symbol_id=symbol_id)
-    if not symbol:
+    if not crud_symbol.symbol_exists(session=session, symbol_id=symbol_id):
         raise HTTPException(status_code=404, detail="Symbol not found")
 
     realtime_price = crud_realtime_price.get_realtime_price_by_symbol(
@@ -64,7 +90,9 @@ def read_realtime_price_by_symbol(
             detail=f"No realtime price data found for symbol_id={symbol_id}",
         )
 
-    return realtime_price
+    result = RealtimePricePublic.model_validate(realtime_price)
+    realtime_price_cache.set(symbol_id, result)
+    return result
 
 
 @router.post("/symbols", response_model=RealtimePriceListPublic)
@@ -79,18 +107,23 @@ def read_realtime_prices_by_symbols(
     if not symbol_ids:
         raise HTTPException(status_code=400, detail="Empty symbol_ids list")
 
-    # 모든 symbol_id 존재 확인
-    for symbol_id in symbol_ids:
-        symbol = crud_symbol.get_symbol(session=session, symbol_id=symbol_id)
-        if not symbol:
-            raise HTTPException(
-                status_code=404, detail=f"Symbol with id={symbol_id} not found"
-            )
-
+    unique_ids = set(symbol_ids)
     realtime_prices = crud_realtime_price.get_realtime_prices_by_symbols(
-        session=session, symbol_ids=symbol_ids
+        session=session, symbol_ids=unique_ids
     )
 
+    # 실시간 가격이 있는 종목은 FK로 존재가 보장되므로 나머지만 존재 확인
+    without_price = unique_ids - {item.symbol_id for item in realtime_prices}
+    if without_price:
+        missing_ids = without_price - crud_symbol.get_existing_symbol_ids(
+            session=session, symbol_ids=without_price
+        )
+        if missing_ids:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Symbols with ids={sorted(missing_ids)} not found",
+            )
+
     return {"data": realtime_prices, "count": len(realtime_prices)}
 
 
@@ -106,10 +139,9 @@ def create_realtime_price(
     새로운 실시간 가격 데이터 생성
     """
     # 종목 존재 확인
-    symbol = crud_symbol.get_symbol(
+    if not crud_symbol.symbol_exists(
         session=session, symbol_id=realtime_price_in.symbol_id
-    )
-    if not symbol:
+    ):
         raise HTTPException(status_code=404, detail="Symbol not found")
 
     # 중복 확인
@@ -122,9 +154,20 @@ def create_realtime_price(
             detail=f"Realtime price data for symbol_id={realtime_price_in.symbol_id} already exists. Use PATCH to update or POST /upsert to create or update.",
         )
 
-    realtime_price = crud_realtime_price.create_realtime_price(
-        session=session, realtime_price_create=realtime_price_in
-    )
+    # symbol_exists는 프로세스별 캐시라 다른 워커에서 삭제된 종목은 FK 위반으로 드러남
+    try:
+        realtime_price = crud_realtime_price.create_realtime_price(
+            session=session, realtime_price_create=realtime_price_in
+        )
+    except IntegrityError as e:
+        session.rollback()
+        if isinstance(e.orig, ForeignKeyViolation):
+            raise HTTPException(status_code=404, detail="Symbol not found")
+        raise HTTPException(
+            status_code=409,
+            detail=f"Realtime price data for symbol_id={realtime_price_in.symbol_id} already exists",
+        )
+    realtime_price_cache.delete(realtime_price_in.symbol_id)
     return realtime_price
 
 
@@ -142,15 +185,21 @@ def upsert_realtime_price(
     동일한 symbol_id가 존재하면 업데이트, 없으면 생성
     """
     # 종목 존재 확인
-    symbol = crud_symbol.get_symbol(
+    if not crud_symbol.symbol_exists(
         session=session, symbol_id=realtime_price_in.symbol_id
-    )
-    if not symbol:
+    ):
         raise HTTPException(status_code=404, detail="Symbol not found")
 
-    realtime_price = crud_realtime_price.upsert_realtime_price(
-        session=session, realtime_price_create=realtime_price_in
-    )
+    try:
+        realtime_price = crud_realtime_price.upsert_realtime_price(
+            session=session, realtime_price_create=realtime_price_in
+        )
+    except IntegrityError as e:
+        session.rollback()
+        if isinstance(e.orig, ForeignKeyViolation):
+            raise HTTPException(status_code=404, detail="Symbol not found")
+        raise
+    realtime_price_cache.delete(realtime_price_in.symbol_id)
     return realtime_price
 
 
@@ -170,19 +219,22 @@ def bulk_upsert_realtime_prices(
     if not realtime_price_list:
         raise HTTPException(status_code=400, detail="Empty realtime price list")
 
-    # 모든 symbol_id 존재 확인
+    # 모든 symbol_id 존재 확인 (단일 IN 쿼리)
     symbol_ids = {item.symbol_id for item in realtime_price_list}
-    for symbol_id in symbol_ids:
-        symbol = crud_symbol.get_symbol(session=session, symbol_id=symbol_id)
-        if not symbol:
-            raise HTTPException(
-                status_code=404, detail=f"Symbol with id={symbol_id} not found"
-            )
+    missing_ids = symbol_ids - crud_symbol.get_existing_symbol_ids(
+        session=session, symbol_ids=symbol_ids
+    )
+    if missing_ids:
+        raise HTTPException(
+            status_code=404, detail=f"Symbols with ids={sorted(missing_ids)} not found"
+        )
 
     # 대량 UPSERT
     upserted_data = crud_realtime_price.bulk_upsert_realtime_prices(
         session=session, realtime_price_list=realtime_price_list
     )
+    for symbol_id in symbol_ids:
+        realtime_price_cache.delete(symbol_id)
 
     return {"data": upserted_data, "count": len(upserted_data)}
 
@@ -216,42 +268,36 @@ def update_realtime_price(
     """
     실시간 가격 데이터 업데이트
     """
-    db_realtime_price = crud_realtime_price.get_realtime_price(
-        session=session, realtime_price_id=realtime_price_id
-    )
+    # symbol_id가 전달된 경우 종목 존재 확인 (캐시 조회라 기존 행을 먼저 읽지 않음)
+    if "symbol_id" in realtime_price_in.model_fields_set:
+        if not crud_symbol.symbol_exists(
+            session=session, symbol_id=realtime_price_in.symbol_id
+        ):
+            raise HTTPException(status_code=404, detail="Symbol not found")
+
+    # 사전 조회 없이 UPDATE ... RETURNING 한 번으로 수정,
+    # unique constraint 위반은 DB가 UPDATE 시점에 원자적으로 검사
+    try:
+        db_realtime_price = crud_realtime_price.update_realtime_price_by_id(
+            session=session,
+            realtime_price_id=realtime_price_id,
+            realtime_price_in=realtime_price_in,
+        )
+    except IntegrityError as e:
+        session.rollback()
+        if isinstance(e.orig, ForeignKeyViolation):
+            raise HTTPException(status_code=404, detail="Symbol not found")
+        raise HTTPException(
+            status_code=409,
+            detail=f"Realtime price data for symbol_id={realtime_price_in.symbol_id} already exists",
+        )
     if not db_realtime_price:
         raise HTTPException(
             status_code=404,
             detail="The realtime price data with this id does not exist in the system",
         )
-
-    # symbol_id가 변경되는 경우
-    if (
-        realtime_price_in.symbol_id
-        and realtime_price_in.symbol_id != db_realtime_price.symbol_id
-    ):
-        # 새로운 symbol 존재 확인
-        symbol = crud_symbol.get_symbol(
-            session=session, symbol_id=realtime_price_in.symbol_id
-        )
-        if not symbol:
-            raise HTTPException(status_code=404, detail="Symbol not found")
-
-        # unique constraint 위반 확인
-        existing = crud_realtime_price.get_realtime_price_by_symbol(
-            session=session, symbol_id=realtime_price_in.symbol_id
-        )
-        if existing and existing.id != realtime_price_id:
-            raise HTTPException(
-                status_code=409,
-                detail=f"Realtime price data for symbol_id={realtime_price_in.symbol_id} already exists",
-            )
-
-    db_realtime_price = crud_realtime_price.update_realtime_price(
-        session=session,
-        db_realtime_price=db_realtime_price,
-        realtime_price_in=realtime_price_in,
-    )
+    # symbol_id가 바뀔 수 있으므로 캐시 전체를 비움
+    realtime_price_cache.clear()
     return db_realtime_price
 
 
@@ -262,19 +308,14 @@ def delete_realtime_price(session: SessionDep, realtime_price_id: int) -> Messag
     """
     실시간 가격 데이터 삭제
     """
-    realtime_price = crud_realtime_price.get_realtime_price(
+    # 삭제된 행의 symbol_id를 RETURNING으로 받아 캐시 무효화
+    symbol_id = crud_realtime_price.delete_realtime_price(
         session=session, realtime_price_id=realtime_price_id
     )
-    if not realtime_price:
+    if symbol_id is None:
         raise HTTPException(status_code=404, detail="Realtime price data not found")
 
-    success = crud_realtime_price.delete_realtime_price(
-        session=session, realtime_price_id=realtime_price_id
-    )
-    if not success:
-        raise HTTPException(
-            status_code=500, detail="Failed to delete realtime price data"
-        )
+    realtime_price_cache.delete(symbol_id)
 
     return Message(message="Realtime price data deleted successfully")
 
@@ -288,8 +329,7 @@ def delete_realtime_price_by_symbol(symbol_id: int, session: SessionDep) -> Mess
     특정 종목의 실시간 가격 데이터 삭제
     """
     # 종목 존재 확인
-    symbol = crud_symbol.get_symbol(session=session, symbol_id=symbol_id)
-    if not symbol:
+    if not crud_symbol.symbol_exists(session=session, symbol_id=symbol_id):
         raise HTTPException(status_code=404, detail="Symbol not found")
 
     success = crud_realtime_price.delete_realtime_price_by_symbol(
@@ -302,6 +342,7 @@ def delete_realtime_price_by_symbol(symbol_id: int, session: SessionDep) -> Mess
             detail=f"No realtime price data found for symbol_id={symbol_id}",
         )
 
+    realtime_price_cache.delete(symbol_id)
     return Message(
         message=f"Deleted realtime price data for symbol_id={symbol_id} successfully"
     )
@@ -1,12 +1,13 @@
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import func, select
+from psycopg.errors import ForeignKeyViolation
+from sqlalchemy.exc import IntegrityError
 
 from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
+from app.core.cache import symbols_cache
 from app.crud import symbols as crud_symbol
 from app.models.symbols import (
-    Symbol,
     SymbolCreate,
     SymbolPublic,
     SymbolsPublic,
@@ -19,18 +20,36 @@ router = APIRouter(prefix="/symbols", tags=["symbols"])
 
 @router.get("/", response_model=SymbolsPublic)
 def read_symbols(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: int | None = None,
 ) -> Any:
     """
     Retrieve symbols.
+
+    Pass the previous page's `next_cursor` as `after_id` for keyset pagination;
+    `count` is always the total number of symbols.
     """
-    count_statement = select(func.count()).select_from(Symbol)
-    count = session.exec(count_statement).one()
+    cache_key = (None, skip, limit, after_id)
+    cached = symbols_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    statement = select(Symbol).offset(skip).limit(limit)
-    symbols = session.exec(statement).all()
+    symbols, count = crud_symbol.get_symbols(
+        session=session, skip=skip, limit=limit, after_id=after_id
+    )
+    has_more = (
+        len(symbols) == limit if after_id is not None else skip + len(symbols) < count
+    )
+    next_cursor = symbols[-1].id if symbols and has_more else None
 
-    return {"data": symbols, "count": count}
+    result = SymbolsPublic.model_validate(
+        {"data": symbols, "count": count, "next_cursor": next_cursor}
+    )
+    symbols_cache.set(cache_key, result)
+    return result
 
 
 @router.get("/exchange/{exchange_id}", response_model=SymbolsPublic)
@@ -40,20 +59,33 @@ def read_symbols_by_exchange(
     current_user: CurrentUser,
     skip: int = 0,
     limit: int = 100,
+    after_id: int | None = None,
 ) -> Any:
     """
     Retrieve symbols by exchange.
     """
-    count_statement = (
-        select(func.count()).select_from(Symbol).where(Symbol.exchange_id == exchange_id)
+    cache_key = (exchange_id, skip, limit, after_id)
+    cached = symbols_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    symbols, count = crud_symbol.get_symbols_by_exchange(
+        session=session,
+        exchange_id=exchange_id,
+        skip=skip,
+        limit=limit,
+        after_id=after_id,
     )
-    count = session.exec(count_statement).one()
-
-    symbols = crud_symbol.get_symbols_by_exchange(
-        session=session, exchange_id=exchange_id, skip=skip, limit=limit
+    has_more = (
+        len(symbols) == limit if after_id is not None else skip + len(symbols) < count
     )
+    next_cursor = symbols[-1].id if symbols and has_more else None
 
-    return {"data": symbols, "count": count}
+    result = SymbolsPublic.model_validate(
+        {"data": symbols, "count": count, "next_cursor": next_cursor}
+    )
+    symbols_cache.set(cache_key, result)
+    return result
 
 
 @router.post(
@@ -65,16 +97,17 @@ def create_symbol(*, session: SessionDep, symbol_in: SymbolCreate) -> Any:
     """
     Create new symbol.
     """
-    symbol = crud_symbol.get_symbol_by_exchange_and_code(
+    symbol_id = crud_symbol.get_symbol_id_by_exchange_and_code(
         session=session, exchange_id=symbol_in.exchange_id, symbol=symbol_in.symbol
     )
-    if symbol:
+    if symbol_id:
         raise HTTPException(
             status_code=400,
             detail="The symbol with this exchange and code already exists in the system.",
         )
 
     symbol = crud_symbol.create_symbol(session=session, symbol_create=symbol_in)
+    symbols_cache.clear()
     return symbol
 
 
@@ -105,27 +138,24 @@ def update_symbol(
     """
     Update a symbol.
     """
-    db_symbol = crud_symbol.get_symbol(session=session, symbol_id=symbol_id)
+    # Let uq_exchange_symbol reject collisions atomically
+    try:
+        db_symbol = crud_symbol.update_symbol_by_id(
+            session=session, symbol_id=symbol_id, symbol_in=symbol_in
+        )
+    except IntegrityError as e:
+        session.rollback()
+        if isinstance(e.orig, ForeignKeyViolation):
+            raise HTTPException(status_code=404, detail="Exchange not found")
+        raise HTTPException(
+            status_code=409, detail="Symbol with this exchange and code already exists"
+        )
     if not db_symbol:
         raise HTTPException(
             status_code=404,
             detail="The symbol with this id does not exist in the system",
         )
-
-    if symbol_in.exchange_id and symbol_in.symbol:
-        existing_symbol = crud_symbol.get_symbol_by_exchange_and_code(
-            session=session,
-            exchange_id=symbol_in.exchange_id,
-            symbol=symbol_in.symbol,
-        )
-        if existing_symbol and existing_symbol.id != symbol_id:
-            raise HTTPException(
-                status_code=409, detail="Symbol with this exchange and code already exists"
-            )
-
-    db_symbol = crud_symbol.update_symbol(
-        session=session, db_symbol=db_symbol, symbol_in=symbol_in
-    )
+    symbols_cache.clear()
     return db_symbol
 
 
@@ -134,12 +164,10 @@ def delete_symbol(session: SessionDep, symbol_id: int) -> Message:
     """
     Delete a symbol.
     """
-    symbol = crud_symbol.get_symbol(session=session, symbol_id=symbol_id)
-    if not symbol:
-        raise HTTPException(status_code=404, detail="Symbol not found")
-
     success = crud_symbol.delete_symbol(session=session, symbol_id=symbol_id)
     if not success:
-        raise HTTPException(status_code=500, detail="Failed to delete symbol")
+        raise HTTPException(status_code=404, detail="Symbol not found")
+
+    symbols_cache.clear()
 
     return Message(message="Symbol deleted successfully")
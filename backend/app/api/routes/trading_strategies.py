@@ -5,17 +5,16 @@ API routes for Trading Strategies management
 from typing import Any
 
 from fastapi import APIRouter, HTTPException
-from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncSessionDep, CurrentUserId
 from app.crud import trading_strategies as crud_strategy
 from app.models.trading_strategies import (
-    StrategySymbol,
     StrategySymbolCreate,
     StrategySymbolPublic,
     StrategySymbolsPublic,
     StrategySymbolUpdate,
-    TradingStrategy,
+    StrategyTypeParam,
     TradingStrategyCreate,
     TradingStrategyPublic,
     TradingStrategiesPublic,
@@ -26,62 +25,71 @@ from app.models.users import Message
 router = APIRouter(prefix="/trading-strategies", tags=["trading-strategies"])
 
 
+async def _strategy_access_error(
+    session: AsyncSession,
+    strategy_id: int,
+    action: str,
+    not_found_detail: str = "Trading strategy not found",
+) -> HTTPException:
+    """
+    Build the error for a strategy the current user cannot use.
+
+    Ownership is part of each route's query, so this only runs after that
+    query missed, to tell a missing strategy (404) from another user's (403).
+    """
+    if await crud_strategy.trading_strategy_exists(
+        session=session, strategy_id=strategy_id
+    ):
+        return HTTPException(
+            status_code=403, detail=f"Not authorized to {action} this trading strategy"
+        )
+    return HTTPException(status_code=404, detail=not_found_detail)
+
+
 # Trading Strategy endpoints
 @router.get("/", response_model=TradingStrategiesPublic)
-def read_trading_strategies(
-    session: SessionDep,
-    current_user: CurrentUser,
+async def read_trading_strategies(
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
     skip: int = 0,
     limit: int = 100,
     is_active: bool | None = None,
-    strategy_type: str | None = None,
+    strategy_type: StrategyTypeParam | None = None,
+    before_id: int | None = None,
 ) -> Any:
     """
-    Retrieve current user's trading strategies.
+    Retrieve current user's trading strategies, newest first.
 
     Query parameters:
     - is_active: Filter by active status (optional)
     - strategy_type: Filter by strategy type (optional)
+    - before_id: Previous page's `next_cursor` for keyset pagination (optional)
     """
-    # Build count statement
-    count_statement = select(func.count()).select_from(TradingStrategy).where(
-        TradingStrategy.user_id == current_user.id
+    strategies, count = await crud_strategy.get_trading_strategies(
+        session=session,
+        user_id=current_user_id,
+        skip=skip,
+        limit=limit,
+        is_active=is_active,
+        strategy_type=strategy_type,
+        before_id=before_id,
     )
+    has_more = (
+        len(strategies) == limit
+        if before_id is not None
+        else skip + len(strategies) < count
+    )
+    next_cursor = strategies[-1].id if strategies and has_more else None
 
-    if is_active is not None:
-        count_statement = count_statement.where(TradingStrategy.is_active == is_active)
-
-    if strategy_type:
-        count_statement = count_statement.where(
-            TradingStrategy.strategy_type == strategy_type.upper()
-        )
-
-    count = session.exec(count_statement).one()
-
-    # Get strategies based on filters
-    if is_active is not None and is_active:
-        strategies = crud_strategy.get_active_trading_strategies(
-            session=session, user_id=current_user.id, skip=skip, limit=limit
-        )
-    elif strategy_type:
-        strategies = crud_strategy.get_trading_strategies_by_type(
-            session=session,
-            user_id=current_user.id,
-            strategy_type=strategy_type.upper(),
-            skip=skip,
-            limit=limit,
-        )
-    else:
-        strategies = crud_strategy.get_trading_strategies(
-            session=session, user_id=current_user.id, skip=skip, limit=limit
-        )
-
-    return {"data": strategies, "count": count}
+    return {"data": strategies, "count": count, "next_cursor": next_cursor}
 
 
 @router.post("/", response_model=TradingStrategyPublic)
-def create_trading_strategy(
-    *, session: SessionDep, current_user: CurrentUser, strategy_in: TradingStrategyCreate
+async def create_trading_strategy(
+    *,
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
+    strategy_in: TradingStrategyCreate,
 ) -> Any:
     """
     Create a new trading strategy for the current user.
@@ -101,46 +109,37 @@ def create_trading_strategy(
     }
     ```
     """
-    # Normalize strategy type to uppercase
-    strategy_in.strategy_type = strategy_in.strategy_type.upper()
-
-    strategy = crud_strategy.create_trading_strategy(
-        session=session, user_id=current_user.id, strategy_create=strategy_in
+    strategy = await crud_strategy.create_trading_strategy(
+        session=session, user_id=current_user_id, strategy_create=strategy_in
     )
 
     return strategy
 
 
 @router.get("/{strategy_id}", response_model=TradingStrategyPublic)
-def read_trading_strategy_by_id(
-    strategy_id: int, session: SessionDep, current_user: CurrentUser
+async def read_trading_strategy_by_id(
+    strategy_id: int, session: AsyncSessionDep, current_user_id: CurrentUserId
 ) -> Any:
     """
     Get a specific trading strategy by ID.
 
     Only the owner can access their own strategies.
     """
-    strategy = crud_strategy.get_trading_strategy(
-        session=session, strategy_id=strategy_id
+    strategy = await crud_strategy.get_trading_strategy(
+        session=session, strategy_id=strategy_id, user_id=current_user_id
     )
 
     if not strategy:
-        raise HTTPException(status_code=404, detail="Trading strategy not found")
-
-    # Check ownership
-    if strategy.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to access this trading strategy"
-        )
+        raise await _strategy_access_error(session, strategy_id, "access")
 
     return strategy
 
 
 @router.patch("/{strategy_id}", response_model=TradingStrategyPublic)
-def update_trading_strategy(
+async def update_trading_strategy(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
     strategy_id: int,
     strategy_in: TradingStrategyUpdate,
 ) -> Any:
@@ -154,75 +153,54 @@ def update_trading_strategy(
     - config (strategy configuration)
     - is_active
     """
-    db_strategy = crud_strategy.get_trading_strategy(
-        session=session, strategy_id=strategy_id
+    # Ownership is checked by the UPDATE itself, which also returns the new row
+    db_strategy = await crud_strategy.update_trading_strategy(
+        session=session,
+        strategy_id=strategy_id,
+        strategy_in=strategy_in,
+        user_id=current_user_id,
     )
 
     if not db_strategy:
-        raise HTTPException(
-            status_code=404,
-            detail="The trading strategy with this id does not exist in the system",
+        raise await _strategy_access_error(
+            session,
+            strategy_id,
+            "modify",
+            not_found_detail="The trading strategy with this id does not exist in the system",
         )
 
-    # Check ownership
-    if db_strategy.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to modify this trading strategy"
-        )
-
-    # Normalize strategy type to uppercase if provided
-    if strategy_in.strategy_type:
-        strategy_in.strategy_type = strategy_in.strategy_type.upper()
-
-    db_strategy = crud_strategy.update_trading_strategy(
-        session=session, db_strategy=db_strategy, strategy_in=strategy_in
-    )
-
     return db_strategy
 
 
 @router.post("/{strategy_id}/deactivate", response_model=TradingStrategyPublic)
-def deactivate_trading_strategy(
-    strategy_id: int, session: SessionDep, current_user: CurrentUser
+async def deactivate_trading_strategy(
+    strategy_id: int, session: AsyncSessionDep, current_user_id: CurrentUserId
 ) -> Any:
     """
     Deactivate a trading strategy (soft delete).
 
     Deactivated strategies are kept in the database but will not execute.
     """
-    db_strategy = crud_strategy.get_trading_strategy(
-        session=session, strategy_id=strategy_id
-    )
-
-    if not db_strategy:
-        raise HTTPException(status_code=404, detail="Trading strategy not found")
-
-    # Check ownership
-    if db_strategy.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to deactivate this trading strategy"
-        )
-
-    if not db_strategy.is_active:
-        raise HTTPException(
-            status_code=400, detail="Trading strategy is already deactivated"
-        )
-
-    deactivated_strategy = crud_strategy.deactivate_trading_strategy(
-        session=session, strategy_id=strategy_id
+    # Ownership and the active check are part of the UPDATE itself
+    deactivated_strategy = await crud_strategy.deactivate_trading_strategy(
+        session=session, strategy_id=strategy_id, user_id=current_user_id
     )
 
     if not deactivated_strategy:
-        raise HTTPException(
-            status_code=500, detail="Failed to deactivate trading strategy"
-        )
+        if await crud_strategy.trading_strategy_exists(
+            session=session, strategy_id=strategy_id, user_id=current_user_id
+        ):
+            raise HTTPException(
+                status_code=400, detail="Trading strategy is already deactivated"
+            )
+        raise await _strategy_access_error(session, strategy_id, "deactivate")
 
     return deactivated_strategy
 
 
 @router.delete("/{strategy_id}")
-def delete_trading_strategy(
-    strategy_id: int, session: SessionDep, current_user: CurrentUser
+async def delete_trading_strategy(
+    strategy_id: int, session: AsyncSessionDep, current_user_id: CurrentUserId
 ) -> Message:
     """
     Permanently delete a trading strategy.
@@ -231,86 +209,62 @@ def delete_trading_strategy(
     This will also delete all associated strategy-symbol mappings.
     Consider using the deactivate endpoint instead.
     """
-    db_strategy = crud_strategy.get_trading_strategy(
-        session=session, strategy_id=strategy_id
-    )
-
-    if not db_strategy:
-        raise HTTPException(status_code=404, detail="Trading strategy not found")
-
-    # Check ownership
-    if db_strategy.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to delete this trading strategy"
-        )
-
-    success = crud_strategy.delete_trading_strategy(
-        session=session, strategy_id=strategy_id
+    # Ownership is checked by the DELETE itself (WHERE id AND user_id)
+    success = await crud_strategy.delete_trading_strategy(
+        session=session, strategy_id=strategy_id, user_id=current_user_id
     )
 
     if not success:
-        raise HTTPException(status_code=500, detail="Failed to delete trading strategy")
+        raise await _strategy_access_error(session, strategy_id, "delete")
 
     return Message(message="Trading strategy deleted successfully")
 
 
 # Strategy Symbol endpoints
 @router.get("/{strategy_id}/symbols", response_model=StrategySymbolsPublic)
-def read_strategy_symbols(
+async def read_strategy_symbols(
     strategy_id: int,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
     skip: int = 0,
     limit: int = 100,
     is_active: bool | None = None,
+    before_id: int | None = None,
 ) -> Any:
     """
-    Retrieve symbols for a specific trading strategy.
+    Retrieve symbols for a specific trading strategy, newest first.
 
     Query parameters:
     - is_active: Filter by active status (optional)
+    - before_id: Previous page's `next_cursor` for keyset pagination (optional)
     """
-    # First verify strategy ownership
-    strategy = crud_strategy.get_trading_strategy(
-        session=session, strategy_id=strategy_id
-    )
-
-    if not strategy:
-        raise HTTPException(status_code=404, detail="Trading strategy not found")
-
-    if strategy.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to access this trading strategy"
-        )
+    # Verify strategy ownership (EXISTS on id + user_id, no row fetch)
+    if not await crud_strategy.trading_strategy_exists(
+        session=session, strategy_id=strategy_id, user_id=current_user_id
+    ):
+        raise await _strategy_access_error(session, strategy_id, "access")
 
-    # Build count statement
-    count_statement = select(func.count()).select_from(StrategySymbol).where(
-        StrategySymbol.strategy_id == strategy_id
+    symbols, count = await crud_strategy.get_strategy_symbols(
+        session=session,
+        strategy_id=strategy_id,
+        skip=skip,
+        limit=limit,
+        is_active=is_active,
+        before_id=before_id,
     )
+    has_more = (
+        len(symbols) == limit if before_id is not None else skip + len(symbols) < count
+    )
+    next_cursor = symbols[-1].id if symbols and has_more else None
 
-    if is_active is not None:
-        count_statement = count_statement.where(StrategySymbol.is_active == is_active)
-
-    count = session.exec(count_statement).one()
-
-    # Get symbols based on filters
-    if is_active is not None and is_active:
-        symbols = crud_strategy.get_active_strategy_symbols(
-            session=session, strategy_id=strategy_id, skip=skip, limit=limit
-        )
-    else:
-        symbols = crud_strategy.get_strategy_symbols(
-            session=session, strategy_id=strategy_id, skip=skip, limit=limit
-        )
-
-    return {"data": symbols, "count": count}
+    return {"data": symbols, "count": count, "next_cursor": next_cursor}
 
 
 @router.post("/{strategy_id}/symbols", response_model=StrategySymbolPublic)
-def create_strategy_symbol(
+async def create_strategy_symbol(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
     strategy_id: int,
     strategy_symbol_in: StrategySymbolCreate,
 ) -> Any:
@@ -329,18 +283,11 @@ def create_strategy_symbol(
 
     Note: allocation_ratio should be between 0.0 and 1.0
     """
-    # Verify strategy ownership
-    strategy = crud_strategy.get_trading_strategy(
-        session=session, strategy_id=strategy_id
-    )
-
-    if not strategy:
-        raise HTTPException(status_code=404, detail="Trading strategy not found")
-
-    if strategy.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to modify this trading strategy"
-        )
+    # Verify strategy ownership (EXISTS on id + user_id, no row fetch)
+    if not await crud_strategy.trading_strategy_exists(
+        session=session, strategy_id=strategy_id, user_id=current_user_id
+    ):
+        raise await _strategy_access_error(session, strategy_id, "modify")
 
     # Ensure strategy_id in path matches body
     if strategy_symbol_in.strategy_id != strategy_id:
@@ -350,13 +297,11 @@ def create_strategy_symbol(
         )
 
     # Check if symbol already exists for this strategy
-    existing_symbol = crud_strategy.get_strategy_symbol_by_ids(
+    if await crud_strategy.strategy_symbol_exists(
         session=session,
         strategy_id=strategy_id,
         symbol_id=strategy_symbol_in.symbol_id,
-    )
-
-    if existing_symbol:
+    ):
         raise HTTPException(
             status_code=400,
             detail="This symbol is already added to the strategy",
@@ -369,53 +314,90 @@ def create_strategy_symbol(
             detail="Allocation ratio must be between 0.0 and 1.0",
         )
 
-    strategy_symbol = crud_strategy.create_strategy_symbol(
+    strategy_symbol = await crud_strategy.create_strategy_symbol(
         session=session, strategy_symbol_create=strategy_symbol_in
     )
 
     return strategy_symbol
 
 
-@router.patch("/{strategy_id}/symbols/{symbol_id}", response_model=StrategySymbolPublic)
-def update_strategy_symbol(
+@router.post("/{strategy_id}/symbols/bulk", response_model=StrategySymbolsPublic)
+async def bulk_create_strategy_symbols(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
     strategy_id: int,
-    symbol_id: int,
-    strategy_symbol_in: StrategySymbolUpdate,
+    strategy_symbol_list: list[StrategySymbolCreate],
 ) -> Any:
     """
-    Update a strategy-symbol mapping.
+    Add many symbols to a trading strategy in one request.
 
-    Can update:
-    - allocation_ratio
-    - is_active
+    Symbols already added to the strategy are skipped; only the newly added
+    mappings are returned.
     """
-    # Verify strategy ownership
-    strategy = crud_strategy.get_trading_strategy(
-        session=session, strategy_id=strategy_id
-    )
+    if not strategy_symbol_list:
+        raise HTTPException(status_code=400, detail="Empty strategy symbol list")
 
-    if not strategy:
-        raise HTTPException(status_code=404, detail="Trading strategy not found")
+    # Verify strategy ownership (EXISTS on id + user_id, no row fetch)
+    if not await crud_strategy.trading_strategy_exists(
+        session=session, strategy_id=strategy_id, user_id=current_user_id
+    ):
+        raise await _strategy_access_error(session, strategy_id, "modify")
 
-    if strategy.user_id != current_user.id:
+    if any(item.strategy_id != strategy_id for item in strategy_symbol_list):
         raise HTTPException(
-            status_code=403, detail="Not authorized to modify this trading strategy"
+            status_code=400,
+            detail="Strategy ID in path must match strategy_id in request body",
         )
 
-    # Get strategy symbol mapping
-    db_strategy_symbol = crud_strategy.get_strategy_symbol_by_ids(
-        session=session, strategy_id=strategy_id, symbol_id=symbol_id
-    )
+    if any(
+        not (0.0 <= item.allocation_ratio <= 1.0) for item in strategy_symbol_list
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="Allocation ratio must be between 0.0 and 1.0",
+        )
 
-    if not db_strategy_symbol:
+    # Unknown symbols would fail the whole INSERT on the foreign key
+    missing_ids = await crud_strategy.get_missing_symbol_ids(
+        session=session,
+        symbol_ids={item.symbol_id for item in strategy_symbol_list},
+    )
+    if missing_ids:
         raise HTTPException(
             status_code=404,
-            detail="Symbol not found in this strategy",
+            detail=f"Symbols not found: {sorted(missing_ids)}",
         )
 
+    strategy_symbols = await crud_strategy.bulk_create_strategy_symbols(
+        session=session, strategy_symbol_list=strategy_symbol_list
+    )
+
+    return {"data": strategy_symbols, "count": len(strategy_symbols)}
+
+
+@router.patch("/{strategy_id}/symbols/{symbol_id}", response_model=StrategySymbolPublic)
+async def update_strategy_symbol(
+    *,
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
+    strategy_id: int,
+    symbol_id: int,
+    strategy_symbol_in: StrategySymbolUpdate,
+) -> Any:
+    """
+    Update a strategy-symbol mapping.
+
+    Can update:
+    - allocation_ratio
+    - is_active
+    """
+    # Verify strategy ownership (EXISTS on id + user_id, no row fetch)
+    if not await crud_strategy.trading_strategy_exists(
+        session=session, strategy_id=strategy_id, user_id=current_user_id
+    ):
+        raise await _strategy_access_error(session, strategy_id, "modify")
+
     # Validate allocation ratio if provided
     if (
         strategy_symbol_in.allocation_ratio is not None
@@ -426,53 +408,46 @@ def update_strategy_symbol(
             detail="Allocation ratio must be between 0.0 and 1.0",
         )
 
-    db_strategy_symbol = crud_strategy.update_strategy_symbol(
+    db_strategy_symbol = await crud_strategy.update_strategy_symbol(
         session=session,
-        db_strategy_symbol=db_strategy_symbol,
+        strategy_id=strategy_id,
+        symbol_id=symbol_id,
         strategy_symbol_in=strategy_symbol_in,
     )
 
+    if not db_strategy_symbol:
+        raise HTTPException(
+            status_code=404,
+            detail="Symbol not found in this strategy",
+        )
+
     return db_strategy_symbol
 
 
 @router.delete("/{strategy_id}/symbols/{symbol_id}")
-def delete_strategy_symbol(
-    strategy_id: int, symbol_id: int, session: SessionDep, current_user: CurrentUser
+async def delete_strategy_symbol(
+    strategy_id: int,
+    symbol_id: int,
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
 ) -> Message:
     """
     Remove a symbol from a trading strategy.
     """
-    # Verify strategy ownership
-    strategy = crud_strategy.get_trading_strategy(
-        session=session, strategy_id=strategy_id
-    )
-
-    if not strategy:
-        raise HTTPException(status_code=404, detail="Trading strategy not found")
-
-    if strategy.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to modify this trading strategy"
-        )
+    # Verify strategy ownership (EXISTS on id + user_id, no row fetch)
+    if not await crud_strategy.trading_strategy_exists(
+        session=session, strategy_id=strategy_id, user_id=current_user_id
+    ):
+        raise await _strategy_access_error(session, strategy_id, "modify")
 
-    # Get strategy symbol mapping
-    db_strategy_symbol = crud_strategy.get_strategy_symbol_by_ids(
+    success = await crud_strategy.delete_strategy_symbol(
         session=session, strategy_id=strategy_id, symbol_id=symbol_id
     )
 
-    if not db_strategy_symbol:
+    if not success:
         raise HTTPException(
             status_code=404,
             detail="Symbol not found in this strategy",
         )
 
-    success = crud_strategy.delete_strategy_symbol(
-        session=session, strategy_symbol_id=db_strategy_symbol.id
-    )
-
-    if not success:
-        raise HTTPException(
-            status_code=500, detail="Failed to remove symbol from strategy"
-        )
-
     return Message(message="Symbol removed from strategy successfully")
@@ -5,12 +5,13 @@ API routes for User API Keys management
 from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.api.deps import CurrentUser, SessionDep
+from app.api.deps import AsyncSessionDep, CurrentUserId
 from app.crud import user_api_keys as crud_api_keys
 from app.models.user_api_keys import (
-    UserApiKey,
+    ExchangeTypeParam,
     UserApiKeyCreate,
     UserApiKeyPublic,
     UserApiKeysPublic,
@@ -21,32 +22,63 @@ from app.models.users import Message
 router = APIRouter(prefix="/user-api-keys", tags=["user-api-keys"])
 
 
+async def _api_key_access_error(
+    session: AsyncSession,
+    api_key_id: int,
+    action: str,
+    not_found_detail: str = "API key not found",
+) -> HTTPException:
+    """
+    Build the error for an API key the current user cannot use.
+
+    Ownership is part of each route's query, so this only runs after that
+    query missed, to tell a missing key (404) from another user's (403).
+    """
+    if await crud_api_keys.user_api_key_exists(session=session, api_key_id=api_key_id):
+        return HTTPException(
+            status_code=403, detail=f"Not authorized to {action} this API key"
+        )
+    return HTTPException(status_code=404, detail=not_found_detail)
+
+
 @router.get("/", response_model=UserApiKeysPublic)
-def read_user_api_keys(
-    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100
+async def read_user_api_keys(
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
+    skip: int = 0,
+    limit: int = 100,
+    before_id: int | None = None,
 ) -> Any:
     """
-    Retrieve current user's API keys.
+    Retrieve current user's API keys, newest first.
 
     Returns list of API keys WITHOUT decrypted credentials.
+
+    Query parameters:
+    - before_id: Previous page's `next_cursor` for keyset pagination (optional)
     """
-    count_statement = (
-        select(func.count()).select_from(UserApiKey).where(UserApiKey.user_id == current_user.id)
+    api_keys, count = await crud_api_keys.get_user_api_keys(
+        session=session,
+        user_id=current_user_id,
+        skip=skip,
+        limit=limit,
+        before_id=before_id,
     )
-    count = session.exec(count_statement).one()
-
-    api_keys = crud_api_keys.get_user_api_keys(
-        session=session, user_id=current_user.id, skip=skip, limit=limit
+    has_more = (
+        len(api_keys) == limit
+        if before_id is not None
+        else skip + len(api_keys) < count
     )
+    next_cursor = api_keys[-1].id if api_keys and has_more else None
 
-    return {"data": api_keys, "count": count}
+    return {"data": api_keys, "count": count, "next_cursor": next_cursor}
 
 
 @router.get("/exchange/{exchange_type}", response_model=UserApiKeyPublic)
-def read_user_api_key_by_exchange(
-    exchange_type: str,
-    session: SessionDep,
-    current_user: CurrentUser,
+async def read_user_api_key_by_exchange(
+    exchange_type: ExchangeTypeParam,
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
     is_demo: bool = False,
 ) -> Any:
     """
@@ -59,25 +91,28 @@ def read_user_api_key_by_exchange(
     Returns:
         API key WITHOUT decrypted credentials
     """
-    api_key = crud_api_keys.get_user_api_key_by_exchange(
+    api_key = await crud_api_keys.get_user_api_key_by_exchange(
         session=session,
-        user_id=current_user.id,
-        exchange_type=exchange_type.upper(),
+        user_id=current_user_id,
+        exchange_type=exchange_type,
         is_demo=is_demo,
     )
 
     if not api_key:
         raise HTTPException(
             status_code=404,
-            detail=f"No active API key found for exchange '{exchange_type}' (is_demo={is_demo})",
+            detail=f"No active API key found for exchange '{exchange_type.value}' (is_demo={is_demo})",
         )
 
     return api_key
 
 
 @router.post("/", response_model=UserApiKeyPublic)
-def create_user_api_key(
-    *, session: SessionDep, current_user: CurrentUser, api_key_in: UserApiKeyCreate
+async def create_user_api_key(
+    *,
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
+    api_key_in: UserApiKeyCreate,
 ) -> Any:
     """
     Create a new API key for the current user.
@@ -100,22 +135,17 @@ def create_user_api_key(
     Note: Despite the field names, send PLAIN TEXT credentials.
     The encryption happens server-side.
     """
-    # Normalize exchange type to uppercase
-    api_key_in.exchange_type = api_key_in.exchange_type.upper()
-
     # Check if user already has an active key for this exchange/demo combination
-    existing_key = crud_api_keys.get_user_api_key_by_exchange(
+    if await crud_api_keys.active_user_api_key_exists(
         session=session,
-        user_id=current_user.id,
+        user_id=current_user_id,
         exchange_type=api_key_in.exchange_type,
         is_demo=api_key_in.is_demo,
-    )
-
-    if existing_key:
+    ):
         raise HTTPException(
             status_code=400,
             detail=(
-                f"You already have an active API key for {api_key_in.exchange_type} "
+                f"You already have an active API key for {api_key_in.exchange_type.value} "
                 f"({'demo' if api_key_in.is_demo else 'production'}). "
                 f"Please deactivate or delete the existing key first."
             ),
@@ -128,16 +158,16 @@ def create_user_api_key(
             detail="Both API key and API secret are required",
         )
 
-    api_key = crud_api_keys.create_user_api_key(
-        session=session, user_id=current_user.id, api_key_create=api_key_in
+    api_key = await crud_api_keys.create_user_api_key(
+        session=session, user_id=current_user_id, api_key_create=api_key_in
     )
 
     return api_key
 
 
 @router.get("/{api_key_id}", response_model=UserApiKeyPublic)
-def read_user_api_key_by_id(
-    api_key_id: int, session: SessionDep, current_user: CurrentUser
+async def read_user_api_key_by_id(
+    api_key_id: int, session: AsyncSessionDep, current_user_id: CurrentUserId
 ) -> Any:
     """
     Get a specific API key by ID.
@@ -145,25 +175,21 @@ def read_user_api_key_by_id(
     Returns API key WITHOUT decrypted credentials.
     Only the owner can access their own keys.
     """
-    api_key = crud_api_keys.get_user_api_key(session=session, api_key_id=api_key_id)
+    api_key = await crud_api_keys.get_user_api_key(
+        session=session, api_key_id=api_key_id, user_id=current_user_id
+    )
 
     if not api_key:
-        raise HTTPException(status_code=404, detail="API key not found")
-
-    # Check ownership
-    if api_key.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to access this API key"
-        )
+        raise await _api_key_access_error(session, api_key_id, "access")
 
     return api_key
 
 
 @router.patch("/{api_key_id}", response_model=UserApiKeyPublic)
-def update_user_api_key(
+async def update_user_api_key(
     *,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: AsyncSessionDep,
+    current_user_id: CurrentUserId,
     api_key_id: int,
     api_key_in: UserApiKeyUpdate,
 ) -> Any:
@@ -180,83 +206,62 @@ def update_user_api_key(
     IMPORTANT: If updating credentials, send plain text.
     They will be encrypted before storage.
     """
-    db_api_key = crud_api_keys.get_user_api_key(session=session, api_key_id=api_key_id)
-
-    if not db_api_key:
-        raise HTTPException(
-            status_code=404,
-            detail="The API key with this id does not exist in the system",
+    # Ownership is checked by the UPDATE itself, which also returns the new row.
+    # Exchange/demo conflicts are rejected atomically by the unique constraint.
+    try:
+        db_api_key = await crud_api_keys.update_user_api_key(
+            session=session,
+            api_key_id=api_key_id,
+            api_key_in=api_key_in,
+            user_id=current_user_id,
         )
-
-    # Check ownership
-    if db_api_key.user_id != current_user.id:
+    except IntegrityError:
+        await session.rollback()
         raise HTTPException(
-            status_code=403, detail="Not authorized to modify this API key"
+            status_code=409,
+            detail="Another active API key already exists for this exchange/demo combination",
         )
 
-    # If changing exchange type or is_demo, check for conflicts
-    if api_key_in.exchange_type or api_key_in.is_demo is not None:
-        check_exchange = api_key_in.exchange_type or db_api_key.exchange_type
-        check_is_demo = (
-            api_key_in.is_demo if api_key_in.is_demo is not None else db_api_key.is_demo
-        )
-
-        existing_key = crud_api_keys.get_user_api_key_by_exchange(
-            session=session,
-            user_id=current_user.id,
-            exchange_type=check_exchange,
-            is_demo=check_is_demo,
+    if not db_api_key:
+        raise await _api_key_access_error(
+            session,
+            api_key_id,
+            "modify",
+            not_found_detail="The API key with this id does not exist in the system",
         )
 
-        if existing_key and existing_key.id != api_key_id:
-            raise HTTPException(
-                status_code=409,
-                detail="Another active API key already exists for this exchange/demo combination",
-            )
-
-    db_api_key = crud_api_keys.update_user_api_key(
-        session=session, db_api_key=db_api_key, api_key_in=api_key_in
-    )
-
     return db_api_key
 
 
 @router.post("/{api_key_id}/deactivate", response_model=UserApiKeyPublic)
-def deactivate_user_api_key(
-    api_key_id: int, session: SessionDep, current_user: CurrentUser
+async def deactivate_user_api_key(
+    api_key_id: int, session: AsyncSessionDep, current_user_id: CurrentUserId
 ) -> Any:
     """
     Deactivate an API key (soft delete).
 
     Deactivated keys are kept in the database but cannot be used.
     """
-    db_api_key = crud_api_keys.get_user_api_key(session=session, api_key_id=api_key_id)
-
-    if not db_api_key:
-        raise HTTPException(status_code=404, detail="API key not found")
-
-    # Check ownership
-    if db_api_key.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to deactivate this API key"
-        )
-
-    if not db_api_key.is_active:
-        raise HTTPException(status_code=400, detail="API key is already deactivated")
-
-    deactivated_key = crud_api_keys.deactivate_user_api_key(
-        session=session, api_key_id=api_key_id
+    # Ownership and the active check are part of the UPDATE itself
+    deactivated_key = await crud_api_keys.deactivate_user_api_key(
+        session=session, api_key_id=api_key_id, user_id=current_user_id
     )
 
     if not deactivated_key:
-        raise HTTPException(status_code=500, detail="Failed to deactivate API key")
+        if await crud_api_keys.get_user_api_key(
+            session=session, api_key_id=api_key_id, user_id=current_user_id
+        ):
+            raise HTTPException(
+                status_code=400, detail="API key is already deactivated"
+            )
+        raise await _api_key_access_error(session, api_key_id, "deactivate")
 
     return deactivated_key
 
 
 @router.delete("/{api_key_id}")
-def delete_user_api_key(
-    api_key_id: int, session: SessionDep, current_user: CurrentUser
+async def delete_user_api_key(
+    api_key_id: int, session: AsyncSessionDep, current_user_id: CurrentUserId
 ) -> Message:
     """
     Permanently delete an API key.
@@ -264,20 +269,12 @@ def delete_user_api_key(
     WARNING: This action cannot be undone.
     Consider using the deactivate endpoint instead.
     """
-    db_api_key = crud_api_keys.get_user_api_key(session=session, api_key_id=api_key_id)
-
-    if not db_api_key:
-        raise HTTPException(status_code=404, detail="API key not found")
-
-    # Check ownership
-    if db_api_key.user_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to delete this API key"
-        )
-
-    success = crud_api_keys.delete_user_api_key(session=session, api_key_id=api_key_id)
+    # Ownership is checked by the DELETE itself (WHERE id AND user_id)
+    success = await crud_api_keys.delete_user_api_key(
+        session=session, api_key_id=api_key_id, user_id=current_user_id
+    )
 
     if not success:
-        raise HTTPException(status_code=500, detail="Failed to delete API key")
+        raise await _api_key_access_error(session, api_key_id, "delete")
 
     return Message(message="API key deleted successfully")
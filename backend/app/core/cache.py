@@ -0,0 +1,76 @@
+"""
+In-process TTL Cache
+
+Small thread-safe cache for read-mostly data served by the API (exchange and
+symbol lists, latest prices). Entries expire after a fixed TTL and the oldest
+entry is evicted once ``maxsize`` is reached.
+
+The cache lives in the worker process, so writes invalidate only the local
+copy; other workers converge once their entries expire. Keep TTLs short for
+data that changes often.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any
+
+
+class TTLCache:
+    def __init__(self, *, ttl: float, maxsize: int = 1024) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any | None:
+        """
+        Return the cached value, or None if missing or expired.
+        """
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+# Response caches for read-heavy GET endpoints
+exchanges_cache = TTLCache(ttl=300)
+symbols_cache = TTLCache(ttl=300)
+# Realtime prices are also written by other workers and by ingest going
+# straight through crud, which never clears this cache, so keep the TTL to a
+# second or two
+realtime_price_cache = TTLCache(ttl=2, maxsize=10_000)
+latest_price_data_cache = TTLCache(ttl=5, maxsize=10_000)
+price_data_page_cache = TTLCache(ttl=5, maxsize=1024)
+
+# Positive symbol-id existence checks used to validate writes. Per process:
+# delete_symbol evicts only the local entry, so other workers may report a
+# deleted symbol as existing until the TTL expires. Write routes therefore
+# also map the resulting foreign key violation to 404.
+symbol_exists_cache = TTLCache(ttl=60, maxsize=10_000)
+
+# Code -> id lookups used to resolve exchanges and symbols on ingest
+exchange_id_by_code_cache = TTLCache(ttl=60, maxsize=4096)
+symbol_id_by_code_cache = TTLCache(ttl=60, maxsize=10_000)
@@ -39,6 +39,15 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
     FRONTEND_HOST: str = "http://localhost:5173"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
+    # Sync (def) routes run in the AnyIO worker thread pool, which defaults to 40
+    THREADPOOL_MAX_WORKERS: int = 100
+    # Optional API modules; disabled ones are never imported by the worker
+    ENABLE_PRICE_DATA: bool = True
+    ENABLE_REALTIME_PRICE: bool = True
+    ENABLE_TRADING_STRATEGIES: bool = True
+    # Private directory for parsed KRX master file caches
+    # (default: ~/.cache/wombat/kis_master, created with mode 0700)
+    KIS_MASTER_CACHE_DIR: str | None = None
 
     BACKEND_CORS_ORIGINS: Annotated[list[AnyUrl] | str, BeforeValidator(parse_cors)] = (
         []
@@ -58,6 +67,16 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
+    # Connection pool sizing (per process). Behind PgBouncer in transaction
+    # pooling mode this can be dropped to ~5 since multiplexing is server side.
+    POSTGRES_POOL_SIZE: int = 20
+    POSTGRES_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: int = 30
+    POSTGRES_POOL_RECYCLE: int = 3600
+    # Rows per INSERT statement when SQLAlchemy batches bulk inserts
+    # (insertmanyvalues). Keeps the bind parameter count under Postgres's
+    # 65535 limit for the widest bulk-inserted table (price data, ~10 columns).
+    POSTGRES_INSERT_PAGE_SIZE: int = 5000
 
     @computed_field  # type: ignore[prop-decorator]
     @property
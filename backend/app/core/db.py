@@ -1,10 +1,34 @@
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import Session, create_engine, select
 
 from app.core.config import settings
 from app.crud.users import create_user
 from app.models.users import User, UserCreate
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
+engine = create_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    pool_size=settings.POSTGRES_POOL_SIZE,
+    max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+    pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+    pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+    # Transparently replace connections dropped by a DB restart or idle timeout
+    pool_pre_ping=True,
+    # Bulk INSERT ... RETURNING is split into statements of this many rows,
+    # all within the caller's single transaction
+    insertmanyvalues_page_size=settings.POSTGRES_INSERT_PAGE_SIZE,
+)
+
+# Async engine for `async def` routes. psycopg 3 runs in async mode under
+# create_async_engine, so the same URI is used. It keeps its own pool.
+async_engine = create_async_engine(
+    str(settings.SQLALCHEMY_DATABASE_URI),
+    pool_size=settings.POSTGRES_POOL_SIZE,
+    max_overflow=settings.POSTGRES_MAX_OVERFLOW,
+    pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+    pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+    pool_pre_ping=True,
+    insertmanyvalues_page_size=settings.POSTGRES_INSERT_PAGE_SIZE,
+)
 
 
 # make sure all SQLModel models are imported (app.models) before initializing DB
@@ -1,11 +1,25 @@
 """
 Encryption and Decryption Utilities for API Keys
 
-Uses Fernet (symmetric encryption) to encrypt/decrypt sensitive API credentials.
-Fernet uses AES 128 in CBC mode with PKCS7 padding.
+Encrypts sensitive API credentials with AES-256-GCM (single AEAD pass, backed
+by AES-NI in OpenSSL). Tokens are stored as "v2:" + url-safe base64 of
+nonce + ciphertext.
+
+An API key and its secret are stored together as one token (see
+encrypt_api_credentials).
+
+Values written by earlier versions are Fernet tokens (AES 128 in CBC mode with
+PKCS7 padding + HMAC); these are still accepted by decrypt_api_key.
 """
 
+import hashlib
+import os
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
 from app.core.config import settings
 
@@ -39,14 +53,36 @@ def get_encryption_key() -> bytes:
     except Exception:
         # If not valid, use a derived key (simplified approach)
         # In production, use cryptography.hazmat for proper key derivation (PBKDF2, etc.)
-        from base64 import urlsafe_b64encode
-        import hashlib
-
         # Derive a proper Fernet key from the secret
         derived = hashlib.sha256(settings.SECRET_KEY.encode()).digest()
         return urlsafe_b64encode(derived)
 
 
+def get_aead_key() -> bytes:
+    """
+    Derive the 256-bit AES-GCM key from SECRET_KEY with HKDF-SHA256.
+
+    Returns:
+        32-byte key
+    """
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b"wombat-api-credentials",
+    ).derive(settings.SECRET_KEY.encode())
+
+
+_TOKEN_PREFIX = "v2:"
+_NONCE_SIZE = 12
+
+# SECRET_KEY is fixed for the process lifetime, so derive the keys and build
+# the cipher instances once instead of on every encrypt/decrypt call
+_AEAD = AESGCM(get_aead_key())
+# Legacy cipher, only used to read values encrypted before the AES-GCM switch
+_FERNET = Fernet(get_encryption_key())
+
+
 def encrypt_api_key(plain_text: str) -> str:
     """
     Encrypt a plain text API key.
@@ -59,11 +95,9 @@ def encrypt_api_key(plain_text: str) -> str:
     """
     if not plain_text:
         return ""
-
-    key = get_encryption_key()
-    fernet = Fernet(key)
-    encrypted = fernet.encrypt(plain_text.encode())
-    return encrypted.decode()
+    nonce = os.urandom(_NONCE_SIZE)
+    encrypted = _AEAD.encrypt(nonce, plain_text.encode(), None)
+    return _TOKEN_PREFIX + urlsafe_b64encode(nonce + encrypted).decode()
 
 
 def decrypt_api_key(encrypted_text: str) -> str:
@@ -77,46 +111,56 @@ def decrypt_api_key(encrypted_text: str) -> str:
         Decrypted plain text
 
     Raises:
-        cryptography.fernet.InvalidToken: If decryption fails
+        cryptography.exceptions.InvalidTag: If AES-GCM decryption fails
+        cryptography.fernet.InvalidToken: If legacy Fernet decryption fails
     """
     if not encrypted_text:
         return ""
+    if not encrypted_text.startswith(_TOKEN_PREFIX):
+        return _FERNET.decrypt(encrypted_text.encode()).decode()
+
+    data = urlsafe_b64decode(encrypted_text[len(_TOKEN_PREFIX) :])
+    nonce, encrypted = data[:_NONCE_SIZE], data[_NONCE_SIZE:]
+    return _AEAD.decrypt(nonce, encrypted, None).decode()
 
-    key = get_encryption_key()
-    fernet = Fernet(key)
-    decrypted = fernet.decrypt(encrypted_text.encode())
-    return decrypted.decode()
 
+# Joins API key and secret into one plain text (ASCII unit separator)
+_CREDENTIALS_SEPARATOR = "\x1f"
 
-def encrypt_api_credentials(api_key: str, api_secret: str) -> tuple[str, str]:
+
+def encrypt_api_credentials(api_key: str, api_secret: str) -> str:
     """
-    Encrypt both API key and secret.
+    Encrypt API key and secret together as one token.
+
+    The two values are joined with a unit separator and encrypted in a single
+    AES-GCM pass, so reading the credentials back costs one decrypt.
 
     Args:
         api_key: Plain text API key
         api_secret: Plain text API secret
 
     Returns:
-        Tuple of (encrypted_api_key, encrypted_api_secret)
+        Encrypted credentials token
+
+    Raises:
+        ValueError: If the API key contains the separator character
     """
-    encrypted_key = encrypt_api_key(api_key)
-    encrypted_secret = encrypt_api_key(api_secret)
-    return encrypted_key, encrypted_secret
+    if _CREDENTIALS_SEPARATOR in api_key:
+        raise ValueError("API key must not contain the \\x1f character")
+    return encrypt_api_key(api_key + _CREDENTIALS_SEPARATOR + api_secret)
 
 
-def decrypt_api_credentials(
-    encrypted_key: str, encrypted_secret: str
-) -> tuple[str, str]:
+def decrypt_api_credentials(encrypted_credentials: str) -> tuple[str, str]:
     """
-    Decrypt both API key and secret.
+    Decrypt a token created by encrypt_api_credentials.
 
     Args:
-        encrypted_key: Encrypted API key
-        encrypted_secret: Encrypted API secret
+        encrypted_credentials: Encrypted credentials token
 
     Returns:
         Tuple of (plain_api_key, plain_api_secret)
     """
-    plain_key = decrypt_api_key(encrypted_key)
-    plain_secret = decrypt_api_key(encrypted_secret)
+    plain_key, _, plain_secret = decrypt_api_key(encrypted_credentials).partition(
+        _CREDENTIALS_SEPARATOR
+    )
     return plain_key, plain_secret
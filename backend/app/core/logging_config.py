@@ -1,39 +1,43 @@
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
-from pathlib import Path
+from functools import cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
+from app.core.paths import LOG_DIR
 
+LOG_DIR.mkdir(exist_ok=True)
+
+# Handlers are shared by every logger so the log file is opened (and rotated)
+# by a single handler instead of one per module
+_console_handler = logging.StreamHandler(sys.stdout)
+_console_handler.setFormatter(logging.Formatter("%(message)s"))
+
+_file_handler = RotatingFileHandler(
+    LOG_DIR / "data_collection.log", maxBytes=5 * 1024 * 1024, backupCount=5
+)
+_file_handler.setFormatter(
+    logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
+)
+
+# File writes (and rollovers) happen on a background listener thread; loggers
+# only enqueue records. The formatter stays on the file handler.
+_log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+_queue_handler = QueueHandler(_log_queue)
+_listener = QueueListener(_log_queue, _file_handler, respect_handler_level=True)
+_listener.start()
+atexit.register(_listener.stop)
+
+
+@cache
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
     logger.setLevel(logging.INFO)
     # Prevent log messages from propagating to the root logger
     logger.propagate = False
 
-    # Determine backend root dynamically (assuming this file is in backend/app/core)
-    BACKEND_ROOT = (
-        Path(__file__).resolve().parents[2]
-    )  # Points to the 'backend' directory
-    LOG_DIR = BACKEND_ROOT / "logs"
-    LOG_DIR.mkdir(exist_ok=True)
-
-    # Add handlers only if they don't already exist
-    if not any(
-        isinstance(handler, logging.StreamHandler) for handler in logger.handlers
-    ):
-        # Console handler
-        console_handler = logging.StreamHandler(sys.stdout)
-        console_handler.setFormatter(logging.Formatter("%(message)s"))
-        logger.addHandler(console_handler)
-
-    if not any(isinstance(handler, RotatingFileHandler) for handler in logger.handlers):
-        # File handler
-        file_handler = RotatingFileHandler(
-            LOG_DIR / "data_collection.log", maxBytes=5 * 1024 * 1024, backupCount=5
-        )
-        file_handler.setFormatter(
-            logging.Formatter("%(asctime)s - %(levelname)s - %(name)s - %(message)s")
-        )
-        logger.addHandler(file_handler)
-
+    # Memoized per name, so handlers are attached exactly once
+    logger.addHandler(_console_handler)
+    logger.addHandler(_queue_handler)
     return logger
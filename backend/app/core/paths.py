@@ -0,0 +1,10 @@
+"""
+Filesystem locations of the backend, resolved once at import time.
+"""
+
+from pathlib import Path
+
+# backend/app/core/paths.py -> backend
+BACKEND_ROOT = Path(__file__).resolve().parents[2]
+LOG_DIR = BACKEND_ROOT / "logs"
+SCRIPTS_DIR = BACKEND_ROOT / "scripts"
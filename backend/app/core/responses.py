@@ -0,0 +1,19 @@
+"""
+Fast JSON Response
+
+Starlette's JSONResponse encodes with the stdlib ``json`` module, which is the
+slowest step when returning large list pages. ``pydantic_core.to_json`` is the
+Rust encoder pydantic already ships with, so it is used instead without adding
+a dependency such as orjson.
+"""
+
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        # Compact UTF-8 output, same as JSONResponse (ensure_ascii=False)
+        return pydantic_core.to_json(content)
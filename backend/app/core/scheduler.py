@@ -1,35 +1,32 @@
-import subprocess
-from pathlib import Path
-
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.core.config import settings
+from app.core.logging_config import get_logger
+from scripts.collect_price_data import main as collect_price_data_main
+from scripts.collect_symbols import main as collect_symbols_main
 
-# Get the project root directory (assuming this file is in backend/app/core)
-# You might need to adjust this based on your actual project structure
-# and where you run the application from.
-PROJECT_ROOT = Path(__file__).parent.parent.parent
+logger = get_logger(__name__)
 
 
-def run_collect_symbols():
-    """Executes the collect_symbols.py script."""
-    script_path = PROJECT_ROOT / "scripts" / "collect_symbols.py"
-    print(f"Executing script: {script_path}")
-    subprocess.run(["python", str(script_path)], check=True)
-    print("Finished executing collect_symbols.py")
+async def run_collect_symbols():
+    """Runs symbol collection in-process (reuses the warm DB pool)."""
+    logger.info("Starting symbol collection job...")
+    await collect_symbols_main()
+    logger.info("Finished symbol collection job")
 
 
-def run_collect_price_data():
-    """Executes the collect_price_data.py script."""
-    script_path = PROJECT_ROOT / "scripts" / "collect_price_data.py"
-    print(f"Executing script: {script_path}")
-    subprocess.run(["python", str(script_path)], check=True)
-    print("Finished executing collect_price_data.py")
+async def run_collect_price_data():
+    """Runs price data collection in-process (reuses the warm DB pool)."""
+    logger.info("Starting price data collection job...")
+    await collect_price_data_main(["--exchange", "all"])
+    logger.info("Finished price data collection job")
 
 
 scheduler = AsyncIOScheduler(timezone=str(settings.TZ))
 
 # Add jobs to the scheduler
-# Runs every day at midnight
-scheduler.add_job(run_collect_symbols, "cron", hour=0, minute=0)
-scheduler.add_job(run_collect_price_data, "cron", hour=0, minute=2)
+# Runs every day at midnight. A run that is still going when the next tick
+# fires is not started twice; a tick missed by up to an hour still runs once.
+job_defaults = {"max_instances": 1, "coalesce": True, "misfire_grace_time": 3600}
+scheduler.add_job(run_collect_symbols, "cron", hour=0, minute=0, **job_defaults)
+scheduler.add_job(run_collect_price_data, "cron", hour=0, minute=2, **job_defaults)
@@ -1,96 +1,147 @@
-from .exchanges import (
-    create_exchange,
-    delete_exchange,
-    get_exchange,
-    get_exchange_by_code,
-    get_exchanges,
-    update_exchange,
-)
-from .price_data import (
-    bulk_create_price_data,
-    create_price_data,
-    delete_price_data,
-    delete_price_data_by_symbol,
-    get_latest_price_data,
-    get_price_data,
-    get_price_data_by_symbol,
-    get_price_data_by_timestamp,
-    update_price_data,
-)
-from .realtime_price import (
-    bulk_upsert_realtime_prices,
-    create_realtime_price,
-    delete_realtime_price,
-    delete_realtime_price_by_symbol,
-    get_realtime_price,
-    get_realtime_price_by_symbol,
-    get_realtime_prices,
-    get_realtime_prices_by_symbols,
-    update_realtime_price,
-    upsert_realtime_price,
-)
-from .symbols import (
-    create_symbol,
-    delete_symbol,
-    get_symbol,
-    get_symbol_by_exchange_and_code,
-    get_symbols,
-    get_symbols_by_exchange,
-    update_symbol,
-)
-from .trading_strategies import (
-    create_strategy_symbol,
-    create_trading_strategy,
-    deactivate_trading_strategy,
-    delete_strategy_symbol,
-    delete_trading_strategy,
-    get_active_strategy_symbols,
-    get_active_trading_strategies,
-    get_strategy_symbol,
-    get_strategy_symbol_by_ids,
-    get_strategy_symbols,
-    get_trading_strategies,
-    get_trading_strategies_by_type,
-    get_trading_strategy,
-    update_strategy_symbol,
-    update_trading_strategy,
-)
-from .user_api_keys import (
-    create_user_api_key,
-    deactivate_user_api_key,
-    delete_user_api_key,
-    get_decrypted_api_key,
-    get_decrypted_api_key_by_exchange,
-    get_user_api_key,
-    get_user_api_key_by_exchange,
-    get_user_api_keys,
-    update_user_api_key,
-)
-from .users import (
-    authenticate,
-    create_user,
-    get_user_by_email,
-    update_user,
-)
+"""
+CRUD package
+
+Public functions are re-exported lazily (PEP 562): a submodule is imported the
+first time one of its names is accessed, so code that only touches exchanges
+does not pay for importing trading_strategies, user_api_keys and so on.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .exchanges import (
+        create_exchange,
+        delete_exchange,
+        get_exchange,
+        get_exchange_by_code,
+        get_exchange_id_by_code,
+        get_exchanges,
+        get_exchanges_by_ids,
+        touch_exchange,
+        update_exchange,
+        update_exchange_by_id,
+    )
+    from .price_data import (
+        bulk_create_price_data,
+        bulk_create_price_data_raw,
+        copy_price_data,
+        create_price_data,
+        delete_price_data,
+        delete_price_data_by_symbol,
+        get_latest_price_data,
+        get_latest_timestamps_by_symbols,
+        get_price_data,
+        get_price_data_by_symbol,
+        get_price_data_by_timestamp,
+        get_price_data_fields_by_symbol,
+        insert_price_data_rows,
+        iter_price_data_by_symbol,
+        touch_price_data,
+        update_price_data,
+        update_price_data_by_id,
+    )
+    from .realtime_price import (
+        bulk_upsert_realtime_prices,
+        create_realtime_price,
+        delete_realtime_price,
+        delete_realtime_price_by_symbol,
+        get_realtime_price,
+        get_realtime_price_by_symbol,
+        get_realtime_prices,
+        get_realtime_prices_by_symbols,
+        touch_realtime_price,
+        update_realtime_price,
+        update_realtime_price_by_id,
+        upsert_realtime_price,
+    )
+    from .symbols import (
+        bulk_upsert_symbols,
+        count_symbols_by_exchange,
+        create_symbol,
+        delete_symbol,
+        get_existing_symbol_ids,
+        get_symbol,
+        get_symbol_by_exchange_and_code,
+        get_symbol_id_by_exchange_and_code,
+        get_symbols,
+        get_symbols_by_exchange,
+        get_symbols_by_ids,
+        symbol_exists,
+        touch_symbol,
+        update_symbol,
+        update_symbol_by_id,
+    )
+    from .trading_strategies import (
+        bulk_create_strategy_symbols,
+        create_strategy_symbol,
+        create_trading_strategy,
+        deactivate_trading_strategy,
+        delete_strategy_symbol,
+        delete_trading_strategy,
+        get_missing_symbol_ids,
+        get_strategy_symbol,
+        get_strategy_symbol_by_ids,
+        get_strategy_symbols,
+        get_trading_strategies,
+        get_trading_strategies_by_ids,
+        get_trading_strategy,
+        strategy_symbol_exists,
+        touch_trading_strategy,
+        trading_strategy_exists,
+        update_strategy_symbol,
+        update_trading_strategy,
+    )
+    from .user_api_keys import (
+        active_user_api_key_exists,
+        create_user_api_key,
+        deactivate_user_api_key,
+        delete_user_api_key,
+        get_decrypted_api_key,
+        get_decrypted_api_key_by_exchange,
+        get_user_api_key,
+        get_user_api_key_by_exchange,
+        get_user_api_keys,
+        update_user_api_key,
+        user_api_key_exists,
+    )
+    from .users import (
+        authenticate,
+        create_user,
+        get_user_by_email,
+        update_user,
+    )
 
 __all__ = [
     # Exchanges
     "create_exchange",
     "delete_exchange",
     "get_exchange",
+    "get_exchanges_by_ids",
     "get_exchange_by_code",
+    "get_exchange_id_by_code",
     "get_exchanges",
     "update_exchange",
+    "update_exchange_by_id",
+    "touch_exchange",
     # Price Data
     "bulk_create_price_data",
+    "bulk_create_price_data_raw",
+    "copy_price_data",
     "create_price_data",
     "delete_price_data",
     "delete_price_data_by_symbol",
     "get_latest_price_data",
+    "get_latest_timestamps_by_symbols",
     "get_price_data",
     "get_price_data_by_symbol",
     "get_price_data_by_timestamp",
+    "get_price_data_fields_by_symbol",
+    "insert_price_data_rows",
+    "iter_price_data_by_symbol",
     "update_price_data",
+    "update_price_data_by_id",
+    "touch_price_data",
     # Realtime Price
     "bulk_upsert_realtime_prices",
     "create_realtime_price",
@@ -101,32 +152,46 @@ __all__ = [
     "get_realtime_prices",
     "get_realtime_prices_by_symbols",
     "update_realtime_price",
+    "update_realtime_price_by_id",
+    "touch_realtime_price",
     "upsert_realtime_price",
     # Symbols
+    "bulk_upsert_symbols",
+    "count_symbols_by_exchange",
     "create_symbol",
     "delete_symbol",
+    "get_existing_symbol_ids",
     "get_symbol",
+    "get_symbols_by_ids",
     "get_symbol_by_exchange_and_code",
+    "get_symbol_id_by_exchange_and_code",
     "get_symbols",
     "get_symbols_by_exchange",
+    "symbol_exists",
     "update_symbol",
+    "update_symbol_by_id",
+    "touch_symbol",
     # Trading Strategies
+    "bulk_create_strategy_symbols",
     "create_strategy_symbol",
     "create_trading_strategy",
     "deactivate_trading_strategy",
     "delete_strategy_symbol",
     "delete_trading_strategy",
-    "get_active_strategy_symbols",
-    "get_active_trading_strategies",
+    "get_missing_symbol_ids",
     "get_strategy_symbol",
     "get_strategy_symbol_by_ids",
     "get_strategy_symbols",
     "get_trading_strategies",
-    "get_trading_strategies_by_type",
     "get_trading_strategy",
+    "get_trading_strategies_by_ids",
+    "strategy_symbol_exists",
+    "trading_strategy_exists",
+    "touch_trading_strategy",
     "update_strategy_symbol",
     "update_trading_strategy",
     # User API Keys
+    "active_user_api_key_exists",
     "create_user_api_key",
     "deactivate_user_api_key",
     "delete_user_api_key",
@@ -136,9 +201,115 @@ __all__ = [
     "get_user_api_key_by_exchange",
     "get_user_api_keys",
     "update_user_api_key",
+    "user_api_key_exists",
     # Users
     "authenticate",
     "create_user",
     "get_user_by_email",
     "update_user",
 ]
+
+# 공개 이름 -> 정의된 하위 모듈
+_EXPORTS: dict[str, str] = {
+    "create_exchange": "exchanges",
+    "delete_exchange": "exchanges",
+    "get_exchange": "exchanges",
+    "get_exchanges_by_ids": "exchanges",
+    "get_exchange_by_code": "exchanges",
+    "get_exchange_id_by_code": "exchanges",
+    "get_exchanges": "exchanges",
+    "update_exchange": "exchanges",
+    "update_exchange_by_id": "exchanges",
+    "touch_exchange": "exchanges",
+    "bulk_create_price_data": "price_data",
+    "bulk_create_price_data_raw": "price_data",
+    "copy_price_data": "price_data",
+    "create_price_data": "price_data",
+    "delete_price_data": "price_data",
+    "delete_price_data_by_symbol": "price_data",
+    "get_latest_price_data": "price_data",
+    "get_latest_timestamps_by_symbols": "price_data",
+    "get_price_data": "price_data",
+    "get_price_data_by_symbol": "price_data",
+    "get_price_data_by_timestamp": "price_data",
+    "get_price_data_fields_by_symbol": "price_data",
+    "insert_price_data_rows": "price_data",
+    "iter_price_data_by_symbol": "price_data",
+    "update_price_data": "price_data",
+    "update_price_data_by_id": "price_data",
+    "touch_price_data": "price_data",
+    "bulk_upsert_realtime_prices": "realtime_price",
+    "create_realtime_price": "realtime_price",
+    "delete_realtime_price": "realtime_price",
+    "delete_realtime_price_by_symbol": "realtime_price",
+    "get_realtime_price": "realtime_price",
+    "get_realtime_price_by_symbol": "realtime_price",
+    "get_realtime_prices": "realtime_price",
+    "get_realtime_prices_by_symbols": "realtime_price",
+    "update_realtime_price": "realtime_price",
+    "update_realtime_price_by_id": "realtime_price",
+    "touch_realtime_price": "realtime_price",
+    "upsert_realtime_price": "realtime_price",
+    "bulk_upsert_symbols": "symbols",
+    "count_symbols_by_exchange": "symbols",
+    "create_symbol": "symbols",
+    "delete_symbol": "symbols",
+    "get_existing_symbol_ids": "symbols",
+    "get_symbol": "symbols",
+    "get_symbols_by_ids": "symbols",
+    "get_symbol_by_exchange_and_code": "symbols",
+    "get_symbol_id_by_exchange_and_code": "symbols",
+    "get_symbols": "symbols",
+    "get_symbols_by_exchange": "symbols",
+    "symbol_exists": "symbols",
+    "update_symbol": "symbols",
+    "update_symbol_by_id": "symbols",
+    "touch_symbol": "symbols",
+    "bulk_create_strategy_symbols": "trading_strategies",
+    "create_strategy_symbol": "trading_strategies",
+    "create_trading_strategy": "trading_strategies",
+    "deactivate_trading_strategy": "trading_strategies",
+    "delete_strategy_symbol": "trading_strategies",
+    "delete_trading_strategy": "trading_strategies",
+    "get_missing_symbol_ids": "trading_strategies",
+    "get_strategy_symbol": "trading_strategies",
+    "get_strategy_symbol_by_ids": "trading_strategies",
+    "get_strategy_symbols": "trading_strategies",
+    "get_trading_strategies": "trading_strategies",
+    "get_trading_strategy": "trading_strategies",
+    "get_trading_strategies_by_ids": "trading_strategies",
+    "strategy_symbol_exists": "trading_strategies",
+    "trading_strategy_exists": "trading_strategies",
+    "touch_trading_strategy": "trading_strategies",
+    "update_strategy_symbol": "trading_strategies",
+    "update_trading_strategy": "trading_strategies",
+    "active_user_api_key_exists": "user_api_keys",
+    "create_user_api_key": "user_api_keys",
+    "deactivate_user_api_key": "user_api_keys",
+    "delete_user_api_key": "user_api_keys",
+    "get_decrypted_api_key": "user_api_keys",
+    "get_decrypted_api_key_by_exchange": "user_api_keys",
+    "get_user_api_key": "user_api_keys",
+    "get_user_api_key_by_exchange": "user_api_keys",
+    "get_user_api_keys": "user_api_keys",
+    "update_user_api_key": "user_api_keys",
+    "user_api_key_exists": "user_api_keys",
+    "authenticate": "users",
+    "create_user": "users",
+    "get_user_by_email": "users",
+    "update_user": "users",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    # 이후 접근은 __getattr__을 거치지 않도록 패키지에 캐시
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -1,51 +1,144 @@
+from collections.abc import Collection
 from typing import Any
 
+from sqlalchemy import bindparam, delete, lambda_stmt, update
 from sqlmodel import Session, select
 
+from app.core.cache import exchange_id_by_code_cache, exchanges_cache
+from app.crud.pagination import get_page_with_count
+from app.crud.persist import persist
 from app.models.exchanges import Exchange, ExchangeCreate, ExchangeUpdate
 
+# 조회 빈도가 높은 구문은 모듈 로드 시 한 번만 구성하고 파라미터만 바꿔 실행
+_get_exchange_by_code_stmt = lambda_stmt(
+    lambda: select(Exchange).where(Exchange.code == bindparam("code"))
+)
 
-def create_exchange(*, session: Session, exchange_create: ExchangeCreate) -> Exchange:
+
+def create_exchange(
+    *, session: Session, exchange_create: ExchangeCreate, commit: bool = True
+) -> Exchange:
     db_obj = Exchange.model_validate(exchange_create)
-    session.add(db_obj)
-    session.commit()
-    session.refresh(db_obj)
-    return db_obj
+    return persist(session, db_obj, commit=commit)
 
 
 def get_exchange(*, session: Session, exchange_id: int) -> Exchange | None:
-    statement = select(Exchange).where(Exchange.id == exchange_id)
-    return session.exec(statement).first()
+    # PK 조회는 identity map에 이미 로드된 경우 SQL 없이 반환
+    return session.get(Exchange, exchange_id)
+
+
+def get_exchanges_by_ids(
+    *, session: Session, exchange_ids: Collection[int]
+) -> dict[int, Exchange]:
+    # ID마다 get_exchange를 반복하지 않고 단일 IN 쿼리로 조회 (id -> Exchange)
+    if not exchange_ids:
+        return {}
+    statement = select(Exchange).where(Exchange.id.in_(exchange_ids))
+    return {exchange.id: exchange for exchange in session.exec(statement).all()}
 
 
 def get_exchange_by_code(*, session: Session, code: str) -> Exchange | None:
-    statement = select(Exchange).where(Exchange.code == code)
-    return session.exec(statement).first()
+    # code는 unique이므로 최대 한 행
+    return session.execute(
+        _get_exchange_by_code_stmt, {"code": code}
+    ).scalar_one_or_none()
+
+
+def get_exchange_id_by_code(*, session: Session, code: str) -> int | None:
+    # 코드 -> ID 변환은 수집/쓰기 때마다 반복되므로 존재하는 코드만 TTL 캐시에 저장
+    exchange_id = exchange_id_by_code_cache.get(code)
+    if exchange_id is not None:
+        return exchange_id
+    statement = select(Exchange.id).where(Exchange.code == code)
+    exchange_id = session.exec(statement).one_or_none()
+    if exchange_id is not None:
+        exchange_id_by_code_cache.set(code, exchange_id)
+    return exchange_id
 
 
 def get_exchanges(
-    *, session: Session, skip: int = 0, limit: int = 100
-) -> list[Exchange]:
-    statement = select(Exchange).offset(skip).limit(limit)
-    return list(session.exec(statement).all())
+    *,
+    session: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: int | None = None,
+) -> tuple[list[Exchange], int]:
+    statement = select(Exchange).order_by(Exchange.id.asc())
+    # keyset 페이지네이션: OFFSET 스캔 없이 PK 인덱스로 바로 이동
+    keyset = Exchange.id > after_id if after_id is not None else None
+    return get_page_with_count(
+        session=session, statement=statement, skip=skip, limit=limit, keyset=keyset
+    )
 
 
 def update_exchange(
-    *, session: Session, db_exchange: Exchange, exchange_in: ExchangeUpdate
+    *,
+    session: Session,
+    db_exchange: Exchange,
+    exchange_in: ExchangeUpdate,
+    commit: bool = True,
 ) -> Any:
     exchange_data = exchange_in.model_dump(exclude_unset=True)
     db_exchange.sqlmodel_update(exchange_data)
-    session.add(db_exchange)
-    session.commit()
-    session.refresh(db_exchange)
-    return db_exchange
+    # 코드가 바뀔 수 있으므로 코드 -> ID 캐시 전체를 비움
+    exchange_id_by_code_cache.clear()
+    return persist(session, db_exchange, commit=commit)
 
 
-def delete_exchange(*, session: Session, exchange_id: int) -> bool:
-    exchange = get_exchange(session=session, exchange_id=exchange_id)
-    if exchange:
-        session.delete(exchange)
+def update_exchange_by_id(
+    *,
+    session: Session,
+    exchange_id: int,
+    exchange_in: ExchangeUpdate,
+    commit: bool = True,
+) -> Exchange | None:
+    # 사전 SELECT/refresh 없이 UPDATE ... RETURNING 한 번으로 수정 후 행 반환
+    exchange_data = exchange_in.model_dump(exclude_unset=True)
+    if not exchange_data:
+        return get_exchange(session=session, exchange_id=exchange_id)
+    statement = (
+        update(Exchange)
+        .where(Exchange.id == exchange_id)
+        .values(**exchange_data)
+        .returning(Exchange)
+    )
+    exchange = session.execute(
+        statement, execution_options={"populate_existing": True}
+    ).scalar_one_or_none()
+    exchange_id_by_code_cache.clear()
+    if exchange is not None:
+        # RETURNING으로 모든 컬럼을 받았으므로 commit 시 만료 -> 재조회되지 않도록 분리
+        session.expunge(exchange)
+    if commit:
+        session.commit()
+    return exchange
+
+
+def touch_exchange(
+    *,
+    session: Session,
+    exchange_id: int,
+    exchange_in: ExchangeUpdate,
+    commit: bool = True,
+) -> int:
+    # 결과 행이 필요 없는 호출용: RETURNING/재조회 없이 UPDATE만 실행하고 영향 행 수 반환
+    exchange_data = exchange_in.model_dump(exclude_unset=True)
+    if not exchange_data:
+        raise ValueError("No fields to update")
+    result = session.execute(
+        update(Exchange).where(Exchange.id == exchange_id).values(**exchange_data)
+    )
+    # 라우트를 거치지 않는 호출도 있으므로 목록 응답 캐시까지 비움
+    exchange_id_by_code_cache.clear()
+    exchanges_cache.clear()
+    if commit:
         session.commit()
-        return True
-    return False
+    return result.rowcount
+
 
+def delete_exchange(*, session: Session, exchange_id: int) -> bool:
+    # 행을 읽어오지 않고 단일 DELETE 문으로 삭제
+    result = session.execute(delete(Exchange).where(Exchange.id == exchange_id))
+    session.commit()
+    exchange_id_by_code_cache.clear()
+    return result.rowcount > 0
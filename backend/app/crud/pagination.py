@@ -0,0 +1,90 @@
+from typing import Any
+
+from sqlalchemy import ColumnElement, Select, func
+from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+def get_page_with_count(
+    *,
+    session: Session,
+    statement: Select[Any],
+    skip: int = 0,
+    limit: int = 100,
+    as_mappings: bool = False,
+    keyset: ColumnElement[bool] | None = None,
+) -> tuple[list[Any], int]:
+    """
+    페이지 데이터와 전체 개수를 한 번의 쿼리로 조회
+
+    COUNT(*) OVER ()는 LIMIT/OFFSET 적용 전에 계산되므로 별도 count 쿼리 없이
+    필터 조건에 맞는 전체 행 수가 각 행에 함께 실려 온다.
+    keyset 커서 조건은 WHERE에 들어가 윈도 함수 결과를 줄이므로, 커서를 쓸 때는
+    커서 조건이 없는 statement의 개수를 스칼라 서브쿼리로 같은 쿼리에 싣는다.
+
+    Args:
+        session: 데이터베이스 세션
+        statement: 필터/정렬이 적용된 select (offset/limit, 커서 조건 미적용)
+        skip: 페이지네이션 offset (keyset이 있으면 무시)
+        limit: 페이지네이션 limit
+        as_mappings: True면 첫 컬럼 대신 선택한 모든 컬럼을 dict로 반환 (projection용)
+        keyset: keyset 커서 조건 (페이지에만 적용되고 전체 개수에는 미적용)
+
+    Returns:
+        (페이지 데이터, 전체 개수)
+    """
+    count_statement = select(func.count()).select_from(
+        statement.order_by(None).subquery()
+    )
+    if keyset is None:
+        page_statement = (
+            statement.add_columns(func.count().over().label("total"))
+            .offset(skip)
+            .limit(limit)
+        )
+    else:
+        skip = 0
+        page_statement = (
+            statement.add_columns(count_statement.scalar_subquery().label("total"))
+            .where(keyset)
+            .limit(limit)
+        )
+    rows = session.execute(page_statement).all()
+    if rows:
+        total = rows[-1].total
+        if as_mappings:
+            items = [dict(row._mapping) for row in rows]
+            for item in items:
+                del item["total"]
+            return items, total
+        return [row[0] for row in rows], total
+
+    if skip == 0 and keyset is None:
+        return [], 0
+
+    # OFFSET/커서가 전체 범위를 넘어선 경우에만 별도 count 쿼리로 전체 개수 확인
+    return [], session.exec(count_statement).one()
+
+
+async def get_page_with_count_async(
+    *,
+    session: AsyncSession,
+    statement: Select[Any],
+    skip: int = 0,
+    limit: int = 100,
+    as_mappings: bool = False,
+    keyset: ColumnElement[bool] | None = None,
+) -> tuple[list[Any], int]:
+    """
+    AsyncSession용 get_page_with_count (동일한 쿼리를 run_sync로 실행)
+    """
+    return await session.run_sync(
+        lambda sync_session: get_page_with_count(
+            session=sync_session,
+            statement=statement,
+            skip=skip,
+            limit=limit,
+            as_mappings=as_mappings,
+            keyset=keyset,
+        )
+    )
@@ -0,0 +1,52 @@
+from typing import TypeVar
+
+from sqlmodel import Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+
+def persist(
+    session: Session, obj: ModelT, *, commit: bool = True, refresh: bool = False
+) -> ModelT:
+    """
+    단일 객체 INSERT/UPDATE 반영
+
+    commit=False면 flush만 수행해 PK를 채우고 커밋은 호출자에게 맡김
+    (여러 쓰기를 한 트랜잭션으로 묶어 커밋(fsync)을 한 번만 하도록 할 때 사용)
+
+    commit=True면 flush 후 객체를 세션에서 분리한 뒤 커밋함. INSERT 시 PK는
+    RETURNING으로 이미 채워지고 나머지 값은 애플리케이션이 설정한 값이므로,
+    커밋 후 만료 -> 재조회(SELECT)가 필요 없음. DB가 계산한 값을 다시 읽어야
+    하는 경우에만 refresh=True 사용
+    """
+    session.add(obj)
+    session.flush()
+    if not commit:
+        return obj
+    if refresh:
+        session.commit()
+        session.refresh(obj)
+        return obj
+    session.expunge(obj)
+    session.commit()
+    return obj
+
+
+async def persist_async(
+    session: AsyncSession, obj: ModelT, *, commit: bool = True, refresh: bool = False
+) -> ModelT:
+    """
+    AsyncSession용 persist
+    """
+    session.add(obj)
+    await session.flush()
+    if not commit:
+        return obj
+    if refresh:
+        await session.commit()
+        await session.refresh(obj)
+        return obj
+    session.expunge(obj)
+    await session.commit()
+    return obj
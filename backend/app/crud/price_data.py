@@ -1,44 +1,310 @@
-from datetime import datetime
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    bindparam,
+    delete,
+    func,
+    lambda_stmt,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import Session, select
 
-from app.models.price_data import PriceData, PriceDataCreate, PriceDataUpdate
+from app.core.cache import latest_price_data_cache, price_data_page_cache
+from app.crud.pagination import get_page_with_count
+from app.crud.persist import persist
+from app.models.price_data import (
+    PriceData,
+    PriceDataCreate,
+    PriceDataPublic,
+    PriceDataUpdate,
+)
+
+# projection 조회에서 선택 가능한 컬럼 (PriceDataPublic 필드, 응답 필드 순서 유지)
+PRICE_DATA_COLUMNS = tuple(PriceDataPublic.model_fields)
+PRICE_DATA_FIELDS = frozenset(PRICE_DATA_COLUMNS)
+
+# 조회 범위를 봉 격자에 맞춰도 결과가 같은 시간 프레임
+# (KST는 UTC와 정시 단위로 차이나므로 1시간 이하 봉은 UTC 격자 위에 있음)
+_SNAP_GRAINS = {
+    "1m": timedelta(minutes=1),
+    "3m": timedelta(minutes=3),
+    "5m": timedelta(minutes=5),
+    "10m": timedelta(minutes=10),
+    "15m": timedelta(minutes=15),
+    "30m": timedelta(minutes=30),
+    "1h": timedelta(hours=1),
+}
+
+# COPY 대량 적재 시 사용할 컬럼 (id는 시퀀스로 채움)
+_COPY_COLUMNS = ", ".join(
+    (
+        "symbol_id",
+        "timestamp",
+        "timeframe",
+        "open_price",
+        "high_price",
+        "low_price",
+        "close_price",
+        "volume",
+        "quote_volume",
+        "created_at",
+    )
+)
+
+# 조회 빈도가 높은 구문은 모듈 로드 시 한 번만 구성하고 파라미터만 바꿔 실행
+_get_price_data_by_timestamp_stmt = lambda_stmt(
+    lambda: select(PriceData).where(
+        PriceData.symbol_id == bindparam("symbol_id"),
+        PriceData.timestamp == bindparam("timestamp"),
+        PriceData.timeframe == bindparam("timeframe"),
+    )
+)
+_get_latest_price_data_stmt = lambda_stmt(
+    lambda: select(PriceData)
+    .where(
+        PriceData.symbol_id == bindparam("symbol_id"),
+        PriceData.timeframe == bindparam("timeframe"),
+    )
+    .order_by(PriceData.timestamp.desc())
+    .limit(1)
+)
 
 
 def create_price_data(
-    *, session: Session, price_data_create: PriceDataCreate
+    *, session: Session, price_data_create: PriceDataCreate, commit: bool = True
 ) -> PriceData:
     """
     가격 데이터 생성
+
+    commit=False면 flush만 하고 커밋은 호출자에게 맡김 (persist 참고)
     """
     db_obj = PriceData.model_validate(price_data_create)
-    session.add(db_obj)
-    session.commit()
-    session.refresh(db_obj)
-    return db_obj
+    return persist(session, db_obj, commit=commit)
+
+
+def _price_data_rows(price_data_list: list[PriceDataCreate]) -> list[dict[str, Any]]:
+    """
+    PriceDataCreate 목록을 INSERT용 dict 목록으로 변환
+
+    입력은 이미 검증된 스키마이므로 행마다 PriceData 인스턴스를 만들지 않고
+    model_dump 결과에 created_at만 한 번 계산해 채움
+    """
+    created_at = datetime.now(timezone.utc)
+    return [{**item.model_dump(), "created_at": created_at} for item in price_data_list]
 
 
 def bulk_create_price_data(
-    *, session: Session, price_data_list: list[PriceDataCreate]
+    *,
+    session: Session,
+    price_data_list: list[PriceDataCreate],
+    commit: bool = True,
 ) -> list[PriceData]:
     """
     가격 데이터 대량 생성 (배치 삽입)
+
+    INSERT ... ON CONFLICT DO NOTHING으로 (symbol_id, timestamp, timeframe)
+    중복은 DB에서 스킵하며, 실제로 삽입된 행만 반환
     """
-    db_objs = [PriceData.model_validate(item) for item in price_data_list]
-    session.add_all(db_objs)
-    session.commit()
-    for obj in db_objs:
-        session.refresh(obj)
-    return db_objs
+    rows = _price_data_rows(price_data_list)
+    statement = (
+        pg_insert(PriceData)
+        .on_conflict_do_nothing(index_elements=["symbol_id", "timestamp", "timeframe"])
+        .returning(PriceData)
+    )
+    created = sorted(session.scalars(statement, rows).all(), key=lambda obj: obj.id)
+
+    # RETURNING으로 이미 모든 컬럼을 받았으므로 commit 전에 세션에서 분리해
+    # commit 시 만료 -> 재조회(SELECT)가 일어나지 않도록 함
+    for obj in created:
+        session.expunge(obj)
+    if commit:
+        session.commit()
+    return created
+
+
+def bulk_create_price_data_raw(
+    *,
+    session: Session,
+    price_data_list: list[PriceDataCreate],
+    commit: bool = True,
+) -> int:
+    """
+    가격 데이터 대량 생성 (ORM 객체 미반환)
+
+    수집 파이프라인처럼 삽입된 행이 필요 없는 경우용 (insert_price_data_rows 참고)
+
+    Returns:
+        실제로 삽입된 행 수 (중복 제외)
+    """
+    return insert_price_data_rows(
+        session=session,
+        rows=[item.model_dump() for item in price_data_list],
+        commit=commit,
+    )
+
+
+def insert_price_data_rows(
+    *,
+    session: Session,
+    rows: list[dict[str, Any]],
+    commit: bool = True,
+) -> int:
+    """
+    가격 데이터 dict 목록 대량 삽입
+
+    수집기가 만든 dict를 스키마 검증 없이 그대로 사용. ORM 엔티티 대신
+    Core 테이블에 INSERT ... ON CONFLICT DO NOTHING을 실행하고 id만 돌려받음
+    (executemany는 rowcount를 제공하지 않으므로 RETURNING id로 삽입 수 계산)
+
+    Returns:
+        실제로 삽입된 행 수 (중복 제외)
+    """
+    if not rows:
+        return 0
+    created_at = datetime.now(timezone.utc)
+    table = PriceData.__table__
+    statement = (
+        pg_insert(table)
+        .on_conflict_do_nothing(index_elements=["symbol_id", "timestamp", "timeframe"])
+        .returning(table.c.id)
+    )
+    inserted_ids = session.execute(
+        statement, [{**row, "created_at": created_at} for row in rows]
+    ).all()
+    if commit:
+        session.commit()
+    return len(inserted_ids)
+
+
+def copy_price_data(
+    *,
+    session: Session,
+    price_data_rows: Iterable[PriceDataCreate],
+    commit: bool = True,
+) -> int:
+    """
+    COPY FROM STDIN으로 가격 데이터 대량 적재 (백필/히스토리 임포트용)
+
+    수십만 행 이상에서는 INSERT보다 COPY가 SQL 파싱을 건너뛰어 훨씬 빠름
+    COPY는 ON CONFLICT를 지원하지 않으므로 임시 테이블에 COPY한 뒤
+    INSERT ... SELECT ... ON CONFLICT DO NOTHING으로 옮김
+    rows는 이터러블이면 되므로 전체 목록을 메모리에 올리지 않고 스트리밍 가능
+    1만 행 이하 배치는 bulk_create_price_data가 더 간단함
+
+    Returns:
+        실제로 삽입된 행 수 (중복 제외)
+    """
+    created_at = datetime.now(timezone.utc)
+    # 세션 트랜잭션에 묶인 psycopg 연결을 직접 사용
+    dbapi_connection = session.connection().connection.driver_connection
+    with dbapi_connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMP TABLE pricedata_copy AS "
+            f"SELECT {_COPY_COLUMNS} FROM pricedata WITH NO DATA"
+        )
+        with cursor.copy(f"COPY pricedata_copy ({_COPY_COLUMNS}) FROM STDIN") as copy:
+            for item in price_data_rows:
+                copy.write_row(
+                    (
+                        item.symbol_id,
+                        item.timestamp,
+                        item.timeframe,
+                        item.open_price,
+                        item.high_price,
+                        item.low_price,
+                        item.close_price,
+                        item.volume,
+                        item.quote_volume,
+                        created_at,
+                    )
+                )
+        cursor.execute(
+            f"INSERT INTO pricedata ({_COPY_COLUMNS}) "
+            f"SELECT {_COPY_COLUMNS} FROM pricedata_copy "
+            "ON CONFLICT (symbol_id, timestamp, timeframe) DO NOTHING"
+        )
+        inserted = cursor.rowcount
+        cursor.execute("DROP TABLE pricedata_copy")
+
+    if commit:
+        session.commit()
+    return inserted
 
 
 def get_price_data(*, session: Session, price_data_id: int) -> PriceData | None:
     """
     ID로 가격 데이터 조회
     """
-    statement = select(PriceData).where(PriceData.id == price_data_id)
-    return session.exec(statement).first()
+    # PK 조회는 identity map에 이미 로드된 경우 SQL 없이 반환
+    return session.get(PriceData, price_data_id)
+
+
+def _floor_to_grain(value: datetime, grain: timedelta) -> datetime:
+    epoch = datetime(1970, 1, 1, tzinfo=timezone.utc if value.tzinfo else None)
+    return value - (value - epoch) % grain
+
+
+def snap_time_range(
+    start_time: datetime | None, end_time: datetime | None, timeframe: str
+) -> tuple[datetime | None, datetime | None]:
+    """
+    조회 범위 경계를 봉 격자에 맞춤 (시작은 올림, 끝은 내림)
+
+    봉 timestamp는 격자 위에 있으므로 조회 결과는 그대로이고, 대시보드처럼
+    비슷한 시각에 반복되는 요청이 같은 범위 값을 갖게 되어 응답 캐시를 재사용함
+    격자가 보장되지 않는 시간 프레임('4h', '1d' 등)은 그대로 반환
+    """
+    grain = _SNAP_GRAINS.get(timeframe)
+    if grain is None:
+        return start_time, end_time
+    if start_time is not None:
+        floored = _floor_to_grain(start_time, grain)
+        start_time = floored if floored == start_time else floored + grain
+    if end_time is not None:
+        end_time = _floor_to_grain(end_time, grain)
+    return start_time, end_time
+
+
+def _filter_price_data_by_symbol(
+    statement: Select[Any],
+    *,
+    symbol_id: int,
+    timeframe: str,
+    start_time: datetime | None,
+    end_time: datetime | None,
+) -> Select[Any]:
+    """
+    종목별 가격 데이터 조회 조건/정렬 적용
+    """
+    statement = statement.where(
+        PriceData.symbol_id == symbol_id, PriceData.timeframe == timeframe
+    )
+
+    start_time, end_time = snap_time_range(start_time, end_time, timeframe)
+    if start_time:
+        statement = statement.where(PriceData.timestamp >= start_time)
+    if end_time:
+        statement = statement.where(PriceData.timestamp <= end_time)
+
+    # 시간 역순 정렬 (최신 데이터 먼저), 동일 timestamp는 id로 순서 고정
+    return statement.order_by(PriceData.timestamp.desc(), PriceData.id.desc())
+
+
+def _price_data_keyset(
+    after_timestamp: datetime | None, after_id: int | None
+) -> ColumnElement[bool] | None:
+    """
+    keyset 페이지네이션 커서 조건: (timestamp, id) 행 비교로 인덱스 범위 스캔
+    """
+    if after_timestamp is None or after_id is None:
+        return None
+    return tuple_(PriceData.timestamp, PriceData.id) < (after_timestamp, after_id)
 
 
 def get_price_data_by_symbol(
@@ -50,7 +316,9 @@ def get_price_data_by_symbol(
     end_time: datetime | None = None,
     skip: int = 0,
     limit: int = 1000,
-) -> list[PriceData]:
+    after_timestamp: datetime | None = None,
+    after_id: int | None = None,
+) -> tuple[list[PriceData], int]:
     """
     특정 종목의 가격 데이터 조회 (시간 범위 필터 가능)
 
@@ -60,22 +328,116 @@ def get_price_data_by_symbol(
         timeframe: 시간 프레임 ('1d', '1h' 등)
         start_time: 시작 시간 (포함)
         end_time: 종료 시간 (포함)
-        skip: 페이지네이션 offset
+        skip: 페이지네이션 offset (커서가 없을 때만 사용)
         limit: 페이지네이션 limit (최대 1000)
+        after_timestamp: keyset 커서 - 이전 페이지 마지막 행의 timestamp
+        after_id: keyset 커서 - 이전 페이지 마지막 행의 id
+
+    Returns:
+        (가격 데이터 목록, 전체 개수) - 커서 사용 여부와 무관하게 필터 조건의 전체 개수
     """
-    statement = select(PriceData).where(
-        PriceData.symbol_id == symbol_id, PriceData.timeframe == timeframe
+    statement = _filter_price_data_by_symbol(
+        select(PriceData),
+        symbol_id=symbol_id,
+        timeframe=timeframe,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    return get_page_with_count(
+        session=session,
+        statement=statement,
+        skip=skip,
+        limit=limit,
+        keyset=_price_data_keyset(after_timestamp, after_id),
     )
 
-    if start_time:
-        statement = statement.where(PriceData.timestamp >= start_time)
-    if end_time:
-        statement = statement.where(PriceData.timestamp <= end_time)
 
-    # 시간 역순 정렬 (최신 데이터 먼저)
-    statement = statement.order_by(PriceData.timestamp.desc()).offset(skip).limit(limit)
+def get_price_data_fields_by_symbol(
+    *,
+    session: Session,
+    symbol_id: int,
+    timeframe: str,
+    fields: list[str] | None = None,
+    start_time: datetime | None = None,
+    end_time: datetime | None = None,
+    skip: int = 0,
+    limit: int = 1000,
+    after_timestamp: datetime | None = None,
+    after_id: int | None = None,
+) -> tuple[list[dict[str, Any]], int]:
+    """
+    특정 종목의 가격 데이터 중 지정한 컬럼만 조회 (projection)
+
+    차트처럼 OHLCV만 필요한 경우 SELECT * 대신 필요한 컬럼만 읽어
+    전송량과 직렬화 비용을 줄임. keyset 커서용 id, timestamp는 항상 포함
+    ORM 객체를 만들지 않고 Core 행 매핑을 반환하므로 읽기 전용 API 응답에 사용
+
+    Args:
+        fields: 조회할 컬럼명 목록 (PRICE_DATA_FIELDS 중 선택, None이면 전체)
+        나머지 인자는 get_price_data_by_symbol과 동일
+
+    Returns:
+        (컬럼명-값 dict 목록, 전체 개수)
+    """
+    if fields is None:
+        names = list(PRICE_DATA_COLUMNS)
+    else:
+        names = [
+            "id",
+            "timestamp",
+            *(f for f in fields if f not in ("id", "timestamp")),
+        ]
+    columns = [PriceData.__table__.c[name] for name in names]
+    statement = _filter_price_data_by_symbol(
+        select(*columns),
+        symbol_id=symbol_id,
+        timeframe=timeframe,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    return get_page_with_count(
+        session=session,
+        statement=statement,
+        skip=skip,
+        limit=limit,
+        as_mappings=True,
+        keyset=_price_data_keyset(after_timestamp, after_id),
+    )
+
+
+def iter_price_data_by_symbol(
+    *,
+    session: Session,
+    symbol_id: int,
+    timeframe: str,
+    start_time: datetime | None = None,
+    end_time: datetime | None = None,
+    limit: int | None = None,
+    yield_per: int = 200,
+) -> Iterator[dict[str, Any]]:
+    """
+    특정 종목의 가격 데이터를 서버 사이드 커서로 스트리밍 조회
+
+    전체 결과를 메모리에 올리지 않고 yield_per 행 단위로 가져오며,
+    ORM 객체 대신 컬럼명-값 매핑을 반환. 대량 히스토리 내보내기용
+
+    Args:
+        limit: 최대 행 수 (None이면 조건에 맞는 전체)
+        yield_per: 한 번에 DB에서 가져올 행 수
+    """
+    statement = _filter_price_data_by_symbol(
+        select(PriceData.__table__),
+        symbol_id=symbol_id,
+        timeframe=timeframe,
+        start_time=start_time,
+        end_time=end_time,
+    )
+    if limit is not None:
+        statement = statement.limit(limit)
 
-    return list(session.exec(statement).all())
+    result = session.execute(statement.execution_options(yield_per=yield_per))
+    for row in result.mappings():
+        yield dict(row)
 
 
 def get_latest_price_data(
@@ -84,13 +446,33 @@ def get_latest_price_data(
     """
     특정 종목의 가장 최신 가격 데이터 조회
     """
+    return session.execute(
+        _get_latest_price_data_stmt,
+        {"symbol_id": symbol_id, "timeframe": timeframe},
+    ).scalar_one_or_none()
+
+
+def get_latest_timestamps_by_symbols(
+    *, session: Session, symbol_ids: Iterable[int], timeframe: str
+) -> dict[int, datetime]:
+    """
+    여러 종목의 가장 최신 가격 데이터 시각을 한 번에 조회
+
+    종목마다 get_latest_price_data를 호출하지 않고 GROUP BY 한 번으로
+    종목별 max(timestamp)를 계산 (데이터가 없는 종목은 결과에 포함되지 않음)
+    """
+    symbol_ids = list(symbol_ids)
+    if not symbol_ids:
+        return {}
     statement = (
-        select(PriceData)
-        .where(PriceData.symbol_id == symbol_id, PriceData.timeframe == timeframe)
-        .order_by(PriceData.timestamp.desc())
-        .limit(1)
+        select(PriceData.symbol_id, func.max(PriceData.timestamp))
+        .where(
+            PriceData.symbol_id.in_(symbol_ids),
+            PriceData.timeframe == timeframe,
+        )
+        .group_by(PriceData.symbol_id)
     )
-    return session.exec(statement).first()
+    return dict(session.exec(statement).all())
 
 
 def get_price_data_by_timestamp(
@@ -103,38 +485,102 @@ def get_price_data_by_timestamp(
     """
     특정 종목의 특정 시각 가격 데이터 조회
     """
-    statement = select(PriceData).where(
-        PriceData.symbol_id == symbol_id,
-        PriceData.timestamp == timestamp,
-        PriceData.timeframe == timeframe,
-    )
-    return session.exec(statement).first()
+    return session.execute(
+        _get_price_data_by_timestamp_stmt,
+        {"symbol_id": symbol_id, "timestamp": timestamp, "timeframe": timeframe},
+    ).scalar_one_or_none()
 
 
 def update_price_data(
-    *, session: Session, db_price_data: PriceData, price_data_in: PriceDataUpdate
+    *,
+    session: Session,
+    db_price_data: PriceData,
+    price_data_in: PriceDataUpdate,
+    commit: bool = True,
 ) -> Any:
     """
     가격 데이터 업데이트 (일반적으로 가격 데이터는 수정하지 않지만 필요시 사용)
     """
     price_data_dict = price_data_in.model_dump(exclude_unset=True)
     db_price_data.sqlmodel_update(price_data_dict)
-    session.add(db_price_data)
-    session.commit()
-    session.refresh(db_price_data)
-    return db_price_data
+    return persist(session, db_price_data, commit=commit)
+
+
+def update_price_data_by_id(
+    *,
+    session: Session,
+    price_data_id: int,
+    price_data_in: PriceDataUpdate,
+    commit: bool = True,
+) -> PriceData | None:
+    """
+    ID로 가격 데이터 업데이트
+
+    사전 조회와 commit 후 refresh 없이 UPDATE ... RETURNING 한 번으로 처리
+
+    Returns:
+        수정된 가격 데이터, 해당 ID가 없으면 None
+    """
+    price_data_dict = price_data_in.model_dump(exclude_unset=True)
+    if not price_data_dict:
+        return get_price_data(session=session, price_data_id=price_data_id)
+    statement = (
+        update(PriceData)
+        .where(PriceData.id == price_data_id)
+        .values(**price_data_dict)
+        .returning(PriceData)
+    )
+    price_data = session.execute(
+        statement, execution_options={"populate_existing": True}
+    ).scalar_one_or_none()
+    if price_data is not None:
+        # RETURNING으로 모든 컬럼을 받았으므로 commit 시 만료 -> 재조회되지 않도록 분리
+        session.expunge(price_data)
+    if commit:
+        session.commit()
+    return price_data
+
+
+def touch_price_data(
+    *,
+    session: Session,
+    price_data_id: int,
+    price_data_in: PriceDataUpdate,
+    commit: bool = True,
+) -> int:
+    """
+    ID로 가격 데이터의 일부 컬럼만 수정
+
+    수정된 행을 돌려주지 않고 UPDATE 한 번만 실행 (RETURNING/재조회 없음)
+
+    Returns:
+        수정된 행 수 (1이면 성공, 0이면 해당 ID 없음)
+
+    Raises:
+        ValueError: price_data_in에 설정된 필드가 없는 경우
+    """
+    price_data_dict = price_data_in.model_dump(exclude_unset=True)
+    if not price_data_dict:
+        raise ValueError("No fields to update")
+    result = session.execute(
+        update(PriceData).where(PriceData.id == price_data_id).values(**price_data_dict)
+    )
+    # 라우트를 거치지 않는 호출도 있으므로 조회 캐시를 직접 비움
+    latest_price_data_cache.clear()
+    price_data_page_cache.clear()
+    if commit:
+        session.commit()
+    return result.rowcount
 
 
 def delete_price_data(*, session: Session, price_data_id: int) -> bool:
     """
     가격 데이터 삭제
     """
-    price_data = get_price_data(session=session, price_data_id=price_data_id)
-    if price_data:
-        session.delete(price_data)
-        session.commit()
-        return True
-    return False
+    # 행을 읽어오지 않고 단일 DELETE 문으로 삭제
+    result = session.execute(delete(PriceData).where(PriceData.id == price_data_id))
+    session.commit()
+    return result.rowcount > 0
 
 
 def delete_price_data_by_symbol(
@@ -146,15 +592,11 @@ def delete_price_data_by_symbol(
     Returns:
         삭제된 레코드 수
     """
-    statement = select(PriceData).where(PriceData.symbol_id == symbol_id)
+    # 행을 읽어오지 않고 단일 DELETE 문으로 삭제, 삭제 수는 rowcount로 확인
+    statement = delete(PriceData).where(PriceData.symbol_id == symbol_id)
     if timeframe:
         statement = statement.where(PriceData.timeframe == timeframe)
 
-    price_data_list = session.exec(statement).all()
-    count = len(price_data_list)
-
-    for price_data in price_data_list:
-        session.delete(price_data)
-
+    result = session.execute(statement)
     session.commit()
-    return count
+    return result.rowcount
@@ -1,62 +1,159 @@
+from collections.abc import Collection
+from datetime import datetime, timezone
 from typing import Any
 
+from sqlalchemy import (
+    bindparam,
+    column,
+    delete,
+    lambda_stmt,
+    table,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import Session, select
 
+from app.core.cache import realtime_price_cache
+from app.crud.pagination import get_page_with_count
+from app.crud.persist import persist
 from app.models.realtime_price import (
     RealtimePrice,
     RealtimePriceCreate,
     RealtimePriceUpdate,
 )
 
+# 업서트 시 사용할 컬럼 (id는 시퀀스로 채움, symbol_id 외에는 충돌 시 갱신)
+_COPY_COLUMNS = (
+    "symbol_id",
+    "current_price",
+    "bid_price",
+    "ask_price",
+    "volume_24h",
+    "change_rate",
+    "updated_at",
+)
+_COPY_TABLE = table("realtime_prices_copy", *(column(c) for c in _COPY_COLUMNS))
+
+# 이 행 수 이상의 배치는 VALUES 대신 COPY + INSERT ... SELECT로 업서트
+COPY_UPSERT_MIN_ROWS = 1000
+
+# 조회 빈도가 높은 구문은 모듈 로드 시 한 번만 구성하고 파라미터만 바꿔 실행
+_get_realtime_price_by_symbol_stmt = lambda_stmt(
+    lambda: select(RealtimePrice).where(
+        RealtimePrice.symbol_id == bindparam("symbol_id")
+    )
+)
+
 
 def create_realtime_price(
-    *, session: Session, realtime_price_create: RealtimePriceCreate
+    *,
+    session: Session,
+    realtime_price_create: RealtimePriceCreate,
+    commit: bool = True,
 ) -> RealtimePrice:
     """
     실시간 가격 데이터 생성
+
+    commit=False면 flush만 하고 커밋은 호출자에게 맡김 (persist 참고)
     """
     db_obj = RealtimePrice.model_validate(realtime_price_create)
-    session.add(db_obj)
-    session.commit()
-    session.refresh(db_obj)
-    return db_obj
+    return persist(session, db_obj, commit=commit)
 
 
 def upsert_realtime_price(
-    *, session: Session, realtime_price_create: RealtimePriceCreate
+    *,
+    session: Session,
+    realtime_price_create: RealtimePriceCreate,
+    commit: bool = True,
 ) -> RealtimePrice:
     """
     실시간 가격 데이터 생성 또는 업데이트 (UPSERT)
     동일한 symbol_id가 존재하면 업데이트, 없으면 생성
-    """
-    existing = get_realtime_price_by_symbol(
-        session=session, symbol_id=realtime_price_create.symbol_id
-    )
 
-    if existing:
-        # 기존 데이터 업데이트
-        update_data = RealtimePriceUpdate.model_validate(realtime_price_create)
-        return update_realtime_price(
-            session=session, db_realtime_price=existing, realtime_price_in=update_data
-        )
-    else:
-        # 새로운 데이터 생성
-        return create_realtime_price(
-            session=session, realtime_price_create=realtime_price_create
-        )
+    조회 후 INSERT/UPDATE 대신 bulk_upsert_realtime_prices의 단일 구문 사용
+    """
+    return bulk_upsert_realtime_prices(
+        session=session, realtime_price_list=[realtime_price_create], commit=commit
+    )[0]
 
 
 def bulk_upsert_realtime_prices(
-    *, session: Session, realtime_price_list: list[RealtimePriceCreate]
+    *,
+    session: Session,
+    realtime_price_list: list[RealtimePriceCreate],
+    commit: bool = True,
 ) -> list[RealtimePrice]:
     """
     실시간 가격 데이터 대량 생성/업데이트
+
+    INSERT ... ON CONFLICT (symbol_id) DO UPDATE 단일 구문으로 처리
+    동일 symbol_id가 여러 번 포함된 경우 마지막 항목만 반영
+
+    COPY_UPSERT_MIN_ROWS 이상인 배치(수천 종목 단위의 틱)는 VALUES 대신 연결별
+    임시 테이블에 COPY로 적재한 뒤 INSERT ... SELECT로 병합해 대량 VALUES
+    구문의 파싱/플래닝 비용을 없앰
     """
-    result = []
-    for item in realtime_price_list:
-        upserted = upsert_realtime_price(session=session, realtime_price_create=item)
-        result.append(upserted)
-    return result
+    # ON CONFLICT DO UPDATE는 한 구문에서 같은 행을 두 번 갱신할 수 없으므로 중복 제거
+    latest_by_symbol = {item.symbol_id: item for item in realtime_price_list}
+    rows = [
+        RealtimePrice.model_validate(item).model_dump(exclude={"id"})
+        for item in latest_by_symbol.values()
+    ]
+    if not rows:
+        return []
+
+    use_copy = len(rows) >= COPY_UPSERT_MIN_ROWS
+    if use_copy:
+        _copy_to_temp_table(session, rows)
+        statement = pg_insert(RealtimePrice).from_select(
+            _COPY_COLUMNS, select(*_COPY_TABLE.c)
+        )
+        params = None
+    else:
+        statement = pg_insert(RealtimePrice)
+        params = rows
+    statement = statement.on_conflict_do_update(
+        index_elements=["symbol_id"],
+        set_={name: statement.excluded[name] for name in _COPY_COLUMNS[1:]},
+    ).returning(RealtimePrice)
+    # 세션에 이미 로드된 행이 있어도 RETURNING 값으로 덮어씀
+    upserted = sorted(
+        session.scalars(
+            statement, params, execution_options={"populate_existing": True}
+        ).all(),
+        key=lambda obj: obj.symbol_id,
+    )
+    if use_copy:
+        # commit=False로 같은 트랜잭션에서 다시 호출될 수 있으므로 바로 비움
+        session.execute(text(f"TRUNCATE {_COPY_TABLE.name}"))
+
+    # RETURNING으로 모든 컬럼을 받았으므로 commit 전에 분리해 재조회를 막음
+    for obj in upserted:
+        session.expunge(obj)
+    if commit:
+        session.commit()
+    return upserted
+
+
+def _copy_to_temp_table(session: Session, rows: list[dict[str, Any]]) -> None:
+    """
+    업서트할 행을 세션 연결의 임시 테이블에 COPY로 적재
+    """
+    columns = ", ".join(_COPY_COLUMNS)
+    # 세션 트랜잭션에 묶인 psycopg 연결을 직접 사용
+    dbapi_connection = session.connection().connection.driver_connection
+    with dbapi_connection.cursor() as cursor:
+        # 임시 테이블은 연결이 살아있는 동안 재사용 (커밋 시 행만 비움)
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {_COPY_TABLE.name} "
+            f"ON COMMIT DELETE ROWS AS SELECT {columns} FROM realtime_prices "
+            "WITH NO DATA"
+        )
+        with cursor.copy(f"COPY {_COPY_TABLE.name} ({columns}) FROM STDIN") as copy:
+            for row in rows:
+                copy.write_row(tuple(row[name] for name in _COPY_COLUMNS))
 
 
 def get_realtime_price(
@@ -65,8 +162,8 @@ def get_realtime_price(
     """
     ID로 실시간 가격 데이터 조회
     """
-    statement = select(RealtimePrice).where(RealtimePrice.id == realtime_price_id)
-    return session.exec(statement).first()
+    # PK 조회는 identity map에 이미 로드된 경우 SQL 없이 반환
+    return session.get(RealtimePrice, realtime_price_id)
 
 
 def get_realtime_price_by_symbol(
@@ -75,32 +172,54 @@ def get_realtime_price_by_symbol(
     """
     특정 종목의 실시간 가격 데이터 조회
     """
-    statement = select(RealtimePrice).where(RealtimePrice.symbol_id == symbol_id)
-    return session.exec(statement).first()
+    return session.execute(
+        _get_realtime_price_by_symbol_stmt, {"symbol_id": symbol_id}
+    ).scalar_one_or_none()
 
 
 def get_realtime_prices(
-    *, session: Session, skip: int = 0, limit: int = 100
-) -> list[RealtimePrice]:
+    *,
+    session: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_updated_at: datetime | None = None,
+    after_id: int | None = None,
+) -> tuple[list[RealtimePrice], int]:
     """
     모든 실시간 가격 데이터 조회 (페이지네이션)
+
+    after_updated_at/after_id 커서가 주어지면 OFFSET 대신 keyset 페이지네이션 사용
+
+    Returns:
+        (페이지 데이터, 전체 개수) - 커서 사용 여부와 무관하게 전체 개수
     """
-    statement = (
-        select(RealtimePrice)
-        .order_by(RealtimePrice.updated_at.desc())
-        .offset(skip)
-        .limit(limit)
+    statement = select(RealtimePrice).order_by(
+        RealtimePrice.updated_at.desc(), RealtimePrice.id.desc()
+    )
+    keyset = None
+    if after_updated_at is not None and after_id is not None:
+        keyset = tuple_(RealtimePrice.updated_at, RealtimePrice.id) < (
+            after_updated_at,
+            after_id,
+        )
+    return get_page_with_count(
+        session=session, statement=statement, skip=skip, limit=limit, keyset=keyset
     )
-    return list(session.exec(statement).all())
 
 
 def get_realtime_prices_by_symbols(
-    *, session: Session, symbol_ids: list[int]
+    *, session: Session, symbol_ids: Collection[int]
 ) -> list[RealtimePrice]:
     """
     여러 종목의 실시간 가격 데이터 조회
+
+    uq_realtime_price_symbol 유니크 인덱스를 타는 단일 IN 쿼리로 조회
     """
-    statement = select(RealtimePrice).where(RealtimePrice.symbol_id.in_(symbol_ids))
+    statement = (
+        select(RealtimePrice)
+        .where(RealtimePrice.symbol_id.in_(set(symbol_ids)))
+        .order_by(RealtimePrice.symbol_id)
+    )
     return list(session.exec(statement).all())
 
 
@@ -109,39 +228,113 @@ def update_realtime_price(
     session: Session,
     db_realtime_price: RealtimePrice,
     realtime_price_in: RealtimePriceUpdate,
+    commit: bool = True,
 ) -> Any:
     """
     실시간 가격 데이터 업데이트
     """
     realtime_price_dict = realtime_price_in.model_dump(exclude_unset=True)
     db_realtime_price.sqlmodel_update(realtime_price_dict)
-    session.add(db_realtime_price)
-    session.commit()
-    session.refresh(db_realtime_price)
-    return db_realtime_price
+    return persist(session, db_realtime_price, commit=commit)
 
 
-def delete_realtime_price(*, session: Session, realtime_price_id: int) -> bool:
+def update_realtime_price_by_id(
+    *,
+    session: Session,
+    realtime_price_id: int,
+    realtime_price_in: RealtimePriceUpdate,
+    commit: bool = True,
+) -> RealtimePrice | None:
     """
-    실시간 가격 데이터 삭제
+    ID로 실시간 가격 데이터 업데이트
+
+    사전 조회와 commit 후 refresh 없이 UPDATE ... RETURNING 한 번으로 처리
+
+    Returns:
+        수정된 실시간 가격 데이터, 해당 ID가 없으면 None
+    """
+    realtime_price_dict = realtime_price_in.model_dump(exclude_unset=True)
+    if not realtime_price_dict:
+        return get_realtime_price(session=session, realtime_price_id=realtime_price_id)
+    statement = (
+        update(RealtimePrice)
+        .where(RealtimePrice.id == realtime_price_id)
+        .values(**realtime_price_dict)
+        .returning(RealtimePrice)
+    )
+    realtime_price = session.execute(
+        statement, execution_options={"populate_existing": True}
+    ).scalar_one_or_none()
+    if realtime_price is not None:
+        # RETURNING으로 모든 컬럼을 받았으므로 commit 시 만료 -> 재조회되지 않도록 분리
+        session.expunge(realtime_price)
+    if commit:
+        session.commit()
+    return realtime_price
+
+
+def touch_realtime_price(
+    *,
+    session: Session,
+    realtime_price_id: int,
+    realtime_price_in: RealtimePriceUpdate,
+    commit: bool = True,
+) -> int:
+    """
+    ID로 실시간 가격 데이터의 일부 컬럼만 수정
+
+    수정된 행을 돌려주지 않고 UPDATE 한 번만 실행 (RETURNING/재조회 없음)
+
+    Returns:
+        수정된 행 수 (1이면 성공, 0이면 해당 ID 없음)
+
+    Raises:
+        ValueError: realtime_price_in에 설정된 필드가 없는 경우
     """
-    realtime_price = get_realtime_price(
-        session=session, realtime_price_id=realtime_price_id
+    realtime_price_dict = realtime_price_in.model_dump(exclude_unset=True)
+    if not realtime_price_dict:
+        raise ValueError("No fields to update")
+    realtime_price_dict["updated_at"] = datetime.now(timezone.utc)
+    result = session.execute(
+        update(RealtimePrice)
+        .where(RealtimePrice.id == realtime_price_id)
+        .values(**realtime_price_dict)
     )
-    if realtime_price:
-        session.delete(realtime_price)
+    # 종목 ID를 모르므로 (symbol_id도 바뀔 수 있음) 종목별 캐시 전체를 비움
+    realtime_price_cache.clear()
+    if commit:
         session.commit()
-        return True
-    return False
+    return result.rowcount
+
+
+def delete_realtime_price(*, session: Session, realtime_price_id: int) -> int | None:
+    """
+    실시간 가격 데이터 삭제
+
+    DELETE ... RETURNING 단일 구문으로 존재 확인과 삭제를 함께 처리
+
+    Returns:
+        삭제된 행의 symbol_id (캐시 무효화용), 없으면 None
+    """
+    statement = (
+        delete(RealtimePrice)
+        .where(RealtimePrice.id == realtime_price_id)
+        .returning(RealtimePrice.symbol_id)
+    )
+    symbol_id = session.execute(statement).scalar_one_or_none()
+    session.commit()
+    return symbol_id
 
 
 def delete_realtime_price_by_symbol(*, session: Session, symbol_id: int) -> bool:
     """
     특정 종목의 실시간 가격 데이터 삭제
     """
-    realtime_price = get_realtime_price_by_symbol(session=session, symbol_id=symbol_id)
-    if realtime_price:
-        session.delete(realtime_price)
-        session.commit()
-        return True
-    return False
+    statement = (
+        delete(RealtimePrice)
+        .where(RealtimePrice.symbol_id == symbol_id)
+        .returning(RealtimePrice.id)
+    )
+    deleted_id = session.execute(statement).scalar_one_or_none()
+    session.commit()
+    return deleted_id is not None
@@ -1,64 +1,275 @@
+from collections.abc import Collection
+from datetime import datetime, timezone
 from typing import Any
 
+from sqlalchemy import (
+    bindparam,
+    delete,
+    func,
+    lambda_stmt,
+    literal,
+    literal_column,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlmodel import Session, select
 
+from app.core.cache import (
+    symbol_exists_cache,
+    symbol_id_by_code_cache,
+    symbols_cache,
+)
+from app.crud.pagination import get_page_with_count
+from app.crud.persist import persist
 from app.models.symbols import Symbol, SymbolCreate, SymbolUpdate
 
+# 조회 빈도가 높은 구문은 모듈 로드 시 한 번만 구성하고 파라미터만 바꿔 실행
+_get_symbol_by_exchange_and_code_stmt = lambda_stmt(
+    lambda: select(Symbol).where(
+        Symbol.exchange_id == bindparam("exchange_id"),
+        Symbol.symbol == bindparam("symbol"),
+    )
+)
+
 
-def create_symbol(*, session: Session, symbol_create: SymbolCreate) -> Symbol:
+def create_symbol(
+    *, session: Session, symbol_create: SymbolCreate, commit: bool = True
+) -> Symbol:
     db_obj = Symbol.model_validate(symbol_create)
-    session.add(db_obj)
-    session.commit()
-    session.refresh(db_obj)
-    return db_obj
+    return persist(session, db_obj, commit=commit)
+
+
+def bulk_upsert_symbols(
+    *,
+    session: Session,
+    symbols_data: list[dict[str, Any]],
+    batch_size: int = 1000,
+    commit: bool = True,
+) -> tuple[int, int]:
+    """
+    종목 대량 생성/업데이트
+
+    종목별 조회 없이 INSERT ... ON CONFLICT (exchange_id, symbol) DO UPDATE를
+    batch_size 단위로 실행하고 전체를 한 트랜잭션으로 처리
+    동일 (exchange_id, symbol)이 여러 번 포함된 경우 마지막 항목만 반영
+
+    Returns:
+        (생성된 종목 수, 업데이트된 종목 수)
+    """
+    # ON CONFLICT DO UPDATE는 한 구문에서 같은 행을 두 번 갱신할 수 없으므로 중복 제거
+    latest_by_code = {
+        (data["exchange_id"], data["symbol"]): data for data in symbols_data
+    }
+    if not latest_by_code:
+        return 0, 0
+
+    now = datetime.now(timezone.utc)
+    rows = [
+        {**data, "created_at": now, "updated_at": now}
+        for data in latest_by_code.values()
+    ]
+    update_columns = [
+        column
+        for column in rows[0]
+        if column not in ("id", "exchange_id", "symbol", "created_at")
+    ]
+
+    statement = pg_insert(Symbol)
+    statement = statement.on_conflict_do_update(
+        index_elements=["exchange_id", "symbol"],
+        set_={column: statement.excluded[column] for column in update_columns},
+    ).returning(
+        # 새로 삽입된 행은 xmax가 0 -> 생성/업데이트 구분
+        literal_column("xmax = 0")
+    )
+
+    created_count = 0
+    for start in range(0, len(rows), batch_size):
+        inserted = session.scalars(statement, rows[start : start + batch_size]).all()
+        created_count += sum(inserted)
+
+    if commit:
+        session.commit()
+    return created_count, len(rows) - created_count
 
 
 def get_symbol(*, session: Session, symbol_id: int) -> Symbol | None:
-    statement = select(Symbol).where(Symbol.id == symbol_id)
-    return session.exec(statement).first()
+    # 요청 중 이미 로드된 종목은 identity map에서 바로 반환
+    return session.get(Symbol, symbol_id)
+
+
+def get_symbols_by_ids(
+    *, session: Session, symbol_ids: Collection[int]
+) -> dict[int, Symbol]:
+    # ID마다 get_symbol을 반복하지 않고 단일 IN 쿼리로 조회 (id -> Symbol)
+    if not symbol_ids:
+        return {}
+    statement = select(Symbol).where(Symbol.id.in_(symbol_ids))
+    return {symbol.id: symbol for symbol in session.exec(statement).all()}
+
+
+def symbol_exists(*, session: Session, symbol_id: int) -> bool:
+    """
+    종목 존재 여부 확인 (존재 확인만 필요한 검증용)
+
+    존재하는 종목 ID는 프로세스 내 TTL 캐시에 저장하여 반복 조회 시 DB를 거치지 않음
+    캐시 미스 시에도 전체 행 대신 SELECT 1 ... LIMIT 1만 수행
+    """
+    if symbol_exists_cache.get(symbol_id):
+        return True
+    statement = (
+        select(literal(1)).select_from(Symbol).where(Symbol.id == symbol_id).limit(1)
+    )
+    if session.exec(statement).first() is None:
+        return False
+    symbol_exists_cache.set(symbol_id, True)
+    return True
 
 
 def get_symbol_by_exchange_and_code(
     *, session: Session, exchange_id: int, symbol: str
 ) -> Symbol | None:
-    statement = select(Symbol).where(
+    # uq_exchange_symbol로 최대 한 행
+    return session.execute(
+        _get_symbol_by_exchange_and_code_stmt,
+        {"exchange_id": exchange_id, "symbol": symbol},
+    ).scalar_one_or_none()
+
+
+def get_symbol_id_by_exchange_and_code(
+    *, session: Session, exchange_id: int, symbol: str
+) -> int | None:
+    # 코드 -> ID 변환은 수집/쓰기 때마다 반복되므로 존재하는 종목만 TTL 캐시에 저장
+    key = (exchange_id, symbol)
+    symbol_id = symbol_id_by_code_cache.get(key)
+    if symbol_id is not None:
+        return symbol_id
+    statement = select(Symbol.id).where(
         Symbol.exchange_id == exchange_id, Symbol.symbol == symbol
     )
-    return session.exec(statement).first()
+    symbol_id = session.exec(statement).one_or_none()
+    if symbol_id is not None:
+        symbol_id_by_code_cache.set(key, symbol_id)
+    return symbol_id
+
+
+def get_existing_symbol_ids(*, session: Session, symbol_ids: set[int]) -> set[int]:
+    statement = select(Symbol.id).where(Symbol.id.in_(symbol_ids))
+    return {symbol_id for symbol_id in session.exec(statement).all() if symbol_id}
 
 
-def get_symbols(*, session: Session, skip: int = 0, limit: int = 100) -> list[Symbol]:
-    statement = select(Symbol).offset(skip).limit(limit)
-    return list(session.exec(statement).all())
+def get_symbols(
+    *,
+    session: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: int | None = None,
+) -> tuple[list[Symbol], int]:
+    statement = select(Symbol).order_by(Symbol.id.asc())
+    # keyset 페이지네이션: OFFSET 스캔 없이 PK 인덱스로 바로 이동
+    keyset = Symbol.id > after_id if after_id is not None else None
+    return get_page_with_count(
+        session=session, statement=statement, skip=skip, limit=limit, keyset=keyset
+    )
 
 
 def get_symbols_by_exchange(
-    *, session: Session, exchange_id: int, skip: int = 0, limit: int = 100
-) -> list[Symbol]:
+    *,
+    session: Session,
+    exchange_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    after_id: int | None = None,
+) -> tuple[list[Symbol], int]:
     statement = (
         select(Symbol)
         .where(Symbol.exchange_id == exchange_id)
-        .offset(skip)
-        .limit(limit)
+        .order_by(Symbol.id.asc())
+    )
+    keyset = Symbol.id > after_id if after_id is not None else None
+    return get_page_with_count(
+        session=session, statement=statement, skip=skip, limit=limit, keyset=keyset
     )
-    return list(session.exec(statement).all())
+
+
+def count_symbols_by_exchange(*, session: Session, exchange_id: int) -> int:
+    """
+    거래소의 종목 수 조회 (ORM 객체를 로드하지 않고 COUNT만 실행)
+    """
+    statement = select(func.count()).where(Symbol.exchange_id == exchange_id)
+    return session.exec(statement).one()
 
 
 def update_symbol(
-    *, session: Session, db_symbol: Symbol, symbol_in: SymbolUpdate
+    *,
+    session: Session,
+    db_symbol: Symbol,
+    symbol_in: SymbolUpdate,
+    commit: bool = True,
 ) -> Any:
     symbol_data = symbol_in.model_dump(exclude_unset=True)
     db_symbol.sqlmodel_update(symbol_data)
-    session.add(db_symbol)
-    session.commit()
-    session.refresh(db_symbol)
-    return db_symbol
+    # 거래소/코드가 바뀔 수 있으므로 코드 -> ID 캐시 전체를 비움
+    symbol_id_by_code_cache.clear()
+    return persist(session, db_symbol, commit=commit)
 
 
-def delete_symbol(*, session: Session, symbol_id: int) -> bool:
-    symbol = get_symbol(session=session, symbol_id=symbol_id)
-    if symbol:
-        session.delete(symbol)
+def update_symbol_by_id(
+    *,
+    session: Session,
+    symbol_id: int,
+    symbol_in: SymbolUpdate,
+    commit: bool = True,
+) -> Symbol | None:
+    # 사전 SELECT/refresh 없이 UPDATE ... RETURNING 한 번으로 수정 후 행 반환
+    symbol_data = symbol_in.model_dump(exclude_unset=True)
+    if not symbol_data:
+        return get_symbol(session=session, symbol_id=symbol_id)
+    statement = (
+        update(Symbol)
+        .where(Symbol.id == symbol_id)
+        .values(**symbol_data)
+        .returning(Symbol)
+    )
+    symbol = session.execute(
+        statement, execution_options={"populate_existing": True}
+    ).scalar_one_or_none()
+    symbol_id_by_code_cache.clear()
+    if symbol is not None:
+        # RETURNING으로 모든 컬럼을 받았으므로 commit 시 만료 -> 재조회되지 않도록 분리
+        session.expunge(symbol)
+    if commit:
         session.commit()
-        return True
-    return False
+    return symbol
+
+
+def touch_symbol(
+    *,
+    session: Session,
+    symbol_id: int,
+    symbol_in: SymbolUpdate,
+    commit: bool = True,
+) -> int:
+    # 결과 행이 필요 없는 호출용: RETURNING/재조회 없이 UPDATE만 실행하고 영향 행 수 반환
+    symbol_data = symbol_in.model_dump(exclude_unset=True)
+    if not symbol_data:
+        raise ValueError("No fields to update")
+    symbol_data["updated_at"] = datetime.now(timezone.utc)
+    result = session.execute(
+        update(Symbol).where(Symbol.id == symbol_id).values(**symbol_data)
+    )
+    # 라우트를 거치지 않는 호출도 있으므로 목록 응답 캐시까지 비움
+    symbol_id_by_code_cache.clear()
+    symbols_cache.clear()
+    if commit:
+        session.commit()
+    return result.rowcount
+
+
+def delete_symbol(*, session: Session, symbol_id: int) -> bool:
+    # 행을 읽어오지 않고 단일 DELETE 문으로 삭제
+    result = session.execute(delete(Symbol).where(Symbol.id == symbol_id))
+    session.commit()
+    symbol_exists_cache.delete(symbol_id)
+    symbol_id_by_code_cache.clear()
+    return result.rowcount > 0
@@ -3,15 +3,22 @@ CRUD operations for Trading Strategies
 """
 
 import uuid
+from collections.abc import Collection
 from datetime import datetime, timezone
-from typing import Any
 
-from sqlmodel import Session, select
+from sqlalchemy import delete, exists, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
+from app.crud.pagination import get_page_with_count_async
+from app.crud.persist import persist_async
+from app.models.symbols import Symbol
 from app.models.trading_strategies import (
     StrategySymbol,
     StrategySymbolCreate,
     StrategySymbolUpdate,
+    StrategyType,
     TradingStrategy,
     TradingStrategyCreate,
     TradingStrategyUpdate,
@@ -19,8 +26,12 @@ from app.models.trading_strategies import (
 
 
 # TradingStrategy CRUD
-def create_trading_strategy(
-    *, session: Session, user_id: uuid.UUID, strategy_create: TradingStrategyCreate
+async def create_trading_strategy(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    strategy_create: TradingStrategyCreate,
+    commit: bool = True,
 ) -> TradingStrategy:
     """
     Create a new trading strategy for a user.
@@ -29,6 +40,7 @@ def create_trading_strategy(
         session: Database session
         user_id: User ID
         strategy_create: Trading strategy data
+        commit: If False, only flush and leave the commit to the caller
 
     Returns:
         Created TradingStrategy instance
@@ -41,15 +53,11 @@ def create_trading_strategy(
         config=strategy_create.config,
         is_active=strategy_create.is_active,
     )
-
-    session.add(db_obj)
-    session.commit()
-    session.refresh(db_obj)
-    return db_obj
+    return await persist_async(session, db_obj, commit=commit)
 
 
-def get_trading_strategy(
-    *, session: Session, strategy_id: int
+async def get_trading_strategy(
+    *, session: AsyncSession, strategy_id: int, user_id: uuid.UUID | None = None
 ) -> TradingStrategy | None:
     """
     Get a trading strategy by ID.
@@ -57,174 +65,237 @@ def get_trading_strategy(
     Args:
         session: Database session
         strategy_id: Trading strategy ID
+        user_id: If given, only return the strategy when this user owns it
 
     Returns:
         TradingStrategy instance or None if not found
     """
     statement = select(TradingStrategy).where(TradingStrategy.id == strategy_id)
-    return session.exec(statement).first()
+    if user_id is not None:
+        statement = statement.where(TradingStrategy.user_id == user_id)
+    return (await session.exec(statement)).one_or_none()
 
 
-def get_trading_strategies(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> list[TradingStrategy]:
+async def get_trading_strategies_by_ids(
+    *,
+    session: AsyncSession,
+    strategy_ids: Collection[int],
+    user_id: uuid.UUID | None = None,
+) -> dict[int, TradingStrategy]:
     """
-    Get all trading strategies for a user.
+    Get many trading strategies with a single IN query.
 
     Args:
         session: Database session
-        user_id: User ID
-        skip: Number of records to skip (pagination)
-        limit: Maximum number of records to return
+        strategy_ids: Trading strategy IDs
+        user_id: If given, only return strategies owned by this user
 
     Returns:
-        List of TradingStrategy instances
+        Mapping of strategy ID to TradingStrategy; missing IDs are absent
     """
-    statement = (
-        select(TradingStrategy)
-        .where(TradingStrategy.user_id == user_id)
-        .offset(skip)
-        .limit(limit)
-        .order_by(TradingStrategy.created_at.desc())
-    )
-    return list(session.exec(statement).all())
-
-
-def get_active_trading_strategies(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> list[TradingStrategy]:
+    if not strategy_ids:
+        return {}
+    statement = select(TradingStrategy).where(TradingStrategy.id.in_(strategy_ids))
+    if user_id is not None:
+        statement = statement.where(TradingStrategy.user_id == user_id)
+    strategies = (await session.exec(statement)).all()
+    return {strategy.id: strategy for strategy in strategies}
+
+
+async def trading_strategy_exists(
+    *, session: AsyncSession, strategy_id: int, user_id: uuid.UUID | None = None
+) -> bool:
     """
-    Get active trading strategies for a user.
+    Check whether a trading strategy exists without loading the row.
 
     Args:
         session: Database session
-        user_id: User ID
-        skip: Number of records to skip (pagination)
-        limit: Maximum number of records to return
+        strategy_id: Trading strategy ID
+        user_id: If given, also require that this user owns the strategy
 
     Returns:
-        List of active TradingStrategy instances
+        True if a matching strategy exists
     """
-    statement = (
-        select(TradingStrategy)
-        .where(TradingStrategy.user_id == user_id, TradingStrategy.is_active == True)
-        .offset(skip)
-        .limit(limit)
-        .order_by(TradingStrategy.created_at.desc())
-    )
-    return list(session.exec(statement).all())
+    condition = exists().where(TradingStrategy.id == strategy_id)
+    if user_id is not None:
+        condition = condition.where(TradingStrategy.user_id == user_id)
+    return bool((await session.exec(select(condition))).one())
 
 
-def get_trading_strategies_by_type(
+async def get_trading_strategies(
     *,
-    session: Session,
+    session: AsyncSession,
     user_id: uuid.UUID,
-    strategy_type: str,
     skip: int = 0,
     limit: int = 100,
-) -> list[TradingStrategy]:
+    is_active: bool | None = None,
+    strategy_type: StrategyType | None = None,
+    before_id: int | None = None,
+) -> tuple[list[TradingStrategy], int]:
     """
-    Get trading strategies by type for a user.
+    Get a page of trading strategies for a user with the total count.
+
+    The filters are combined in a single parameterized query and the total
+    is computed with a window function, so one round trip serves both.
 
     Args:
         session: Database session
         user_id: User ID
-        strategy_type: Strategy type (e.g., 'GRID', 'REBALANCING', 'DCA')
         skip: Number of records to skip (pagination)
         limit: Maximum number of records to return
+        is_active: Filter by active status (optional)
+        strategy_type: Filter by strategy type, e.g. 'GRID' (optional)
+        before_id: Keyset cursor; return strategies with id below it (skip ignored)
 
     Returns:
-        List of TradingStrategy instances
+        Tuple of (TradingStrategy instances, total matching count). The count
+        ignores the cursor.
     """
-    statement = (
-        select(TradingStrategy)
-        .where(
-            TradingStrategy.user_id == user_id,
-            TradingStrategy.strategy_type == strategy_type,
-        )
-        .offset(skip)
-        .limit(limit)
-        .order_by(TradingStrategy.created_at.desc())
+    statement = select(TradingStrategy).where(TradingStrategy.user_id == user_id)
+    if is_active is not None:
+        statement = statement.where(TradingStrategy.is_active == is_active)
+    if strategy_type:
+        statement = statement.where(TradingStrategy.strategy_type == strategy_type)
+    # Newest first; id follows insertion order so it doubles as the keyset
+    statement = statement.order_by(TradingStrategy.id.desc())
+    keyset = TradingStrategy.id < before_id if before_id is not None else None
+    return await get_page_with_count_async(
+        session=session, statement=statement, skip=skip, limit=limit, keyset=keyset
     )
-    return list(session.exec(statement).all())
 
 
-def update_trading_strategy(
+async def update_trading_strategy(
     *,
-    session: Session,
-    db_strategy: TradingStrategy,
+    session: AsyncSession,
+    strategy_id: int,
     strategy_in: TradingStrategyUpdate,
-) -> Any:
+    user_id: uuid.UUID | None = None,
+    commit: bool = True,
+) -> TradingStrategy | None:
     """
-    Update a trading strategy.
+    Update a trading strategy with a single UPDATE ... RETURNING statement.
 
     Args:
         session: Database session
-        db_strategy: Existing TradingStrategy instance
+        strategy_id: Trading strategy ID
         strategy_in: Update data
+        user_id: If given, only update the strategy when this user owns it
+        commit: If False, leave the commit to the caller
 
     Returns:
-        Updated TradingStrategy instance
+        Updated TradingStrategy instance or None if not found (or not owned by user_id)
     """
     strategy_data = strategy_in.model_dump(exclude_unset=True)
 
     # Update timestamp
     strategy_data["updated_at"] = datetime.now(timezone.utc)
 
-    db_strategy.sqlmodel_update(strategy_data)
-    session.add(db_strategy)
-    session.commit()
-    session.refresh(db_strategy)
-    return db_strategy
+    statement = update(TradingStrategy).where(TradingStrategy.id == strategy_id)
+    if user_id is not None:
+        statement = statement.where(TradingStrategy.user_id == user_id)
+    statement = statement.values(**strategy_data).returning(TradingStrategy)
+    strategy = (await session.exec(statement)).scalar_one_or_none()
+    if commit:
+        await session.commit()
+    return strategy
 
 
-def delete_trading_strategy(*, session: Session, strategy_id: int) -> bool:
+async def touch_trading_strategy(
+    *,
+    session: AsyncSession,
+    strategy_id: int,
+    strategy_in: TradingStrategyUpdate,
+    user_id: uuid.UUID | None = None,
+    commit: bool = True,
+) -> int:
     """
-    Delete a trading strategy.
+    Update trading strategy columns without reading the row back.
 
     Args:
         session: Database session
         strategy_id: Trading strategy ID
+        strategy_in: Update data (only the fields that were set are written)
+        user_id: If given, only update the strategy when this user owns it
+        commit: If False, leave the commit to the caller
 
     Returns:
-        True if deleted, False if not found
+        Number of updated rows (1 on success, 0 if not found or not owned)
+
+    Raises:
+        ValueError: If strategy_in has no fields set
+    """
+    strategy_data = strategy_in.model_dump(exclude_unset=True)
+    if not strategy_data:
+        raise ValueError("No fields to update")
+    strategy_data["updated_at"] = datetime.now(timezone.utc)
+    statement = update(TradingStrategy).where(TradingStrategy.id == strategy_id)
+    if user_id is not None:
+        statement = statement.where(TradingStrategy.user_id == user_id)
+    result = await session.exec(statement.values(**strategy_data))
+    if commit:
+        await session.commit()
+    return result.rowcount
+
+
+async def delete_trading_strategy(
+    *, session: AsyncSession, strategy_id: int, user_id: uuid.UUID | None = None
+) -> bool:
     """
-    strategy = get_trading_strategy(session=session, strategy_id=strategy_id)
-    if strategy:
-        session.delete(strategy)
-        session.commit()
-        return True
-    return False
+    Delete a trading strategy with a single DELETE statement.
 
+    Args:
+        session: Database session
+        strategy_id: Trading strategy ID
+        user_id: If given, only delete the strategy when this user owns it
+
+    Returns:
+        True if deleted, False if not found (or not owned by user_id)
+    """
+    statement = delete(TradingStrategy).where(TradingStrategy.id == strategy_id)
+    if user_id is not None:
+        statement = statement.where(TradingStrategy.user_id == user_id)
+    result = await session.exec(statement)
+    await session.commit()
+    return result.rowcount > 0
 
-def deactivate_trading_strategy(
-    *, session: Session, strategy_id: int
+
+async def deactivate_trading_strategy(
+    *, session: AsyncSession, strategy_id: int, user_id: uuid.UUID | None = None
 ) -> TradingStrategy | None:
     """
-    Deactivate a trading strategy (soft delete).
+    Deactivate a trading strategy (soft delete) with a single UPDATE ... RETURNING.
+
+    Only an active strategy is updated, so the statement also covers the
+    "already deactivated" check.
 
     Args:
         session: Database session
         strategy_id: Trading strategy ID
+        user_id: If given, only deactivate the strategy when this user owns it
 
     Returns:
-        Updated TradingStrategy instance or None if not found
+        Updated TradingStrategy instance, or None if not found, not owned by
+        user_id or already inactive
     """
-    strategy = get_trading_strategy(session=session, strategy_id=strategy_id)
-    if strategy:
-        strategy.is_active = False
-        strategy.updated_at = datetime.now(timezone.utc)
-
-        session.add(strategy)
-        session.commit()
-        session.refresh(strategy)
-        return strategy
-    return None
+    statement = update(TradingStrategy).where(
+        TradingStrategy.id == strategy_id, TradingStrategy.is_active == True
+    )
+    if user_id is not None:
+        statement = statement.where(TradingStrategy.user_id == user_id)
+    statement = statement.values(
+        is_active=False, updated_at=datetime.now(timezone.utc)
+    ).returning(TradingStrategy)
+    strategy = (await session.exec(statement)).scalar_one_or_none()
+    await session.commit()
+    return strategy
 
 
 # StrategySymbol CRUD
-def create_strategy_symbol(
-    *, session: Session, strategy_symbol_create: StrategySymbolCreate
+async def create_strategy_symbol(
+    *,
+    session: AsyncSession,
+    strategy_symbol_create: StrategySymbolCreate,
+    commit: bool = True,
 ) -> StrategySymbol:
     """
     Create a strategy-symbol mapping.
@@ -232,19 +303,52 @@ def create_strategy_symbol(
     Args:
         session: Database session
         strategy_symbol_create: Strategy symbol data
+        commit: If False, only flush and leave the commit to the caller
 
     Returns:
         Created StrategySymbol instance
     """
     db_obj = StrategySymbol.model_validate(strategy_symbol_create)
-    session.add(db_obj)
-    session.commit()
-    session.refresh(db_obj)
-    return db_obj
+    return await persist_async(session, db_obj, commit=commit)
 
 
-def get_strategy_symbol(
-    *, session: Session, strategy_symbol_id: int
+async def bulk_create_strategy_symbols(
+    *,
+    session: AsyncSession,
+    strategy_symbol_list: list[StrategySymbolCreate],
+    commit: bool = True,
+) -> list[StrategySymbol]:
+    """
+    Create many strategy-symbol mappings with a single INSERT.
+
+    Uses INSERT ... ON CONFLICT DO NOTHING on (strategy_id, symbol_id), so
+    symbols already in the strategy are skipped by the database.
+
+    Args:
+        session: Database session
+        strategy_symbol_list: Strategy symbol data
+        commit: If False, leave the commit to the caller
+
+    Returns:
+        List of StrategySymbol instances that were actually inserted
+    """
+    rows = [
+        StrategySymbol.model_validate(item).model_dump(exclude={"id"})
+        for item in strategy_symbol_list
+    ]
+    statement = (
+        pg_insert(StrategySymbol)
+        .on_conflict_do_nothing(index_elements=["strategy_id", "symbol_id"])
+        .returning(StrategySymbol)
+    )
+    created = list((await session.scalars(statement, rows)).all())
+    if commit:
+        await session.commit()
+    return created
+
+
+async def get_strategy_symbol(
+    *, session: AsyncSession, strategy_symbol_id: int
 ) -> StrategySymbol | None:
     """
     Get a strategy-symbol mapping by ID.
@@ -256,12 +360,12 @@ def get_strategy_symbol(
     Returns:
         StrategySymbol instance or None if not found
     """
-    statement = select(StrategySymbol).where(StrategySymbol.id == strategy_symbol_id)
-    return session.exec(statement).first()
+    # Primary-key lookup; served from the identity map when already loaded
+    return await session.get(StrategySymbol, strategy_symbol_id)
 
 
-def get_strategy_symbol_by_ids(
-    *, session: Session, strategy_id: int, symbol_id: int
+async def get_strategy_symbol_by_ids(
+    *, session: AsyncSession, strategy_id: int, symbol_id: int
 ) -> StrategySymbol | None:
     """
     Get a strategy-symbol mapping by strategy and symbol IDs.
@@ -277,102 +381,149 @@ def get_strategy_symbol_by_ids(
     statement = select(StrategySymbol).where(
         StrategySymbol.strategy_id == strategy_id, StrategySymbol.symbol_id == symbol_id
     )
-    return session.exec(statement).first()
+    # uq_strategy_symbol guarantees at most one row
+    return (await session.exec(statement)).one_or_none()
 
 
-def get_strategy_symbols(
-    *, session: Session, strategy_id: int, skip: int = 0, limit: int = 100
-) -> list[StrategySymbol]:
+async def strategy_symbol_exists(
+    *, session: AsyncSession, strategy_id: int, symbol_id: int
+) -> bool:
     """
-    Get all symbols for a strategy.
+    Check whether a symbol is already mapped to a strategy without loading the row.
 
     Args:
         session: Database session
         strategy_id: Strategy ID
-        skip: Number of records to skip (pagination)
-        limit: Maximum number of records to return
+        symbol_id: Symbol ID
 
     Returns:
-        List of StrategySymbol instances
+        True if the mapping exists
     """
-    statement = (
-        select(StrategySymbol)
-        .where(StrategySymbol.strategy_id == strategy_id)
-        .offset(skip)
-        .limit(limit)
-        .order_by(StrategySymbol.created_at.desc())
+    statement = select(
+        exists().where(
+            StrategySymbol.strategy_id == strategy_id,
+            StrategySymbol.symbol_id == symbol_id,
+        )
     )
-    return list(session.exec(statement).all())
+    return bool((await session.exec(statement)).one())
 
 
-def get_active_strategy_symbols(
-    *, session: Session, strategy_id: int, skip: int = 0, limit: int = 100
-) -> list[StrategySymbol]:
+async def get_missing_symbol_ids(
+    *, session: AsyncSession, symbol_ids: Collection[int]
+) -> set[int]:
     """
-    Get active symbols for a strategy.
+    Find which of the given symbol IDs do not exist, with one IN query.
+
+    Args:
+        session: Database session
+        symbol_ids: Symbol IDs to check
+
+    Returns:
+        Set of symbol IDs that have no matching symbol row
+    """
+    statement = select(Symbol.id).where(Symbol.id.in_(symbol_ids))
+    existing = set((await session.exec(statement)).all())
+    return set(symbol_ids) - existing
+
+
+async def get_strategy_symbols(
+    *,
+    session: AsyncSession,
+    strategy_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    is_active: bool | None = None,
+    before_id: int | None = None,
+) -> tuple[list[StrategySymbol], int]:
+    """
+    Get a page of symbols for a strategy with the total count.
 
     Args:
         session: Database session
         strategy_id: Strategy ID
         skip: Number of records to skip (pagination)
         limit: Maximum number of records to return
+        is_active: Filter by active status (optional)
+        before_id: Keyset cursor; return mappings with id below it (skip ignored)
 
     Returns:
-        List of active StrategySymbol instances
+        Tuple of (StrategySymbol instances, total matching count)
     """
-    statement = (
-        select(StrategySymbol)
-        .where(
-            StrategySymbol.strategy_id == strategy_id, StrategySymbol.is_active == True
-        )
-        .offset(skip)
-        .limit(limit)
-        .order_by(StrategySymbol.created_at.desc())
+    statement = select(StrategySymbol).where(StrategySymbol.strategy_id == strategy_id)
+    if is_active is not None:
+        statement = statement.where(StrategySymbol.is_active == is_active)
+    statement = statement.order_by(StrategySymbol.id.desc())
+    keyset = StrategySymbol.id < before_id if before_id is not None else None
+    return await get_page_with_count_async(
+        session=session, statement=statement, skip=skip, limit=limit, keyset=keyset
     )
-    return list(session.exec(statement).all())
 
 
-def update_strategy_symbol(
+async def update_strategy_symbol(
     *,
-    session: Session,
-    db_strategy_symbol: StrategySymbol,
+    session: AsyncSession,
+    strategy_id: int,
+    symbol_id: int,
     strategy_symbol_in: StrategySymbolUpdate,
-) -> Any:
+    commit: bool = True,
+) -> StrategySymbol | None:
     """
-    Update a strategy-symbol mapping.
+    Update a strategy-symbol mapping with a single UPDATE ... RETURNING statement.
 
     Args:
         session: Database session
-        db_strategy_symbol: Existing StrategySymbol instance
+        strategy_id: Strategy ID
+        symbol_id: Symbol ID
         strategy_symbol_in: Update data
+        commit: If False, leave the commit to the caller
 
     Returns:
-        Updated StrategySymbol instance
+        Updated StrategySymbol instance or None if the mapping does not exist
     """
     strategy_symbol_data = strategy_symbol_in.model_dump(exclude_unset=True)
-    db_strategy_symbol.sqlmodel_update(strategy_symbol_data)
-    session.add(db_strategy_symbol)
-    session.commit()
-    session.refresh(db_strategy_symbol)
-    return db_strategy_symbol
+    if not strategy_symbol_data:
+        # Nothing to SET; just return the current row
+        return await get_strategy_symbol_by_ids(
+            session=session, strategy_id=strategy_id, symbol_id=symbol_id
+        )
+
+    statement = (
+        update(StrategySymbol)
+        .where(
+            StrategySymbol.strategy_id == strategy_id,
+            StrategySymbol.symbol_id == symbol_id,
+        )
+        .values(**strategy_symbol_data)
+        .returning(StrategySymbol)
+    )
+    strategy_symbol = (await session.exec(statement)).scalar_one_or_none()
+    if commit:
+        await session.commit()
+    return strategy_symbol
 
 
-def delete_strategy_symbol(*, session: Session, strategy_symbol_id: int) -> bool:
+async def delete_strategy_symbol(
+    *, session: AsyncSession, strategy_id: int, symbol_id: int
+) -> bool:
     """
-    Delete a strategy-symbol mapping.
+    Remove a symbol from a strategy with a single DELETE ... RETURNING statement.
 
     Args:
         session: Database session
-        strategy_symbol_id: Strategy symbol ID
+        strategy_id: Strategy ID
+        symbol_id: Symbol ID
 
     Returns:
-        True if deleted, False if not found
+        True if deleted, False if the mapping does not exist
     """
-    strategy_symbol = get_strategy_symbol(
-        session=session, strategy_symbol_id=strategy_symbol_id
+    statement = (
+        delete(StrategySymbol)
+        .where(
+            StrategySymbol.strategy_id == strategy_id,
+            StrategySymbol.symbol_id == symbol_id,
+        )
+        .returning(StrategySymbol.id)
     )
-    if strategy_symbol:
-        session.delete(strategy_symbol)
-        session.commit()
-        return True
-    return False
+    deleted_id = (await session.exec(statement)).scalar_one_or_none()
+    await session.commit()
+    return deleted_id is not None
@@ -2,17 +2,33 @@
 CRUD operations for User API Keys
 """
 
+import logging
 import uuid
-from typing import Any
+from datetime import datetime, timezone
 
-from sqlmodel import Session, select
+from sqlalchemy import delete, exists, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.encryption import decrypt_api_credentials, encrypt_api_credentials
-from app.models.user_api_keys import UserApiKey, UserApiKeyCreate, UserApiKeyUpdate
+from app.crud.pagination import get_page_with_count_async
+from app.crud.persist import persist_async
+from app.models.user_api_keys import (
+    ExchangeType,
+    UserApiKey,
+    UserApiKeyCreate,
+    UserApiKeyUpdate,
+)
 
+logger = logging.getLogger(__name__)
 
-def create_user_api_key(
-    *, session: Session, user_id: uuid.UUID, api_key_create: UserApiKeyCreate
+
+async def create_user_api_key(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    api_key_create: UserApiKeyCreate,
+    commit: bool = True,
 ) -> UserApiKey:
     """
     Create a new API key for a user.
@@ -23,12 +39,13 @@ def create_user_api_key(
         session: Database session
         user_id: User ID
         api_key_create: API key data with plain text credentials
+        commit: If False, only flush and leave the commit to the caller
 
     Returns:
         Created UserApiKey instance
     """
-    # Encrypt API credentials
-    encrypted_key, encrypted_secret = encrypt_api_credentials(
+    # Encrypt API credentials (key and secret in one token)
+    encrypted_credentials = encrypt_api_credentials(
         api_key_create.encrypted_api_key,  # Plain text from input
         api_key_create.encrypted_api_secret,  # Plain text from input
     )
@@ -37,65 +54,92 @@ def create_user_api_key(
     db_obj = UserApiKey(
         user_id=user_id,
         exchange_type=api_key_create.exchange_type,
-        encrypted_api_key=encrypted_key,
-        encrypted_api_secret=encrypted_secret,
+        encrypted_credentials=encrypted_credentials,
         account_number=api_key_create.account_number,
         is_demo=api_key_create.is_demo,
         is_active=api_key_create.is_active,
         nickname=api_key_create.nickname,
     )
+    return await persist_async(session, db_obj, commit=commit)
 
-    session.add(db_obj)
-    session.commit()
-    session.refresh(db_obj)
-    return db_obj
 
-
-def get_user_api_key(*, session: Session, api_key_id: int) -> UserApiKey | None:
+async def get_user_api_key(
+    *, session: AsyncSession, api_key_id: int, user_id: uuid.UUID | None = None
+) -> UserApiKey | None:
     """
     Get an API key by ID.
 
     Args:
         session: Database session
         api_key_id: API key ID
+        user_id: If given, only return the key when this user owns it
 
     Returns:
         UserApiKey instance or None if not found
     """
     statement = select(UserApiKey).where(UserApiKey.id == api_key_id)
-    return session.exec(statement).first()
+    if user_id is not None:
+        statement = statement.where(UserApiKey.user_id == user_id)
+    return (await session.exec(statement)).one_or_none()
 
 
-def get_user_api_keys(
-    *, session: Session, user_id: uuid.UUID, skip: int = 0, limit: int = 100
-) -> list[UserApiKey]:
+async def user_api_key_exists(*, session: AsyncSession, api_key_id: int) -> bool:
     """
-    Get all API keys for a user.
+    Check whether an API key exists without loading the row.
+
+    Args:
+        session: Database session
+        api_key_id: API key ID
+
+    Returns:
+        True if the API key exists
+    """
+    statement = select(exists().where(UserApiKey.id == api_key_id))
+    return bool((await session.exec(statement)).one())
+
+
+async def get_user_api_keys(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    skip: int = 0,
+    limit: int = 100,
+    before_id: int | None = None,
+) -> tuple[list[UserApiKey], int]:
+    """
+    Get a page of API keys for a user with the total count.
+
+    The total is computed with a window function in the same query, so the
+    statement shape is fixed and served from SQLAlchemy's compiled cache.
 
     Args:
         session: Database session
         user_id: User ID
         skip: Number of records to skip (pagination)
         limit: Maximum number of records to return
+        before_id: Keyset cursor; return keys with id below it (skip ignored)
 
     Returns:
-        List of UserApiKey instances
+        Tuple of (UserApiKey instances, total count for the user). The count
+        ignores the cursor.
     """
+    # Newest first; id follows insertion order so it doubles as the keyset
     statement = (
         select(UserApiKey)
         .where(UserApiKey.user_id == user_id)
-        .offset(skip)
-        .limit(limit)
-        .order_by(UserApiKey.created_at.desc())
+        .order_by(UserApiKey.id.desc())
+    )
+    keyset = UserApiKey.id < before_id if before_id is not None else None
+    return await get_page_with_count_async(
+        session=session, statement=statement, skip=skip, limit=limit, keyset=keyset
     )
-    return list(session.exec(statement).all())
 
 
-def get_user_api_key_by_exchange(
+async def get_user_api_key_by_exchange(
     *,
-    session: Session,
+    session: AsyncSession,
     user_id: uuid.UUID,
-    exchange_type: str,
+    exchange_type: ExchangeType,
     is_demo: bool = False,
 ) -> UserApiKey | None:
     """
@@ -116,11 +160,43 @@ def get_user_api_key_by_exchange(
         UserApiKey.is_demo == is_demo,
         UserApiKey.is_active == True,
     )
-    return session.exec(statement).first()
+    # uq_user_exchange_demo_active allows only one active key per exchange/mode
+    return (await session.exec(statement)).one_or_none()
+
+
+async def active_user_api_key_exists(
+    *,
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    exchange_type: ExchangeType,
+    is_demo: bool = False,
+) -> bool:
+    """
+    Check whether the user has an active API key for an exchange without
+    loading the row (and its encrypted credentials).
+
+    Args:
+        session: Database session
+        user_id: User ID
+        exchange_type: Exchange type (e.g., 'KIS', 'UPBIT')
+        is_demo: Whether to check the demo or production key
+
+    Returns:
+        True if an active key exists
+    """
+    statement = select(
+        exists().where(
+            UserApiKey.user_id == user_id,
+            UserApiKey.exchange_type == exchange_type,
+            UserApiKey.is_demo == is_demo,
+            UserApiKey.is_active == True,
+        )
+    )
+    return bool((await session.exec(statement)).one())
 
 
-def get_decrypted_api_key(
-    *, session: Session, api_key_id: int
+async def get_decrypted_api_key(
+    *, session: AsyncSession, api_key_id: int
 ) -> tuple[str, str] | None:
     """
     Get decrypted API credentials.
@@ -135,26 +211,24 @@ def get_decrypted_api_key(
     Returns:
         Tuple of (api_key, api_secret) or None if not found
     """
-    api_key = get_user_api_key(session=session, api_key_id=api_key_id)
+    api_key = await get_user_api_key(session=session, api_key_id=api_key_id)
 
     if not api_key:
         return None
 
     try:
-        plain_key, plain_secret = decrypt_api_credentials(
-            api_key.encrypted_api_key, api_key.encrypted_api_secret
-        )
+        plain_key, plain_secret = decrypt_api_credentials(api_key.encrypted_credentials)
         return plain_key, plain_secret
-    except Exception as e:
-        print(f"Error decrypting API key {api_key_id}: {e}")
+    except Exception:
+        logger.exception("Error decrypting API key %s", api_key_id)
         return None
 
 
-def get_decrypted_api_key_by_exchange(
+async def get_decrypted_api_key_by_exchange(
     *,
-    session: Session,
+    session: AsyncSession,
     user_id: uuid.UUID,
-    exchange_type: str,
+    exchange_type: ExchangeType,
     is_demo: bool = False,
 ) -> tuple[str, str, str | None] | None:
     """
@@ -172,7 +246,7 @@ def get_decrypted_api_key_by_exchange(
     Returns:
         Tuple of (api_key, api_secret, account_number) or None if not found
     """
-    api_key = get_user_api_key_by_exchange(
+    api_key = await get_user_api_key_by_exchange(
         session=session, user_id=user_id, exchange_type=exchange_type, is_demo=is_demo
     )
 
@@ -180,106 +254,118 @@ def get_decrypted_api_key_by_exchange(
         return None
 
     try:
-        plain_key, plain_secret = decrypt_api_credentials(
-            api_key.encrypted_api_key, api_key.encrypted_api_secret
-        )
+        plain_key, plain_secret = decrypt_api_credentials(api_key.encrypted_credentials)
         return plain_key, plain_secret, api_key.account_number
-    except Exception as e:
-        print(f"Error decrypting API key for {exchange_type}: {e}")
+    except Exception:
+        logger.exception("Error decrypting API key for %s", exchange_type)
         return None
 
 
-def update_user_api_key(
-    *, session: Session, db_api_key: UserApiKey, api_key_in: UserApiKeyUpdate
-) -> Any:
+async def update_user_api_key(
+    *,
+    session: AsyncSession,
+    api_key_id: int,
+    api_key_in: UserApiKeyUpdate,
+    user_id: uuid.UUID | None = None,
+    commit: bool = True,
+) -> UserApiKey | None:
     """
-    Update an API key.
+    Update an API key with a single UPDATE ... RETURNING statement.
 
-    If encrypted fields are provided, they will be re-encrypted.
+    If either credential is provided, the key and secret are re-encrypted
+    together; when only one is given the other is read from the stored token.
 
     Args:
         session: Database session
-        db_api_key: Existing UserApiKey instance
+        api_key_id: API key ID
         api_key_in: Update data
+        user_id: If given, only update the key when this user owns it
+        commit: If False, leave the commit to the caller
 
     Returns:
-        Updated UserApiKey instance
+        Updated UserApiKey instance or None if not found (or not owned by user_id)
     """
     api_key_data = api_key_in.model_dump(exclude_unset=True)
 
-    # If API credentials are being updated, encrypt them
-    if "encrypted_api_key" in api_key_data and "encrypted_api_secret" in api_key_data:
-        encrypted_key, encrypted_secret = encrypt_api_credentials(
-            api_key_data["encrypted_api_key"],  # Plain text from input
-            api_key_data["encrypted_api_secret"],  # Plain text from input
+    # If API credentials are being updated, encrypt them into one token
+    plain_key = api_key_data.pop("encrypted_api_key", None)  # Plain text from input
+    plain_secret = api_key_data.pop("encrypted_api_secret", None)
+    if plain_key is not None or plain_secret is not None:
+        if plain_key is None or plain_secret is None:
+            # Only one of them is changing; keep the other from the stored token
+            stored_statement = select(UserApiKey.encrypted_credentials).where(
+                UserApiKey.id == api_key_id
+            )
+            if user_id is not None:
+                stored_statement = stored_statement.where(UserApiKey.user_id == user_id)
+            stored = (await session.exec(stored_statement)).one_or_none()
+            if stored is None:
+                return None
+            stored_key, stored_secret = decrypt_api_credentials(stored)
+            plain_key = stored_key if plain_key is None else plain_key
+            plain_secret = stored_secret if plain_secret is None else plain_secret
+        api_key_data["encrypted_credentials"] = encrypt_api_credentials(
+            plain_key, plain_secret
         )
-        api_key_data["encrypted_api_key"] = encrypted_key
-        api_key_data["encrypted_api_secret"] = encrypted_secret
-    elif "encrypted_api_key" in api_key_data:
-        # Only key is being updated
-        encrypted_key = encrypt_api_credentials(
-            api_key_data["encrypted_api_key"], ""
-        )[0]
-        api_key_data["encrypted_api_key"] = encrypted_key
-    elif "encrypted_api_secret" in api_key_data:
-        # Only secret is being updated
-        encrypted_secret = encrypt_api_credentials(
-            "", api_key_data["encrypted_api_secret"]
-        )[1]
-        api_key_data["encrypted_api_secret"] = encrypted_secret
 
     # Update timestamp
-    from datetime import datetime, timezone
-
     api_key_data["updated_at"] = datetime.now(timezone.utc)
 
-    db_api_key.sqlmodel_update(api_key_data)
-    session.add(db_api_key)
-    session.commit()
-    session.refresh(db_api_key)
-    return db_api_key
+    statement = update(UserApiKey).where(UserApiKey.id == api_key_id)
+    if user_id is not None:
+        statement = statement.where(UserApiKey.user_id == user_id)
+    statement = statement.values(**api_key_data).returning(UserApiKey)
+    api_key = (await session.exec(statement)).scalar_one_or_none()
+    if commit:
+        await session.commit()
+    return api_key
 
 
-def delete_user_api_key(*, session: Session, api_key_id: int) -> bool:
+async def delete_user_api_key(
+    *, session: AsyncSession, api_key_id: int, user_id: uuid.UUID | None = None
+) -> bool:
     """
-    Delete an API key.
+    Delete an API key with a single DELETE statement.
 
     Args:
         session: Database session
         api_key_id: API key ID
+        user_id: If given, only delete the key when this user owns it
 
     Returns:
-        True if deleted, False if not found
+        True if deleted, False if not found (or not owned by user_id)
     """
-    api_key = get_user_api_key(session=session, api_key_id=api_key_id)
-    if api_key:
-        session.delete(api_key)
-        session.commit()
-        return True
-    return False
+    statement = delete(UserApiKey).where(UserApiKey.id == api_key_id)
+    if user_id is not None:
+        statement = statement.where(UserApiKey.user_id == user_id)
+    result = await session.exec(statement)
+    await session.commit()
+    return result.rowcount > 0
 
 
-def deactivate_user_api_key(*, session: Session, api_key_id: int) -> UserApiKey | None:
+async def deactivate_user_api_key(
+    *, session: AsyncSession, api_key_id: int, user_id: uuid.UUID | None = None
+) -> UserApiKey | None:
     """
-    Deactivate an API key (soft delete).
+    Deactivate an API key (soft delete) with a single UPDATE ... RETURNING.
 
     Args:
         session: Database session
         api_key_id: API key ID
+        user_id: If given, only deactivate the key when this user owns it
 
     Returns:
-        Updated UserApiKey instance or None if not found
+        Updated UserApiKey instance, or None if not found, not owned by
+        user_id or already inactive
     """
-    api_key = get_user_api_key(session=session, api_key_id=api_key_id)
-    if api_key:
-        api_key.is_active = False
-
-        from datetime import datetime, timezone
-
-        api_key.updated_at = datetime.now(timezone.utc)
-
-        session.add(api_key)
-        session.commit()
-        session.refresh(api_key)
-        return api_key
-    return None
+    statement = update(UserApiKey).where(
+        UserApiKey.id == api_key_id, UserApiKey.is_active == True
+    )
+    if user_id is not None:
+        statement = statement.where(UserApiKey.user_id == user_id)
+    statement = statement.values(
+        is_active=False, updated_at=datetime.now(timezone.utc)
+    ).returning(UserApiKey)
+    api_key = (await session.exec(statement)).scalar_one_or_none()
+    await session.commit()
+    return api_key
@@ -5,509 +5,341 @@ Collects Korean stock symbol data from KRX master files.
 Uses the open-trading-api submodule's stock info code.
 """
 
+import asyncio
+import glob
+import hashlib
+import io
+import json
 import os
 import ssl
-import urllib.request
+import tempfile
 import zipfile
-from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
 
+import httpx
 import pandas as pd
-from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import Session
 
-from app.models.exchanges import Exchange
-from app.models.symbols import Symbol
+from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.crud import exchanges as crud_exchange
+from app.crud import symbols as crud_symbol
 
 from .base import BaseCollector
 
+logger = get_logger(__name__)
+
+MIN_ORDER_SIZE = Decimal("1")  # Minimum 1 share
+MAX_ORDER_SIZE = Decimal("1000000000")  # 1 billion shares (default)
+
+MASTER_URL = "https://new.real.download.dws.co.kr/common/master/{market}_code.mst.zip"
+# Passed per request instead of patching ssl's process-wide default context
+MASTER_SSL_CONTEXT = ssl.create_default_context()
+MARKETS = ("kospi", "kosdaq")
+# Width of the fixed-width field section at the end of each master file line
+MASTER_TAIL_WIDTHS = {"kospi": 228, "kosdaq": 222}
+# Korean name column of each market's master file
+MASTER_NAME_COLUMNS = {"kospi": "한글명", "kosdaq": "한글종목명"}
+# Parsed master files survive across runs; KRX republishes them once a day.
+# Kept in a private per-user directory, never the shared system temp dir
+MASTER_CACHE_DIR = settings.KIS_MASTER_CACHE_DIR or os.path.join(
+    os.path.expanduser("~"), ".cache", "wombat", "kis_master"
+)
+
 
 class KISCollector(BaseCollector):
     """Collector for KIS (Korea Investment & Securities) stock data."""
 
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, cache_dir: str = MASTER_CACHE_DIR):
         """
         Initialize KIS collector.
 
         Args:
             session: Database session for data persistence
+            cache_dir: Directory for parsed master file caches
         """
         super().__init__(session)
         self.exchange_code = "kis"
         self.exchange_id: int | None = None
+        self.cache_dir = cache_dir
+        # Markets whose master file failed in the last fetch_symbols call
+        self.failed_markets: list[str] = []
 
     def _init_exchange(self) -> None:
         """Get exchange_id from database."""
         if self.exchange_id is None:
-            # Get exchange from database
-            statement = select(Exchange).where(Exchange.code == self.exchange_code)
-            exchange = self.session.exec(statement).first()
+            # Resolve exchange_id (cached per process across collector runs)
+            exchange_id = crud_exchange.get_exchange_id_by_code(
+                session=self.session, code=self.exchange_code
+            )
 
-            if not exchange:
+            if exchange_id is None:
                 raise ValueError(
                     f"Exchange '{self.exchange_code}' not found in database. "
                     "Please create it first."
                 )
 
-            self.exchange_id = exchange.id
+            self.exchange_id = exchange_id
 
-    def _download_master_file(
-        self, market: str, base_dir: str, verbose: bool = False
+    async def _download_master_file(
+        self,
+        client: httpx.AsyncClient,
+        market: str,
+        base_dir: str,
+        verbose: bool = False,
     ) -> None:
         """
         Download master file for specified market.
 
         Args:
+            client: HTTP client shared by both markets
             market: Market type ("kospi" or "kosdaq")
             base_dir: Base directory to save files
             verbose: Print verbose output
         """
         if verbose:
-            print(f"Downloading {market.upper()} master file...")
-
-        ssl._create_default_https_context = ssl._create_unverified_context
+            logger.info("Downloading %s master file...", market.upper())
 
-        url = f"https://new.real.download.dws.co.kr/common/master/{market}_code.mst.zip"
-        zip_path = os.path.join(base_dir, f"{market}_code.zip")
+        response = await client.get(MASTER_URL.format(market=market))
+        response.raise_for_status()
 
-        urllib.request.urlretrieve(url, zip_path)
-
-        with zipfile.ZipFile(zip_path) as zip_file:
+        # Extract from memory; no temp zip on disk
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zip_file:
             zip_file.extractall(base_dir)
 
-        if os.path.exists(zip_path):
-            os.remove(zip_path)
-
-    def _parse_kospi_master(self, base_dir: str) -> pd.DataFrame:
+    async def _get_master_last_modified(
+        self, client: httpx.AsyncClient, market: str
+    ) -> str | None:
         """
-        Parse KOSPI master file.
+        Get the Last-Modified header of the master file without downloading it.
 
         Args:
-            base_dir: Base directory containing master files
+            client: HTTP client shared by both markets
+            market: Market type ("kospi" or "kosdaq")
 
         Returns:
-            DataFrame with KOSPI stock data
+            Last-Modified header value, or None if unavailable
         """
-        file_name = os.path.join(base_dir, "kospi_code.mst")
-        tmp_fil1 = os.path.join(base_dir, "kospi_code_part1.tmp")
-        tmp_fil2 = os.path.join(base_dir, "kospi_code_part2.tmp")
-
-        with open(tmp_fil1, mode="w", encoding="utf-8") as wf1, open(
-            tmp_fil2, mode="w", encoding="utf-8"
-        ) as wf2:
-            with open(file_name, mode="r", encoding="cp949", errors="ignore") as f:
-                for row in f:
-                    rf1 = row[0 : len(row) - 228]
-                    rf1_1 = rf1[0:9].rstrip()
-                    rf1_2 = rf1[9:21].rstrip()
-                    rf1_3 = rf1[21:].strip()
-                    wf1.write(rf1_1 + "," + rf1_2 + "," + rf1_3 + "\n")
-                    rf2 = row[-228:]
-                    wf2.write(rf2)
-
-        part1_columns = ["단축코드", "표준코드", "한글명"]
-        df1 = pd.read_csv(tmp_fil1, header=None, names=part1_columns, encoding="utf-8")
-
-        field_specs = [
-            2,
-            1,
-            4,
-            4,
-            4,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            9,
-            5,
-            5,
-            1,
-            1,
-            1,
-            2,
-            1,
-            1,
-            1,
-            2,
-            2,
-            2,
-            3,
-            1,
-            3,
-            12,
-            12,
-            8,
-            15,
-            21,
-            2,
-            7,
-            1,
-            1,
-            1,
-            1,
-            1,
-            9,
-            9,
-            9,
-            5,
-            9,
-            8,
-            9,
-            3,
-            1,
-            1,
-            1,
-        ]
+        try:
+            response = await client.head(MASTER_URL.format(market=market))
+        except httpx.HTTPError:
+            return None
+        if response.is_error:
+            return None
+        return response.headers.get("Last-Modified")
+
+    async def _load_master(
+        self,
+        client: httpx.AsyncClient,
+        market: str,
+        base_dir: str,
+        versions: dict[str, str | None] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Load the parsed master file, reusing the on-disk cache when unchanged.
 
-        part2_columns = [
-            "그룹코드",
-            "시가총액규모",
-            "지수업종대분류",
-            "지수업종중분류",
-            "지수업종소분류",
-            "제조업",
-            "저유동성",
-            "지배구조지수종목",
-            "KOSPI200섹터업종",
-            "KOSPI100",
-            "KOSPI50",
-            "KRX",
-            "ETP",
-            "ELW발행",
-            "KRX100",
-            "KRX자동차",
-            "KRX반도체",
-            "KRX바이오",
-            "KRX은행",
-            "SPAC",
-            "KRX에너지화학",
-            "KRX철강",
-            "단기과열",
-            "KRX미디어통신",
-            "KRX건설",
-            "Non1",
-            "KRX증권",
-            "KRX선박",
-            "KRX섹터_보험",
-            "KRX섹터_운송",
-            "SRI",
-            "기준가",
-            "매매수량단위",
-            "시간외수량단위",
-            "거래정지",
-            "정리매매",
-            "관리종목",
-            "시장경고",
-            "경고예고",
-            "불성실공시",
-            "우회상장",
-            "락구분",
-            "액면변경",
-            "증자구분",
-            "증거금비율",
-            "신용가능",
-            "신용기간",
-            "전일거래량",
-            "액면가",
-            "상장일자",
-            "상장주수",
-            "자본금",
-            "결산월",
-            "공모가",
-            "우선주",
-            "공매도과열",
-            "이상급등",
-            "KRX300",
-            "KOSPI",
-            "매출액",
-            "영업이익",
-            "경상이익",
-            "당기순이익",
-            "ROE",
-            "기준년월",
-            "시가총액",
-            "그룹사코드",
-            "회사신용한도초과",
-            "담보대출가능",
-            "대주가능",
-        ]
+        The cache is keyed by (market, upstream Last-Modified), so a new master
+        file published by KRX is downloaded and parsed again.
 
-        df2 = pd.read_fwf(tmp_fil2, widths=field_specs, names=part2_columns)
+        Args:
+            client: HTTP client shared by both markets
+            market: Market type ("kospi" or "kosdaq")
+            base_dir: Base directory to download master files into
+            versions: Last-Modified values already fetched per market
+                (None to send a HEAD request here)
 
-        df = pd.merge(df1, df2, how="outer", left_index=True, right_index=True)
+        Returns:
+            DataFrame with stock data for the market
+        """
+        if versions is None:
+            last_modified = await self._get_master_last_modified(client, market)
+        else:
+            last_modified = versions.get(market)
+        cache_path = None
+        if last_modified is not None and self._ensure_cache_dir():
+            cache_key = hashlib.sha256(f"{market}:{last_modified}".encode()).hexdigest()
+            cache_path = os.path.join(self.cache_dir, f"{market}_{cache_key[:16]}.csv")
+            if os.path.exists(cache_path):
+                # Plain CSV of the two string columns; never unpickle cache files
+                cached: pd.DataFrame = await asyncio.to_thread(
+                    pd.read_csv, cache_path, dtype=str
+                )
+                return cached
 
-        # Clean up temporary files
-        os.remove(tmp_fil1)
-        os.remove(tmp_fil2)
+        await self._download_master_file(client, market, base_dir)
+        # Parsing is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(self._parse_master, market, base_dir, cache_path)
 
-        return df
+    def _ensure_cache_dir(self) -> bool:
+        """
+        Create the cache directory as private (0700) and verify it is ours.
 
-    def _parse_kosdaq_master(self, base_dir: str) -> pd.DataFrame:
+        Returns:
+            True if the directory can be trusted, False to skip caching
         """
-        Parse KOSDAQ master file.
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            st = os.stat(self.cache_dir)
+        except OSError:
+            logger.warning("KIS master cache dir %s is unavailable", self.cache_dir)
+            return False
+        # Refuse a directory another user created or can write to
+        if st.st_uid != os.getuid() or st.st_mode & 0o077:
+            logger.warning(
+                "KIS master cache dir %s is not private to this user, not caching",
+                self.cache_dir,
+            )
+            return False
+        return True
+
+    def _parse_master(
+        self, market: str, base_dir: str, cache_path: str | None
+    ) -> pd.DataFrame:
+        """
+        Parse a downloaded master file and store the result in the cache.
 
         Args:
+            market: Market type ("kospi" or "kosdaq")
             base_dir: Base directory containing master files
+            cache_path: Cache file to write, or None to skip caching
 
         Returns:
-            DataFrame with KOSDAQ stock data
+            DataFrame with stock data for the market
         """
-        file_name = os.path.join(base_dir, "kosdaq_code.mst")
-        tmp_fil1 = os.path.join(base_dir, "kosdaq_code_part1.tmp")
-        tmp_fil2 = os.path.join(base_dir, "kosdaq_code_part2.tmp")
-
-        with open(tmp_fil1, mode="w", encoding="utf-8") as wf1, open(
-            tmp_fil2, mode="w", encoding="utf-8"
-        ) as wf2:
-            with open(file_name, mode="r", encoding="cp949", errors="ignore") as f:
-                for row in f:
-                    rf1 = row[0 : len(row) - 222]
-                    rf1_1 = rf1[0:9].rstrip()
-                    rf1_2 = rf1[9:21].rstrip()
-                    rf1_3 = rf1[21:].strip()
-                    wf1.write(rf1_1 + "," + rf1_2 + "," + rf1_3 + "\n")
-                    rf2 = row[-222:]
-                    wf2.write(rf2)
-
-        part1_columns = ["단축코드", "표준코드", "한글종목명"]
-        df1 = pd.read_csv(tmp_fil1, header=None, names=part1_columns, encoding="utf-8")
-
-        field_specs = [
-            2,
-            1,
-            4,
-            4,
-            4,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            1,
-            9,
-            5,
-            5,
-            1,
-            1,
-            1,
-            2,
-            1,
-            1,
-            1,
-            2,
-            2,
-            2,
-            3,
-            1,
-            3,
-            12,
-            12,
-            8,
-            15,
-            21,
-            2,
-            7,
-            1,
-            1,
-            1,
-            1,
-            9,
-            9,
-            9,
-            5,
-            9,
-            8,
-            9,
-            3,
-            1,
-            1,
-            1,
-        ]
+        df = self._parse_master_minimal(market, base_dir)
 
-        part2_columns = [
-            "증권그룹구분코드",
-            "시가총액 규모 구분 코드 유가",
-            "지수업종 대분류 코드",
-            "지수 업종 중분류 코드",
-            "지수업종 소분류 코드",
-            "벤처기업 여부 (Y/N)",
-            "저유동성종목 여부",
-            "KRX 종목 여부",
-            "ETP 상품구분코드",
-            "KRX100 종목 여부 (Y/N)",
-            "KRX 자동차 여부",
-            "KRX 반도체 여부",
-            "KRX 바이오 여부",
-            "KRX 은행 여부",
-            "기업인수목적회사여부",
-            "KRX 에너지 화학 여부",
-            "KRX 철강 여부",
-            "단기과열종목구분코드",
-            "KRX 미디어 통신 여부",
-            "KRX 건설 여부",
-            "(코스닥)투자주의환기종목여부",
-            "KRX 증권 구분",
-            "KRX 선박 구분",
-            "KRX섹터지수 보험여부",
-            "KRX섹터지수 운송여부",
-            "KOSDAQ150지수여부 (Y,N)",
-            "주식 기준가",
-            "정규 시장 매매 수량 단위",
-            "시간외 시장 매매 수량 단위",
-            "거래정지 여부",
-            "정리매매 여부",
-            "관리 종목 여부",
-            "시장 경고 구분 코드",
-            "시장 경고위험 예고 여부",
-            "불성실 공시 여부",
-            "우회 상장 여부",
-            "락구분 코드",
-            "액면가 변경 구분 코드",
-            "증자 구분 코드",
-            "증거금 비율",
-            "신용주문 가능 여부",
-            "신용기간",
-            "전일 거래량",
-            "주식 액면가",
-            "주식 상장 일자",
-            "상장 주수(천)",
-            "자본금",
-            "결산 월",
-            "공모 가격",
-            "우선주 구분 코드",
-            "공매도과열종목여부",
-            "이상급등종목여부",
-            "KRX300 종목 여부 (Y/N)",
-            "매출액",
-            "영업이익",
-            "경상이익",
-            "단기순이익",
-            "ROE(자기자본이익률)",
-            "기준년월",
-            "전일기준 시가총액 (억)",
-            "그룹사 코드",
-            "회사신용한도초과여부",
-            "담보대출가능여부",
-            "대주가능여부",
-        ]
+        if cache_path is not None:
+            # Evict caches of older master files for this market
+            for old_path in glob.glob(os.path.join(self.cache_dir, f"{market}_*.csv")):
+                os.remove(old_path)
+            # Write then rename so a concurrent run never reads a partial file
+            tmp_path = f"{cache_path}.tmp"
+            df.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, cache_path)
 
-        df2 = pd.read_fwf(tmp_fil2, widths=field_specs, names=part2_columns)
+        return df
 
-        df = pd.merge(df1, df2, how="outer", left_index=True, right_index=True)
+    def _parse_master_minimal(self, market: str, base_dir: str) -> pd.DataFrame:
+        """
+        Parse only the short code and Korean name from a master file.
 
-        # Clean up temporary files
-        os.remove(tmp_fil1)
-        os.remove(tmp_fil2)
+        The collector uses no other field, so the ~70 fixed-width columns at
+        the end of each line are skipped. The Korean name has a variable
+        character width, so each line is split from the end: the last
+        MASTER_TAIL_WIDTHS[market] characters are the fixed-width section.
 
-        return df
+        Args:
+            market: Market type ("kospi" or "kosdaq")
+            base_dir: Base directory containing master files
 
-    async def fetch_symbols(self) -> list[dict[str, Any]]:
+        Returns:
+            DataFrame with the short code and name columns for the market
+        """
+        file_name = os.path.join(base_dir, f"{market}_code.mst")
+        tail_width = MASTER_TAIL_WIDTHS[market]
+
+        rows = []
+        with open(file_name, encoding="cp949", errors="ignore") as f:
+            for row in f:
+                rf1 = row[0 : len(row) - tail_width]
+                # Empty fields become None so dropna() skips them
+                rows.append((rf1[0:9].rstrip() or None, rf1[21:].strip() or None))
+        return pd.DataFrame(rows, columns=["단축코드", MASTER_NAME_COLUMNS[market]])
+
+    async def _process_market(
+        self,
+        client: httpx.AsyncClient,
+        market: str,
+        base_dir: str,
+        versions: dict[str, str | None] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Download, parse and convert one market's master file to symbol data.
+
+        Args:
+            client: HTTP client shared by both markets
+            market: Market type ("kospi" or "kosdaq")
+            base_dir: Base directory to download master files into
+            versions: Last-Modified values already fetched per market
+
+        Returns:
+            List of symbol data dictionaries for the market
+        """
+        # Download and parse master file (or load the cached parse)
+        df = await self._load_master(client, market, base_dir, versions)
+        market_name = market.upper()  # "KOSPI" or "KOSDAQ"
+
+        # Convert DataFrame to symbol data without per-row iterrows();
+        # rows missing a ticker or stock name are dropped up front
+        name_column = MASTER_NAME_COLUMNS[market]
+        df = df[["단축코드", name_column]].dropna()
+        tickers = df["단축코드"].astype(str).str.strip().to_numpy()
+        names = df[name_column].astype(str).str.strip().to_numpy()
+
+        # Korean stock market specifications:
+        # - Price precision: 0 (integer prices in KRW)
+        # - Quantity precision: 0 (whole numbers)
+        # - Minimum order: 1 share
+        # - Maximum order: no strict limit (using large default)
+        return [
+            {
+                "exchange_id": self.exchange_id,
+                "symbol": ticker,  # e.g., "005930" for Samsung Electronics
+                "base_asset": name,  # e.g., "삼성전자"
+                "quote_asset": "KRW",
+                "symbol_type": "STOCK",
+                "market": market_name,  # "KOSPI" or "KOSDAQ"
+                "is_active": True,
+                "min_order_size": MIN_ORDER_SIZE,
+                "max_order_size": MAX_ORDER_SIZE,
+                "price_precision": 0,  # KRW markets use integer prices
+                "quantity_precision": 0,  # Stocks are traded in whole numbers
+            }
+            for ticker, name in zip(tickers, names, strict=True)
+        ]
+
+    async def fetch_symbols(
+        self, versions: dict[str, str | None] | None = None
+    ) -> list[dict[str, Any]]:
         """
         Fetch stock symbols from KRX master files.
 
+        Args:
+            versions: Last-Modified values already fetched per market
+                (None to look them up per market)
+
         Returns:
             List of symbol data dictionaries
         """
         self._init_exchange()
 
-        symbols_data = []
+        symbols_data: list[dict[str, Any]] = []
+        self.failed_markets = []
 
         # Create temporary directory for master files
-        import tempfile
-
         with tempfile.TemporaryDirectory() as temp_dir:
-            # Fetch KOSPI and KOSDAQ symbols
-            for market in ["kospi", "kosdaq"]:
-                try:
-                    # Download master file
-                    self._download_master_file(market, temp_dir)
-
-                    # Parse master file
-                    if market == "kospi":
-                        df = self._parse_kospi_master(temp_dir)
-                        market_name = "KOSPI"
-                    else:
-                        df = self._parse_kosdaq_master(temp_dir)
-                        market_name = "KOSDAQ"
-
-                    # Convert DataFrame to symbol data
-                    for _, row in df.iterrows():
-                        ticker = row["단축코드"]
-                        stock_name = (
-                            row["한글명"] if market == "kospi" else row["한글종목명"]
-                        )
-
-                        # Skip if ticker or stock name is invalid
-                        if pd.isna(ticker) or pd.isna(stock_name):
-                            continue
-
-                        # Korean stock market specifications:
-                        # - Price precision: 0 (integer prices in KRW)
-                        # - Quantity precision: 0 (whole numbers)
-                        # - Minimum order: 1 share
-                        # - Maximum order: no strict limit (using large default)
-
-                        symbol_data = {
-                            "exchange_id": self.exchange_id,
-                            "symbol": str(
-                                ticker
-                            ).strip(),  # e.g., "005930" for Samsung Electronics
-                            "base_asset": str(stock_name).strip(),  # e.g., "삼성전자"
-                            "quote_asset": "KRW",
-                            "symbol_type": "STOCK",
-                            "market": market_name,  # "KOSPI" or "KOSDAQ"
-                            "is_active": True,
-                            "min_order_size": Decimal("1"),  # Minimum 1 share
-                            "max_order_size": Decimal(
-                                "1000000000"
-                            ),  # 1 billion shares (default)
-                            "price_precision": 0,  # KRW markets use integer prices
-                            "quantity_precision": 0,  # Stocks are traded in whole numbers
-                        }
-
-                        symbols_data.append(symbol_data)
-
-                except Exception as e:
-                    print(f"Error fetching {market.upper()} symbols: {e}")
-                    continue
+            # Download KOSPI and KOSDAQ concurrently over one connection pool;
+            # the event loop is never blocked on network I/O
+            async with httpx.AsyncClient(
+                verify=MASTER_SSL_CONTEXT, timeout=30
+            ) as client:
+                results = await asyncio.gather(
+                    *(
+                        self._process_market(client, market, temp_dir, versions)
+                        for market in MARKETS
+                    ),
+                    return_exceptions=True,
+                )
+
+        for market, result in zip(MARKETS, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "Error fetching %s symbols", market.upper(), exc_info=result
+                )
+                self.failed_markets.append(market)
+                continue
+            symbols_data.extend(result)
 
         return symbols_data
 
@@ -521,41 +353,92 @@ class KISCollector(BaseCollector):
         Returns:
             Number of symbols saved (created or updated)
         """
-        saved_count = 0
-        updated_count = 0
-
-        for symbol_data in symbols_data:
-            try:
-                # Check if symbol already exists
-                statement = select(Symbol).where(
-                    Symbol.exchange_id == symbol_data["exchange_id"],
-                    Symbol.symbol == symbol_data["symbol"],
-                )
-                existing_symbol = self.session.exec(statement).first()
-
-                if existing_symbol:
-                    # Update existing symbol
-                    for key, value in symbol_data.items():
-                        setattr(existing_symbol, key, value)
-                    existing_symbol.updated_at = datetime.now(timezone.utc)
-                    updated_count += 1
-                else:
-                    # Create new symbol
-                    symbol = Symbol(**symbol_data)
-                    self.session.add(symbol)
-                    saved_count += 1
-
-                self.session.commit()
-
-            except IntegrityError as e:
-                self.session.rollback()
-                print(f"Error saving symbol {symbol_data.get('symbol')}: {e}")
-                continue
+        # Single INSERT ... ON CONFLICT DO UPDATE per 1000-row batch instead of
+        # a SELECT per symbol; the unique (exchange_id, symbol) constraint
+        # decides between create and update
+        saved_count, updated_count = crud_symbol.bulk_upsert_symbols(
+            session=self.session, symbols_data=symbols_data
+        )
 
         total_count = saved_count + updated_count
-        print(
-            f"KIS: {saved_count} symbols created, {updated_count} symbols updated. "
-            f"Total: {total_count}"
+        logger.info(
+            "KIS: %d symbols created, %d symbols updated. Total: %d",
+            saved_count,
+            updated_count,
+            total_count,
         )
 
         return total_count
+
+    @property
+    def _state_path(self) -> str:
+        return os.path.join(self.cache_dir, "state.json")
+
+    def _read_state(self) -> dict[str, Any]:
+        """Read the master versions and symbol count of the last full save."""
+        try:
+            with open(self._state_path, encoding="utf-8") as f:
+                state: dict[str, Any] = json.load(f)
+                return state
+        except (OSError, ValueError):
+            return {}
+
+    def _write_state(self, versions: dict[str, str | None], row_count: int) -> None:
+        """Record the master versions a full save was made from."""
+        if not self._ensure_cache_dir():
+            return
+        tmp_path = f"{self._state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"versions": versions, "row_count": row_count}, f)
+        os.replace(tmp_path, self._state_path)
+
+    async def collect_and_save(self) -> int:
+        """
+        Fetch and save symbols, skipping everything if the masters are unchanged.
+
+        One HEAD request per market is compared against the Last-Modified
+        values of the last complete save; when they all match and the database
+        still holds at least that many KIS symbols, the download, parse and
+        upsert are skipped and the previous symbol count returned.
+
+        Returns:
+            Number of symbols saved
+        """
+        self._init_exchange()
+        assert self.exchange_id is not None
+
+        async with httpx.AsyncClient(verify=MASTER_SSL_CONTEXT, timeout=30) as client:
+            last_modified = await asyncio.gather(
+                *(self._get_master_last_modified(client, market) for market in MARKETS)
+            )
+        versions = dict(zip(MARKETS, last_modified, strict=True))
+        known_versions = None not in last_modified
+
+        state = self._read_state()
+        row_count: int = state.get("row_count", 0)
+        if known_versions and state.get("versions") == versions and row_count > 0:
+            # The state file lives outside the database; a recreated or
+            # restored database must not be left without the symbols
+            db_count = crud_symbol.count_symbols_by_exchange(
+                session=self.session, exchange_id=self.exchange_id
+            )
+            if db_count >= row_count:
+                logger.info(
+                    "KIS: master files unchanged since last run, skipping (%d symbols)",
+                    row_count,
+                )
+                return row_count
+            logger.info(
+                "KIS: master files unchanged but database has %d of %d symbols, "
+                "saving again",
+                db_count,
+                row_count,
+            )
+
+        # Reuse the versions fetched above instead of a second HEAD per market
+        symbols_data = await self.fetch_symbols(versions=versions)
+        total_count = await self.save_symbols(symbols_data)
+        # Only a run that saved every market may be skipped next time
+        if known_versions and not self.failed_markets and total_count > 0:
+            self._write_state(versions, total_count)
+        return total_count
@@ -6,19 +6,31 @@ for Korean stocks using pykrx (Korea Exchange data crawler).
 """
 
 import uuid
-from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Any
 
 import pandas as pd
 from pykrx import stock
-from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
-from app.models.exchanges import Exchange
-from app.models.price_data import PriceData
+from app.crud import exchanges as crud_exchange
+from app.crud import price_data as crud_price_data
 from app.models.symbols import Symbol
 
+# Concurrent pykrx fetches in collect_all_stock_prices
+FETCH_MAX_WORKERS = 16
+
+# Symbols whose rows are buffered into one INSERT + commit
+WRITE_BATCH_SYMBOLS = 100
+
+# pykrx doesn't provide quote_volume; Decimal is immutable so one instance is shared
+ZERO = Decimal("0")
+
+# pykrx OHLCV column names (시가, 고가, 저가, 종가, 거래량)
+PYKRX_OHLCV_COLUMNS = ["시가", "고가", "저가", "종가", "거래량"]
+
 
 class KISPriceCollector:
     """Collector for KIS (Korea Investment & Securities) stock price data."""
@@ -38,16 +50,18 @@ class KISPriceCollector:
     def _init_exchange(self) -> None:
         """Get exchange_id from database."""
         if self.exchange_id is None:
-            statement = select(Exchange).where(Exchange.code == self.exchange_code)
-            exchange = self.session.exec(statement).first()
+            # Resolve exchange_id (cached per process across collector runs)
+            exchange_id = crud_exchange.get_exchange_id_by_code(
+                session=self.session, code=self.exchange_code
+            )
 
-            if not exchange:
+            if exchange_id is None:
                 raise ValueError(
                     f"Exchange '{self.exchange_code}' not found in database. "
                     "Please create it first."
                 )
 
-            self.exchange_id = exchange.id
+            self.exchange_id = exchange_id
 
     def _get_stock_symbols(
         self, market: str | None = None, limit: int | None = None
@@ -134,66 +148,48 @@ class KISPriceCollector:
         Returns:
             List of price data dictionaries
         """
-        price_data_list = []
-
-        for _, row in df.iterrows():
-            try:
-                # pykrx returns date as '날짜' column after reset_index()
-                if "날짜" not in row.index:
-                    print(f"  Warning: '날짜' column not found. Available columns: {list(row.index)}")
-                    continue
-
-                date_value = row["날짜"]
-
-                # Convert date to timestamp
-                if isinstance(date_value, str):
-                    timestamp = datetime.strptime(date_value, "%Y%m%d").replace(
-                        tzinfo=timezone.utc
-                    )
-                else:
-                    # Already a datetime object (pandas Timestamp)
-                    timestamp = pd.to_datetime(date_value).replace(tzinfo=timezone.utc)
-
-                # pykrx column names: 시가, 고가, 저가, 종가, 거래량
-                open_price = row["시가"]
-                high_price = row["고가"]
-                low_price = row["저가"]
-                close_price = row["종가"]
-                volume = row["거래량"]
-
-                # Validate data
-                if pd.isna(open_price) or pd.isna(high_price) or pd.isna(low_price) or pd.isna(close_price):
-                    print(f"  Skipping row with NaN values: {date_value}")
-                    continue
-
-                if not all([open_price > 0, high_price > 0, low_price > 0, close_price > 0]):
-                    print(f"  Skipping row with zero/negative values: {date_value}")
-                    continue
-
-                price_data = {
-                    "symbol_id": symbol_id,
-                    "timestamp": timestamp,
-                    "open_price": Decimal(str(int(open_price))),
-                    "high_price": Decimal(str(int(high_price))),
-                    "low_price": Decimal(str(int(low_price))),
-                    "close_price": Decimal(str(int(close_price))),
-                    "volume": Decimal(str(int(volume))),
-                    "quote_volume": Decimal("0"),  # pykrx doesn't provide quote_volume
-                    "timeframe": "1d",
-                }
-
-                price_data_list.append(price_data)
-
-            except (ValueError, KeyError) as e:
-                print(f"  Error converting row: {e}")
-                print(f"  Row data: {row.to_dict()}")
-                continue
-            except Exception as e:
-                print(f"  Unexpected error converting row: {e}")
-                print(f"  Row data: {row.to_dict()}")
-                continue
+        if "날짜" not in df.columns:
+            # pykrx returns date as '날짜' column after reset_index()
+            print(
+                f"  Warning: '날짜' column not found. Available columns: {list(df.columns)}"
+            )
+            return []
+
+        # Work on whole columns instead of iterrows(), which builds a Series per row
+        timestamps = pd.to_datetime(
+            df["날짜"], format="%Y%m%d", utc=True, errors="coerce"
+        )
+        values = df[PYKRX_OHLCV_COLUMNS]
+        prices = values[PYKRX_OHLCV_COLUMNS[:4]]
 
-        return price_data_list
+        # Validate data: dates must parse, OHLCV must be present and prices positive
+        valid = (
+            timestamps.notna() & values.notna().all(axis=1) & (prices > 0).all(axis=1)
+        )
+        invalid_count = int((~valid).sum())
+        if invalid_count:
+            print(
+                f"  Skipping {invalid_count} rows with missing or zero/negative values"
+            )
+
+        # KRW prices and share volumes are whole numbers: cast the block to
+        # int64 once so each cell reaches Decimal as a plain Python int
+        ohlcv = values[valid].to_numpy(dtype="int64")
+        rows = zip(timestamps[valid].tolist(), *ohlcv.T.tolist(), strict=True)
+        return [
+            {
+                "symbol_id": symbol_id,
+                "timestamp": timestamp,
+                "open_price": Decimal(open_price),
+                "high_price": Decimal(high_price),
+                "low_price": Decimal(low_price),
+                "close_price": Decimal(close_price),
+                "volume": Decimal(volume),
+                "quote_volume": ZERO,  # pykrx doesn't provide quote_volume
+                "timeframe": "1d",
+            }
+            for timestamp, open_price, high_price, low_price, close_price, volume in rows
+        ]
 
     def save_price_data(
         self, symbol_id: int, price_data_list: list[dict[str, Any]]
@@ -208,40 +204,18 @@ class KISPriceCollector:
         Returns:
             Tuple of (created_count, skipped_count)
         """
-        created_count = 0
-        skipped_count = 0
-
-        for price_data in price_data_list:
-            try:
-                statement = select(PriceData).where(
-                    PriceData.symbol_id == price_data["symbol_id"],
-                    PriceData.timestamp == price_data["timestamp"],
-                    PriceData.timeframe == price_data["timeframe"],
-                )
-                existing = self.session.exec(statement).first()
-
-                if existing:
-                    skipped_count += 1
-                    continue
-
-                price_data_obj = PriceData(**price_data)
-                self.session.add(price_data_obj)
-                created_count += 1
-
-            except IntegrityError as e:
-                self.session.rollback()
-                print(f"  Error saving price data for symbol_id {symbol_id}: {e}")
-                skipped_count += 1
-                continue
-
         try:
-            self.session.commit()
+            # INSERT ... ON CONFLICT DO NOTHING lets the uq_symbol_time_frame
+            # constraint skip stored rows, so no existence check is needed
+            created_count = crud_price_data.insert_price_data_rows(
+                session=self.session, rows=price_data_list
+            )
         except Exception as e:
             self.session.rollback()
-            print(f"  Error committing price data: {e}")
+            print(f"  Error saving price data for symbol_id {symbol_id}: {e}")
             return (0, len(price_data_list))
 
-        return (created_count, skipped_count)
+        return (created_count, len(price_data_list) - created_count)
 
     def collect_symbol_price_data(
         self, symbol: Symbol, days_back: int = 1
@@ -267,9 +241,50 @@ class KISPriceCollector:
             symbol_code=symbol.symbol, start_date=start_date, end_date=end_date
         )
 
+        return self._save_fetched_price_data(symbol, df)
+
+    def _save_fetched_price_data(
+        self, symbol: Symbol, df: pd.DataFrame
+    ) -> tuple[int, int]:
+        """
+        Convert and save a DataFrame fetched for a single symbol.
+
+        Args:
+            symbol: Symbol object from database
+            df: DataFrame returned by fetch_daily_price
+
+        Returns:
+            Tuple of (created_count, skipped_count)
+        """
+        price_data_list = self._prepare_price_data(symbol, df)
+
+        if not price_data_list:
+            return (0, 0)
+
+        created, skipped = self.save_price_data(symbol.id, price_data_list)
+
+        print(
+            f"  {symbol.base_asset} ({symbol.symbol}): {created} created, {skipped} skipped"
+        )
+
+        return (created, skipped)
+
+    def _prepare_price_data(
+        self, symbol: Symbol, df: pd.DataFrame
+    ) -> list[dict[str, Any]]:
+        """
+        Convert a DataFrame fetched for a single symbol to price data rows.
+
+        Args:
+            symbol: Symbol object from database
+            df: DataFrame returned by fetch_daily_price
+
+        Returns:
+            List of price data dictionaries (empty if nothing is usable)
+        """
         if df.empty:
             print(f"  No data fetched for {symbol.symbol}")
-            return (0, 0)
+            return []
 
         price_data_list = self._convert_pykrx_data_to_price_data(
             symbol_id=symbol.id, df=df
@@ -277,31 +292,86 @@ class KISPriceCollector:
 
         if not price_data_list:
             print(f"  No valid data for {symbol.symbol}")
-            return (0, 0)
 
-        created, skipped = self.save_price_data(symbol.id, price_data_list)
+        return price_data_list
 
-        print(
-            f"  {symbol.base_asset} ({symbol.symbol}): {created} created, {skipped} skipped"
-        )
+    def _flush_price_data(
+        self, price_data_list: list[dict[str, Any]]
+    ) -> tuple[int, int]:
+        """
+        Save rows buffered from several symbols with a single INSERT and commit.
 
-        # No need for sleep with pykrx (no API rate limiting)
+        If the batch fails, it is retried one symbol at a time so a single bad
+        row only loses its own symbol's rows; save_price_data logs the failing
+        symbol.
 
-        return (created, skipped)
+        Args:
+            price_data_list: List of price data dictionaries
+
+        Returns:
+            Tuple of (created_count, skipped_count)
+        """
+        try:
+            created_count = crud_price_data.insert_price_data_rows(
+                session=self.session, rows=price_data_list
+            )
+        except Exception as e:
+            self.session.rollback()
+            print(
+                f"  Error saving batch of {len(price_data_list)} price rows, "
+                f"retrying per symbol: {e}"
+            )
+            rows_by_symbol: dict[int, list[dict[str, Any]]] = {}
+            for row in price_data_list:
+                rows_by_symbol.setdefault(row["symbol_id"], []).append(row)
+
+            created_count = 0
+            skipped_count = 0
+            for symbol_id, rows in rows_by_symbol.items():
+                created, skipped = self.save_price_data(symbol_id, rows)
+                created_count += created
+                skipped_count += skipped
+            return (created_count, skipped_count)
+
+        skipped_count = len(price_data_list) - created_count
+        print(f"  Saved batch: {created_count} created, {skipped_count} skipped")
+
+        return (created_count, skipped_count)
 
     def collect_all_stock_prices(
         self,
         market: str | None = None,
-        days_back: int = 1,
+        days_back: int | None = None,
         limit: int | None = None,
+        max_workers: int = FETCH_MAX_WORKERS,
+        write_batch_size: int = WRITE_BATCH_SYMBOLS,
+        start_date: str | None = None,
+        end_date: str | None = None,
     ) -> dict[str, int]:
         """
         Collect price data for all stock symbols.
 
+        pykrx requests are fetched concurrently in a thread pool, while
+        conversion and database writes stay on the calling thread. Converted
+        rows are buffered and written with one INSERT and commit per
+        write_batch_size symbols, overlapping with the fetches still running.
+
+        Without an explicit range (neither days_back nor start_date), each
+        symbol is fetched starting the day after its latest stored daily bar,
+        so symbols that are already up to date are skipped and new symbols get
+        the last day. An explicit range is fetched in full for every symbol,
+        which backfills older history and fills gaps; rows already stored are
+        skipped on insert.
+
         Args:
             market: Market filter ('KOSPI', 'KOSDAQ', or None for all)
-            days_back: Number of days to go back from today
+            days_back: Fetch this many days back from today for every symbol
+                (used when start_date is not given)
             limit: Maximum number of symbols to process (None for all)
+            max_workers: Number of concurrent pykrx fetch threads
+            write_batch_size: Number of symbols buffered per database write
+            start_date: Start date in YYYYMMDD format (default: days_back days ago)
+            end_date: End date in YYYYMMDD format (default: today)
 
         Returns:
             Dictionary with statistics
@@ -314,31 +384,83 @@ class KISPriceCollector:
         print(
             f"\nStarting price data collection for {len(symbols)} {market_str} symbols..."
         )
-        print(f"Days back: {days_back}\n")
 
+        incremental = start_date is None and days_back is None
+        if end_date is None:
+            end_date = datetime.now().strftime("%Y%m%d")
+        if start_date is None:
+            start_date = (datetime.now() - timedelta(days=days_back or 1)).strftime(
+                "%Y%m%d"
+            )
+
+        print(f"Date range: {start_date} ~ {end_date}\n")
+
+        # One grouped query for every symbol's latest daily bar, then fetch
+        # only the missing days (YYYYMMDD strings compare in date order)
+        latest_timestamps: dict[int, datetime] = {}
+        if incremental:
+            latest_timestamps = crud_price_data.get_latest_timestamps_by_symbols(
+                session=self.session,
+                symbol_ids=[s.id for s in symbols],
+                timeframe="1d",
+            )
+        fetch_ranges: list[tuple[Symbol, str]] = []
+        for symbol in symbols:
+            symbol_start = start_date
+            latest = latest_timestamps.get(symbol.id)
+            if latest is not None:
+                next_day = (latest + timedelta(days=1)).strftime("%Y%m%d")
+                symbol_start = max(symbol_start, next_day)
+            if symbol_start <= end_date:
+                fetch_ranges.append((symbol, symbol_start))
+
+        symbols_up_to_date = len(symbols) - len(fetch_ranges)
         total_created = 0
         total_skipped = 0
-        symbols_processed = 0
+        symbols_processed = symbols_up_to_date
         symbols_failed = 0
 
-        for symbol in symbols:
-            try:
-                created, skipped = self.collect_symbol_price_data(
-                    symbol=symbol, days_back=days_back
-                )
+        # pykrx calls block on HTTP round-trips to KRX (socket reads release
+        # the GIL), so fetch in threads and buffer results as they complete
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.fetch_daily_price, symbol.symbol, symbol_start, end_date
+                ): symbol
+                for symbol, symbol_start in fetch_ranges
+            }
+
+            pending: list[dict[str, Any]] = []
+            pending_symbols = 0
+
+            for future in as_completed(futures):
+                symbol = futures[future]
+                try:
+                    pending.extend(self._prepare_price_data(symbol, future.result()))
+                    pending_symbols += 1
+                    symbols_processed += 1
+
+                except Exception as e:
+                    print(f"  Error processing {symbol.symbol}: {e}")
+                    symbols_failed += 1
+                    continue
 
-                total_created += created
-                total_skipped += skipped
-                symbols_processed += 1
+                if pending_symbols >= write_batch_size:
+                    created, skipped = self._flush_price_data(pending)
+                    total_created += created
+                    total_skipped += skipped
+                    pending = []
+                    pending_symbols = 0
 
-            except Exception as e:
-                print(f"  Error processing {symbol.symbol}: {e}")
-                symbols_failed += 1
-                continue
+        if pending:
+            created, skipped = self._flush_price_data(pending)
+            total_created += created
+            total_skipped += skipped
 
         print(f"\n{'='*60}")
         print("Collection completed!")
         print(f"Symbols processed: {symbols_processed}/{len(symbols)}")
+        print(f"Symbols up to date: {symbols_up_to_date}")
         print(f"Symbols failed: {symbols_failed}")
         print(f"Total created: {total_created}")
         print(f"Total skipped: {total_skipped}")
@@ -346,6 +468,7 @@ class KISPriceCollector:
 
         return {
             "symbols_processed": symbols_processed,
+            "symbols_up_to_date": symbols_up_to_date,
             "symbols_failed": symbols_failed,
             "total_created": total_created,
             "total_skipped": total_skipped,
@@ -4,19 +4,20 @@ Upbit Collector
 Collects cryptocurrency symbol data from Upbit exchange using ccxt.
 """
 
-from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
 
 import ccxt.async_support as ccxt
-from sqlalchemy.exc import IntegrityError
-from sqlmodel import Session, select
+from sqlmodel import Session
 
-from app.models.exchanges import Exchange
-from app.models.symbols import Symbol
+from app.core.logging_config import get_logger
+from app.crud import exchanges as crud_exchange
+from app.crud import symbols as crud_symbol
 
 from .base import BaseCollector
 
+logger = get_logger(__name__)
+
 
 class UpbitCollector(BaseCollector):
     """Collector for Upbit exchange cryptocurrency data."""
@@ -58,17 +59,18 @@ class UpbitCollector(BaseCollector):
             self.ccxt_exchange = ccxt.upbit()
 
         if self.exchange_id is None:
-            # Get exchange from database
-            statement = select(Exchange).where(Exchange.code == self.exchange_code)
-            exchange = self.session.exec(statement).first()
+            # Resolve exchange_id (cached per process across collector runs)
+            exchange_id = crud_exchange.get_exchange_id_by_code(
+                session=self.session, code=self.exchange_code
+            )
 
-            if not exchange:
+            if exchange_id is None:
                 raise ValueError(
                     f"Exchange '{self.exchange_code}' not found in database. "
                     "Please create it first."
                 )
 
-            self.exchange_id = exchange.id
+            self.exchange_id = exchange_id
 
     async def fetch_symbols(self) -> list[dict[str, Any]]:
         """
@@ -166,41 +168,19 @@ class UpbitCollector(BaseCollector):
         Returns:
             Number of symbols saved (created or updated)
         """
-        saved_count = 0
-        updated_count = 0
-
-        for symbol_data in symbols_data:
-            try:
-                # Check if symbol already exists
-                statement = select(Symbol).where(
-                    Symbol.exchange_id == symbol_data["exchange_id"],
-                    Symbol.symbol == symbol_data["symbol"],
-                )
-                existing_symbol = self.session.exec(statement).first()
-
-                if existing_symbol:
-                    # Update existing symbol
-                    for key, value in symbol_data.items():
-                        setattr(existing_symbol, key, value)
-                    existing_symbol.updated_at = datetime.now(timezone.utc)
-                    updated_count += 1
-                else:
-                    # Create new symbol
-                    symbol = Symbol(**symbol_data)
-                    self.session.add(symbol)
-                    saved_count += 1
-
-                self.session.commit()
-
-            except IntegrityError as e:
-                self.session.rollback()
-                print(f"Error saving symbol {symbol_data.get('symbol')}: {e}")
-                continue
+        # Single INSERT ... ON CONFLICT DO UPDATE instead of a SELECT per
+        # symbol; the unique (exchange_id, symbol) constraint decides between
+        # create and update
+        saved_count, updated_count = crud_symbol.bulk_upsert_symbols(
+            session=self.session, symbols_data=symbols_data
+        )
 
         total_count = saved_count + updated_count
-        print(
-            f"Upbit: {saved_count} symbols created, {updated_count} symbols updated. "
-            f"Total: {total_count}"
+        logger.info(
+            "Upbit: %d symbols created, %d symbols updated. Total: %d",
+            saved_count,
+            updated_count,
+            total_count,
         )
 
         return total_count
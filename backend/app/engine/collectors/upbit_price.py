@@ -13,7 +13,7 @@ import ccxt.async_support as ccxt
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
-from app.models.exchanges import Exchange
+from app.crud import exchanges as crud_exchange
 from app.models.price_data import PriceData
 from app.models.symbols import Symbol
 
@@ -39,17 +39,18 @@ class UpbitPriceCollector:
             self.ccxt_exchange = ccxt.upbit()
 
         if self.exchange_id is None:
-            # Get exchange from database
-            statement = select(Exchange).where(Exchange.code == self.exchange_code)
-            exchange = self.session.exec(statement).first()
+            # Resolve exchange_id (cached per process across collector runs)
+            exchange_id = crud_exchange.get_exchange_id_by_code(
+                session=self.session, code=self.exchange_code
+            )
 
-            if not exchange:
+            if exchange_id is None:
                 raise ValueError(
                     f"Exchange '{self.exchange_code}' not found in database. "
                     "Please create it first."
                 )
 
-            self.exchange_id = exchange.id
+            self.exchange_id = exchange_id
 
     def _get_crypto_symbols(self, limit: int | None = None) -> list[Symbol]:
         """
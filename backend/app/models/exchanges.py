@@ -40,3 +40,4 @@ class ExchangePublic(ExchangeBase):
 class ExchangesPublic(SQLModel):
     data: list[ExchangePublic]
     count: int
+    next_cursor: int | None = None
@@ -71,6 +71,24 @@ class PriceData(PriceDataBase, table=True):
             "timestamp",
             postgresql_ops={"timestamp": "DESC"},
         ),
+        # 커버링 인덱스: 최신 봉/기간 조회 시 OHLCV를 힙 접근 없이 index-only scan으로 처리
+        # 정렬 키(timestamp DESC, id DESC)까지 포함해 projection 조회의 정렬 단계도 생략
+        # btree는 양방향 스캔이 가능하므로 (timestamp, id) keyset 커서 비교도 이 인덱스로 처리
+        Index(
+            "idx_price_data_symbol_tf_time_id_ohlcv",
+            "symbol_id",
+            "timeframe",
+            "timestamp",
+            "id",
+            postgresql_ops={"timestamp": "DESC", "id": "DESC"},
+            postgresql_include=[
+                "open_price",
+                "high_price",
+                "low_price",
+                "close_price",
+                "volume",
+            ],
+        ),
     )
 
     # 프라이머리 키: 자동 증가 정수 (BIGSERIAL)
@@ -91,3 +109,5 @@ class PriceDataPublic(PriceDataBase):
 class PriceDataListPublic(SQLModel):
     data: list[PriceDataPublic]
     count: int
+    # keyset 페이지네이션 커서: 다음 페이지 요청 시 after_id로 전달 (마지막 페이지면 None)
+    next_cursor: int | None = None
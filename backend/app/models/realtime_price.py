@@ -65,3 +65,5 @@ class RealtimePricePublic(RealtimePriceBase):
 class RealtimePriceListPublic(SQLModel):
     data: list[RealtimePricePublic]
     count: int
+    # keyset 페이지네이션 커서: 다음 페이지 요청 시 after_id로 전달 (마지막 페이지면 None)
+    next_cursor: int | None = None
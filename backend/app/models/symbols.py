@@ -72,3 +72,4 @@ class SymbolPublic(SymbolBase):
 class SymbolsPublic(SQLModel):
     data: list[SymbolPublic]
     count: int
+    next_cursor: int | None = None
@@ -7,16 +7,38 @@ Trading Strategies Model
 import uuid
 from datetime import datetime, timezone
 from decimal import Decimal
+from enum import Enum
+from typing import Annotated, Any
 
-from sqlalchemy import DateTime, JSON, UniqueConstraint
+from pydantic import BeforeValidator, field_validator
+from sqlalchemy import JSON, DateTime, Index, UniqueConstraint
+from sqlalchemy import Enum as SAEnum
 from sqlmodel import Column, Field, SQLModel
 
 
+class StrategyType(str, Enum):
+    """매매 전략 유형"""
+
+    GRID = "GRID"
+    REBALANCING = "REBALANCING"
+    DCA = "DCA"
+
+
+# 경로/쿼리 파라미터용: 요청 본문과 같이 대소문자 구분 없이 받음 (예: 'grid')
+StrategyTypeParam = Annotated[StrategyType, BeforeValidator(str.upper)]
+
+
+# 기존 VARCHAR(50) 컬럼 그대로 저장 (native enum 아님, 유형 추가 시 마이그레이션 불필요)
+STRATEGY_TYPE_SA_TYPE = SAEnum(
+    StrategyType, native_enum=False, create_constraint=False, length=50
+)
+
+
 class TradingStrategyBase(SQLModel):
     name: str = Field(max_length=200, nullable=False)
-    strategy_type: str = Field(
-        max_length=50, nullable=False
-    )  # 'GRID', 'REBALANCING', 'DCA' 등
+    strategy_type: StrategyType = Field(
+        sa_type=STRATEGY_TYPE_SA_TYPE, nullable=False
+    )
     description: str | None = Field(default=None)
     config: dict = Field(
         default_factory=dict, sa_column=Column(JSON, nullable=False)
@@ -25,18 +47,34 @@ class TradingStrategyBase(SQLModel):
 
 
 class TradingStrategyCreate(TradingStrategyBase):
-    pass
+    # 전략 유형은 파싱 시점에 대문자로 통일 (예: 'grid' -> 'GRID')
+    @field_validator("strategy_type", mode="before")
+    @classmethod
+    def normalize_strategy_type(cls, v: Any) -> Any:
+        return v.upper() if isinstance(v, str) else v
 
 
 class TradingStrategyUpdate(SQLModel):
     name: str | None = Field(default=None, max_length=200)
-    strategy_type: str | None = Field(default=None, max_length=50)
+    strategy_type: StrategyType | None = None
     description: str | None = None
     config: dict | None = None
     is_active: bool | None = None
 
+    @field_validator("strategy_type", mode="before")
+    @classmethod
+    def normalize_strategy_type(cls, v: Any) -> Any:
+        return v.upper() if isinstance(v, str) else v
+
 
 class TradingStrategy(TradingStrategyBase, table=True):
+    # 목록 조회 필터 조합별 인덱스, 끝의 id로 keyset 정렬(id DESC)까지 인덱스에서 처리
+    __table_args__ = (
+        Index("ix_ts_user_id", "user_id", "id"),
+        Index("ix_ts_user_active_id", "user_id", "is_active", "id"),
+        Index("ix_ts_user_type_id", "user_id", "strategy_type", "id"),
+    )
+
     id: int | None = Field(default=None, primary_key=True)
 
     # 외래 키: users 테이블 참조 (CASCADE 삭제)
@@ -65,11 +103,16 @@ class TradingStrategyPublic(TradingStrategyBase):
 class TradingStrategiesPublic(SQLModel):
     data: list[TradingStrategyPublic]
     count: int
+    # 다음 페이지 keyset 커서 (before_id로 전달), 마지막 페이지면 None
+    next_cursor: int | None = None
 
 
 # Strategy Symbols (전략-종목 매핑)
 class StrategySymbolBase(SQLModel):
-    strategy_id: int = Field(foreign_key="tradingstrategy.id", nullable=False)
+    # 전략 삭제 시 매핑도 함께 삭제 (CASCADE)
+    strategy_id: int = Field(
+        foreign_key="tradingstrategy.id", nullable=False, ondelete="CASCADE"
+    )
     symbol_id: int = Field(foreign_key="symbol.id", nullable=False)
     allocation_ratio: Decimal = Field(
         default=Decimal("0.0"), max_digits=5, decimal_places=4
@@ -93,6 +136,8 @@ class StrategySymbolUpdate(SQLModel):
 class StrategySymbol(StrategySymbolBase, table=True):
     __table_args__ = (
         UniqueConstraint("strategy_id", "symbol_id", name="uq_strategy_symbol"),
+        # 활성 종목 필터 + keyset 정렬용 인덱스
+        Index("ix_ss_strategy_active_id", "strategy_id", "is_active", "id"),
     )
 
     id: int | None = Field(default=None, primary_key=True)
@@ -111,3 +156,5 @@ class StrategySymbolPublic(StrategySymbolBase):
 class StrategySymbolsPublic(SQLModel):
     data: list[StrategySymbolPublic]
     count: int
+    # 다음 페이지 keyset 커서 (before_id로 전달), 마지막 페이지면 None
+    next_cursor: int | None = None
@@ -6,22 +6,35 @@ Stores encrypted API credentials for external exchanges (KIS, Upbit, etc.)
 
 import uuid
 from datetime import datetime, timezone
+from enum import Enum
+from typing import Annotated, Any
 
+from pydantic import BeforeValidator, field_validator
 from sqlalchemy import DateTime, UniqueConstraint
+from sqlalchemy import Enum as SAEnum
 from sqlmodel import Field, SQLModel
 
 
-class UserApiKeyBase(SQLModel):
-    # 거래소 유형 ('KIS', 'UPBIT' 등)
-    exchange_type: str = Field(max_length=20, nullable=False)
+class ExchangeType(str, Enum):
+    """API 키를 발급한 거래소/증권사 유형"""
+
+    KIS = "KIS"
+    UPBIT = "UPBIT"
+
+
+# 경로/쿼리 파라미터용: 요청 본문과 같이 대소문자 구분 없이 받음 (예: 'kis')
+ExchangeTypeParam = Annotated[ExchangeType, BeforeValidator(str.upper)]
+
 
-    # 암호화된 API 키 (평문 저장 금지)
-    # 주의: 실제 저장 시 암호화 필수!
-    encrypted_api_key: str = Field(max_length=1000, nullable=False)
+# 기존 VARCHAR(20) 컬럼 그대로 저장 (native enum 아님)
+EXCHANGE_TYPE_SA_TYPE = SAEnum(
+    ExchangeType, native_enum=False, create_constraint=False, length=20
+)
 
-    # 암호화된 API 시크릿 (평문 저장 금지)
-    # 주의: 실제 저장 시 암호화 필수!
-    encrypted_api_secret: str = Field(max_length=1000, nullable=False)
+
+class UserApiKeyBase(SQLModel):
+    # 거래소 유형 ('KIS', 'UPBIT')
+    exchange_type: ExchangeType = Field(sa_type=EXCHANGE_TYPE_SA_TYPE, nullable=False)
 
     # 계좌번호 (한국투자증권 등에서 필요)
     # 선택 사항이며, 필요한 경우 암호화 권장
@@ -39,11 +52,19 @@ class UserApiKeyBase(SQLModel):
 
 class UserApiKeyCreate(UserApiKeyBase):
     # API 생성 시 평문 키를 받지만, 저장 전 암호화 필요
-    pass
+    # (필드명과 달리 평문, 저장 시 encrypted_credentials 하나로 함께 암호화)
+    encrypted_api_key: str = Field(max_length=1000)
+    encrypted_api_secret: str = Field(max_length=1000)
+
+    # 거래소 유형은 파싱 시점에 대문자로 통일 (예: 'kis' -> 'KIS')
+    @field_validator("exchange_type", mode="before")
+    @classmethod
+    def normalize_exchange_type(cls, v: Any) -> Any:
+        return v.upper() if isinstance(v, str) else v
 
 
 class UserApiKeyUpdate(SQLModel):
-    exchange_type: str | None = Field(default=None, max_length=20)
+    exchange_type: ExchangeType | None = None
     encrypted_api_key: str | None = Field(default=None, max_length=1000)
     encrypted_api_secret: str | None = Field(default=None, max_length=1000)
     account_number: str | None = Field(default=None, max_length=100)
@@ -51,6 +72,11 @@ class UserApiKeyUpdate(SQLModel):
     is_active: bool | None = None
     nickname: str | None = Field(default=None, max_length=100)
 
+    @field_validator("exchange_type", mode="before")
+    @classmethod
+    def normalize_exchange_type(cls, v: Any) -> Any:
+        return v.upper() if isinstance(v, str) else v
+
 
 class UserApiKey(UserApiKeyBase, table=True):
     # 복합 유니크 제약: 동일 유저는 거래소당 하나의 실전/모의 키만 가능
@@ -68,6 +94,10 @@ class UserApiKey(UserApiKeyBase, table=True):
     # 프라이머리 키
     id: int | None = Field(default=None, primary_key=True)
 
+    # 암호화된 API 키 + 시크릿 (하나의 AES-GCM 토큰, 평문 저장 금지)
+    # 주의: 실제 저장 시 encrypt_api_credentials로 암호화 필수!
+    encrypted_credentials: str = Field(max_length=3000, nullable=False)
+
     # 외래 키: users 테이블 참조 (CASCADE 삭제)
     # 사용자 삭제 시 해당 사용자의 모든 API 키도 삭제됨
     user_id: uuid.UUID = Field(
@@ -96,16 +126,18 @@ class UserApiKeyPublic(SQLModel):
 
     id: int
     user_id: uuid.UUID
-    exchange_type: str
+    exchange_type: ExchangeType
     account_number: str | None
     is_demo: bool
     is_active: bool
     nickname: str | None
     created_at: datetime
     updated_at: datetime
-    # encrypted_api_key와 encrypted_api_secret은 의도적으로 제외
+    # encrypted_credentials는 의도적으로 제외
 
 
 class UserApiKeysPublic(SQLModel):
     data: list[UserApiKeyPublic]
     count: int
+    # 다음 페이지 keyset 커서 (before_id로 전달), 마지막 페이지면 None
+    next_cursor: int | None = None
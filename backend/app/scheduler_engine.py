@@ -10,23 +10,20 @@ import asyncio
 import signal
 import sys
 from datetime import datetime
-from pathlib import Path
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from app.core.config import settings
 from app.core.logging_config import get_logger
+from app.core.paths import SCRIPTS_DIR
 
 # --- Logger Setup ---
 logger = get_logger(__name__)
 # --- End of Logger Setup ---
 
 
-# Get project root (backend directory)
-PROJECT_ROOT = Path(__file__).parent.parent
-
 # Import collection functions from scripts
-sys.path.append(str(PROJECT_ROOT / "scripts"))
+sys.path.append(str(SCRIPTS_DIR))
 
 from scripts.collect_symbols import main as collect_symbols_main
 from scripts.collect_price_data import main as collect_price_data_main
@@ -52,11 +49,7 @@ class SchedulerEngine:
         """Executes the collect_price_data.py script."""
         try:
             logger.info("Starting price data collection job...")
-            # Override sys.argv to pass default arguments
-            original_argv = sys.argv
-            sys.argv = ["collect_price_data.py", "--exchange", "all"]
-            await collect_price_data_main()
-            sys.argv = original_argv
+            await collect_price_data_main(["--exchange", "all"])
             logger.info("Price data collection job completed successfully")
         except Exception:
             logger.error("Price data collection job failed", exc_info=True)
@@ -72,6 +65,9 @@ class SchedulerEngine:
             id="collect_symbols",
             name="Collect Symbols from Exchanges",
             replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=3600,
         )
         logger.info("Scheduled job: Collect symbols at 00:00 daily")
 
@@ -84,6 +80,9 @@ class SchedulerEngine:
             id="collect_price_data",
             name="Collect Price Data from Exchanges",
             replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+            misfire_grace_time=3600,
         )
         logger.info("Scheduled job: Collect price data at 00:02 daily")
 
@@ -0,0 +1,65 @@
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.tests.utils.utils import random_lower_string
+
+
+def test_create_exchange_invalidates_list_cache(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/exchanges/",
+        headers=superuser_token_headers,
+        params={"limit": 1},
+    )
+    assert r.status_code == 200
+    count_before = r.json()["count"]
+
+    code = random_lower_string()[:20]
+    r = client.post(
+        f"{settings.API_V1_STR}/exchanges/",
+        headers=superuser_token_headers,
+        json={"code": code, "name": "Test Exchange"},
+    )
+    assert r.status_code == 200
+    exchange_id = r.json()["id"]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/exchanges/",
+        headers=superuser_token_headers,
+        params={"limit": 1},
+    )
+    assert r.status_code == 200
+    assert r.json()["count"] == count_before + 1
+
+    # Newest exchange sorts last; page from just before it
+    r = client.get(
+        f"{settings.API_V1_STR}/exchanges/",
+        headers=superuser_token_headers,
+        params={"after_id": exchange_id - 1},
+    )
+    assert r.status_code == 200
+    assert code in {exchange["code"] for exchange in r.json()["data"]}
+
+
+def test_delete_exchange(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/exchanges/",
+        headers=superuser_token_headers,
+        json={"code": random_lower_string()[:20], "name": "Test Exchange"},
+    )
+    exchange_id = r.json()["id"]
+
+    r = client.delete(
+        f"{settings.API_V1_STR}/exchanges/{exchange_id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+
+    r = client.delete(
+        f"{settings.API_V1_STR}/exchanges/{exchange_id}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 404
@@ -0,0 +1,231 @@
+import json
+from datetime import datetime, timezone
+
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.cache import symbol_exists_cache
+from app.core.config import settings
+from app.tests.utils.market import create_random_symbol
+
+
+def _candle(symbol_id: int, day: int) -> dict[str, object]:
+    return {
+        "symbol_id": symbol_id,
+        "timestamp": datetime(2024, 1, day, tzinfo=timezone.utc).isoformat(),
+        "open_price": "100",
+        "high_price": "110",
+        "low_price": "90",
+        "close_price": "105",
+        "volume": "1000",
+        "timeframe": "1d",
+    }
+
+
+def test_bulk_create_price_data_skips_duplicates(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+
+    r = client.post(
+        f"{settings.API_V1_STR}/price-data/bulk",
+        headers=superuser_token_headers,
+        json=[_candle(symbol.id, 1), _candle(symbol.id, 2)],
+    )
+    assert r.status_code == 200
+    assert r.json()["count"] == 2
+
+    r = client.post(
+        f"{settings.API_V1_STR}/price-data/bulk",
+        headers=superuser_token_headers,
+        json=[_candle(symbol.id, 2), _candle(symbol.id, 3), _candle(symbol.id, 3)],
+    )
+    assert r.status_code == 200
+    created = r.json()
+    assert created["count"] == 1
+    assert created["data"][0]["timestamp"].startswith("2024-01-03")
+
+
+def test_bulk_create_price_data_unknown_symbol(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/price-data/bulk",
+        headers=superuser_token_headers,
+        json=[_candle(2_000_000_000, 1)],
+    )
+    assert r.status_code == 404
+
+
+def test_create_price_data_stale_symbol_cache(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    # 다른 워커에서 삭제되어 캐시에만 남은 종목은 FK 위반으로 404
+    symbol_exists_cache.set(2_000_000_001, True)
+    try:
+        r = client.post(
+            f"{settings.API_V1_STR}/price-data/",
+            headers=superuser_token_headers,
+            json=_candle(2_000_000_001, 1),
+        )
+    finally:
+        symbol_exists_cache.delete(2_000_000_001)
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Symbol not found"
+
+
+def test_read_price_data_by_symbol(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+    client.post(
+        f"{settings.API_V1_STR}/price-data/bulk",
+        headers=superuser_token_headers,
+        json=[_candle(symbol.id, day) for day in (1, 2, 3)],
+    )
+
+    r = client.get(
+        f"{settings.API_V1_STR}/price-data/symbol/{symbol.id}",
+        headers=superuser_token_headers,
+        params={"timeframe": "1d", "limit": 2},
+    )
+    assert r.status_code == 200
+    page = r.json()
+    assert page["count"] == 3
+    assert [p["timestamp"][:10] for p in page["data"]] == ["2024-01-03", "2024-01-02"]
+    assert page["next_cursor"] == page["data"][-1]["id"]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/price-data/symbol/{symbol.id}",
+        headers=superuser_token_headers,
+        params={
+            "timeframe": "1d",
+            "limit": 2,
+            "after_timestamp": page["data"][-1]["timestamp"],
+            "after_id": page["next_cursor"],
+        },
+    )
+    assert r.status_code == 200
+    next_page = r.json()
+    assert [p["timestamp"][:10] for p in next_page["data"]] == ["2024-01-01"]
+    assert next_page["count"] == 3
+
+    # 커서의 한쪽만 전달하면 OFFSET 페이지로 조용히 돌아가지 않고 거부
+    r = client.get(
+        f"{settings.API_V1_STR}/price-data/symbol/{symbol.id}",
+        headers=superuser_token_headers,
+        params={"timeframe": "1d", "after_id": page["next_cursor"]},
+    )
+    assert r.status_code == 400
+    assert next_page["next_cursor"] is None
+
+
+def test_read_price_data_by_symbol_fields(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+    client.post(
+        f"{settings.API_V1_STR}/price-data/bulk",
+        headers=superuser_token_headers,
+        json=[_candle(symbol.id, day) for day in (1, 2)],
+    )
+
+    r = client.get(
+        f"{settings.API_V1_STR}/price-data/symbol/{symbol.id}",
+        headers=superuser_token_headers,
+        params={"timeframe": "1d", "fields": ["close_price", "volume"]},
+    )
+    assert r.status_code == 200
+    page = r.json()
+    assert page["count"] == 2
+    assert set(page["data"][0]) == {"id", "timestamp", "close_price", "volume"}
+
+    r = client.get(
+        f"{settings.API_V1_STR}/price-data/symbol/{symbol.id}",
+        headers=superuser_token_headers,
+        params={"timeframe": "1d", "fields": ["password"]},
+    )
+    assert r.status_code == 400
+
+
+def test_stream_price_data_by_symbol(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+    client.post(
+        f"{settings.API_V1_STR}/price-data/bulk",
+        headers=superuser_token_headers,
+        json=[_candle(symbol.id, day) for day in (1, 2, 3)],
+    )
+
+    r = client.get(
+        f"{settings.API_V1_STR}/price-data/symbol/{symbol.id}/stream",
+        headers=superuser_token_headers,
+        params={"timeframe": "1d"},
+    )
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert [row["timestamp"][:10] for row in rows] == [
+        "2024-01-03",
+        "2024-01-02",
+        "2024-01-01",
+    ]
+
+
+def test_update_price_data_collision(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+    r = client.post(
+        f"{settings.API_V1_STR}/price-data/bulk",
+        headers=superuser_token_headers,
+        json=[_candle(symbol.id, 1), _candle(symbol.id, 2)],
+    )
+    first, second = r.json()["data"]
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/price-data/{second['id']}",
+        headers=superuser_token_headers,
+        json={"timestamp": first["timestamp"]},
+    )
+    assert r.status_code == 409
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/price-data/{second['id']}",
+        headers=superuser_token_headers,
+        json={"close_price": "107"},
+    )
+    assert r.status_code == 200
+
+
+def test_delete_price_data_by_symbol(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+    hourly = {**_candle(symbol.id, 1), "timeframe": "1h"}
+    client.post(
+        f"{settings.API_V1_STR}/price-data/bulk",
+        headers=superuser_token_headers,
+        json=[_candle(symbol.id, 1), _candle(symbol.id, 2), hourly],
+    )
+
+    r = client.delete(
+        f"{settings.API_V1_STR}/price-data/symbol/{symbol.id}",
+        headers=superuser_token_headers,
+        params={"timeframe": "1d"},
+    )
+    assert r.status_code == 200
+    assert r.json()["message"].startswith("Deleted 2 ")
+
+    r = client.delete(
+        f"{settings.API_V1_STR}/price-data/symbol/{symbol.id}",
+        headers=superuser_token_headers,
+    )
+    assert r.json()["message"].startswith("Deleted 1 ")
@@ -0,0 +1,102 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.tests.utils.market import create_random_exchange, create_random_symbol
+
+
+def test_read_symbols_by_exchange_keyset(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    exchange = create_random_exchange(db)
+    assert exchange.id is not None
+    symbols = [create_random_symbol(db, exchange_id=exchange.id) for _ in range(3)]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/symbols/exchange/{exchange.id}",
+        headers=superuser_token_headers,
+        params={"limit": 2},
+    )
+    assert r.status_code == 200
+    first_page = r.json()
+    assert [s["id"] for s in first_page["data"]] == [s.id for s in symbols[:2]]
+    assert first_page["count"] == 3
+    assert first_page["next_cursor"] == symbols[1].id
+
+    r = client.get(
+        f"{settings.API_V1_STR}/symbols/exchange/{exchange.id}",
+        headers=superuser_token_headers,
+        params={"limit": 2, "after_id": first_page["next_cursor"]},
+    )
+    assert r.status_code == 200
+    second_page = r.json()
+    assert [s["id"] for s in second_page["data"]] == [symbols[2].id]
+    # count는 커서와 무관하게 전체 개수
+    assert second_page["count"] == 3
+    assert second_page["next_cursor"] is None
+
+    r = client.get(
+        f"{settings.API_V1_STR}/symbols/exchange/{exchange.id}",
+        headers=superuser_token_headers,
+        params={"after_id": symbols[2].id},
+    )
+    assert r.status_code == 200
+    assert r.json()["data"] == []
+    assert r.json()["count"] == 3
+
+
+def test_read_symbols_by_exchange_offset_past_end(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    exchange = create_random_exchange(db)
+    assert exchange.id is not None
+    create_random_symbol(db, exchange_id=exchange.id)
+
+    r = client.get(
+        f"{settings.API_V1_STR}/symbols/exchange/{exchange.id}",
+        headers=superuser_token_headers,
+        params={"skip": 5},
+    )
+    assert r.status_code == 200
+    page = r.json()
+    assert page["data"] == []
+    assert page["count"] == 1
+
+
+def test_update_symbol(
+    client: TestClient, superuser_token_headers: dict[str, str], db: Session
+) -> None:
+    exchange = create_random_exchange(db)
+    assert exchange.id is not None
+    symbol, other = (create_random_symbol(db, exchange_id=exchange.id) for _ in range(2))
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/symbols/{symbol.id}",
+        headers=superuser_token_headers,
+        json={"base_asset": "Renamed"},
+    )
+    assert r.status_code == 200
+    assert r.json()["base_asset"] == "Renamed"
+    assert r.json()["symbol"] == symbol.symbol
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/symbols/{symbol.id}",
+        headers=superuser_token_headers,
+        json={"symbol": other.symbol},
+    )
+    assert r.status_code == 409
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/symbols/{symbol.id}",
+        headers=superuser_token_headers,
+        json={"exchange_id": 2000000000},
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == "Exchange not found"
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/symbols/2000000000",
+        headers=superuser_token_headers,
+        json={"base_asset": "Missing"},
+    )
+    assert r.status_code == 404
@@ -0,0 +1,196 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app import crud
+from app.core.config import settings
+from app.tests.utils.market import create_random_symbol
+from app.tests.utils.user import authentication_token_from_email
+from app.tests.utils.utils import random_email, random_lower_string
+
+
+def test_read_trading_strategies_combined_filters(
+    client: TestClient, db: Session
+) -> None:
+    # Fresh user so the filter counts only see this test's strategies
+    headers = authentication_token_from_email(
+        client=client, email=random_email(), db=db
+    )
+    for strategy_type, is_active in [
+        ("grid", True),
+        ("GRID", False),
+        ("DCA", True),
+    ]:
+        r = client.post(
+            f"{settings.API_V1_STR}/trading-strategies/",
+            headers=headers,
+            json={
+                "name": random_lower_string(),
+                "strategy_type": strategy_type,
+                "is_active": is_active,
+            },
+        )
+        assert r.status_code == 200
+        assert r.json()["strategy_type"] == strategy_type.upper()
+
+    r = client.get(
+        f"{settings.API_V1_STR}/trading-strategies/",
+        headers=headers,
+        params={"strategy_type": "GRID", "is_active": True},
+    )
+    content = r.json()
+    assert content["count"] == 1
+    assert content["data"][0]["is_active"] is True
+
+    r = client.get(
+        f"{settings.API_V1_STR}/trading-strategies/",
+        headers=headers,
+        params={"strategy_type": "grid", "is_active": False, "limit": 1},
+    )
+    content = r.json()
+    assert content["count"] == 1
+    assert content["data"][0]["is_active"] is False
+
+    r = client.get(
+        f"{settings.API_V1_STR}/trading-strategies/",
+        headers=headers,
+        params={"strategy_type": "UNKNOWN"},
+    )
+    assert r.status_code == 422
+
+
+def test_read_trading_strategies_keyset(client: TestClient, db: Session) -> None:
+    normal_user_token_headers = authentication_token_from_email(
+        client=client, email=random_email(), db=db
+    )
+    strategy_type = "DCA"
+    created_ids = []
+    for _ in range(3):
+        r = client.post(
+            f"{settings.API_V1_STR}/trading-strategies/",
+            headers=normal_user_token_headers,
+            json={"name": random_lower_string(), "strategy_type": strategy_type},
+        )
+        created_ids.append(r.json()["id"])
+
+    params: dict[str, str | int] = {"strategy_type": strategy_type, "limit": 2}
+    r = client.get(
+        f"{settings.API_V1_STR}/trading-strategies/",
+        headers=normal_user_token_headers,
+        params=params,
+    )
+    first_page = r.json()
+    assert [s["id"] for s in first_page["data"]] == created_ids[:0:-1]
+    assert first_page["next_cursor"] == created_ids[1]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/trading-strategies/",
+        headers=normal_user_token_headers,
+        params={**params, "before_id": first_page["next_cursor"]},
+    )
+    second_page = r.json()
+    assert [s["id"] for s in second_page["data"]] == [created_ids[0]]
+    assert second_page["next_cursor"] is None
+
+
+def test_trading_strategy_ownership(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/trading-strategies/",
+        headers=superuser_token_headers,
+        json={"name": random_lower_string(), "strategy_type": "GRID"},
+    )
+    strategy_id = r.json()["id"]
+    url = f"{settings.API_V1_STR}/trading-strategies/{strategy_id}"
+
+    r = client.get(url, headers=normal_user_token_headers)
+    assert r.status_code == 403
+    r = client.get(f"{url}/symbols", headers=normal_user_token_headers)
+    assert r.status_code == 403
+    r = client.patch(url, headers=normal_user_token_headers, json={"name": "x"})
+    assert r.status_code == 403
+    r = client.post(f"{url}/deactivate", headers=normal_user_token_headers)
+    assert r.status_code == 403
+    # New strategies start inactive
+    r = client.post(f"{url}/deactivate", headers=superuser_token_headers)
+    assert r.status_code == 400
+    r = client.delete(url, headers=normal_user_token_headers)
+    assert r.status_code == 403
+
+    r = client.patch(
+        url, headers=superuser_token_headers, json={"strategy_type": "dca"}
+    )
+    assert r.status_code == 200
+    assert r.json()["strategy_type"] == "DCA"
+
+    r = client.delete(url, headers=superuser_token_headers)
+    assert r.status_code == 200
+    r = client.get(url, headers=superuser_token_headers)
+    assert r.status_code == 404
+
+
+def test_bulk_create_strategy_symbols(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/trading-strategies/",
+        headers=normal_user_token_headers,
+        json={"name": random_lower_string(), "strategy_type": "REBALANCING"},
+    )
+    strategy_id = r.json()["id"]
+    url = f"{settings.API_V1_STR}/trading-strategies/{strategy_id}/symbols/bulk"
+    symbol_ids = [create_random_symbol(db).id for _ in range(2)]
+
+    payload = [
+        {"strategy_id": strategy_id, "symbol_id": symbol_id, "allocation_ratio": 0.5}
+        for symbol_id in symbol_ids
+    ]
+    r = client.post(url, headers=normal_user_token_headers, json=payload)
+    assert r.status_code == 200
+    assert r.json()["count"] == 2
+
+    # Already-added symbols are skipped
+    r = client.post(url, headers=normal_user_token_headers, json=payload)
+    assert r.status_code == 200
+    assert r.json()["count"] == 0
+
+    r = client.post(
+        url,
+        headers=normal_user_token_headers,
+        json=[{**payload[0], "allocation_ratio": 1.5}],
+    )
+    assert r.status_code == 400
+
+    # Unknown symbol IDs are reported instead of failing on the foreign key
+    r = client.post(
+        url,
+        headers=normal_user_token_headers,
+        json=[{**payload[0], "symbol_id": 2_000_000_000}],
+    )
+    assert r.status_code == 404
+    assert "2000000000" in r.json()["detail"]
+
+    symbol_url = (
+        f"{settings.API_V1_STR}/trading-strategies/{strategy_id}/symbols/{symbol_ids[0]}"
+    )
+    r = client.delete(symbol_url, headers=normal_user_token_headers)
+    assert r.status_code == 200
+    r = client.delete(symbol_url, headers=normal_user_token_headers)
+    assert r.status_code == 404
+
+
+def test_trading_strategies_inactive_user(client: TestClient, db: Session) -> None:
+    email = random_email()
+    headers = authentication_token_from_email(client=client, email=email, db=db)
+    user = crud.get_user_by_email(session=db, email=email)
+    assert user is not None
+
+    # Deactivation takes effect immediately, not when the token expires
+    user.is_active = False
+    db.add(user)
+    db.commit()
+    r = client.get(f"{settings.API_V1_STR}/trading-strategies/", headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Inactive user"
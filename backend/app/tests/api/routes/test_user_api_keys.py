@@ -0,0 +1,139 @@
+from fastapi.testclient import TestClient
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.encryption import decrypt_api_credentials
+from app.models.user_api_keys import UserApiKey
+from app.tests.utils.user import authentication_token_from_email
+from app.tests.utils.utils import random_email
+
+
+def test_user_api_key_lifecycle(
+    client: TestClient, normal_user_token_headers: dict[str, str], db: Session
+) -> None:
+    exchange_type = "kis"
+    r = client.post(
+        f"{settings.API_V1_STR}/user-api-keys/",
+        headers=normal_user_token_headers,
+        json={
+            "exchange_type": exchange_type,
+            "encrypted_api_key": "plain-key",
+            "encrypted_api_secret": "plain-secret",
+            "is_demo": True,
+        },
+    )
+    assert r.status_code == 200
+    api_key = r.json()
+    assert api_key["exchange_type"] == exchange_type.upper()
+    assert "encrypted_api_key" not in api_key
+
+    r = client.get(
+        f"{settings.API_V1_STR}/user-api-keys/", headers=normal_user_token_headers
+    )
+    assert r.status_code == 200
+    content = r.json()
+    assert content["count"] == len(content["data"])
+    assert api_key["id"] in [item["id"] for item in content["data"]]
+
+    # Only one active key per exchange/demo combination
+    r = client.post(
+        f"{settings.API_V1_STR}/user-api-keys/",
+        headers=normal_user_token_headers,
+        json={
+            "exchange_type": exchange_type,
+            "encrypted_api_key": "other-key",
+            "encrypted_api_secret": "other-secret",
+            "is_demo": True,
+        },
+    )
+    assert r.status_code == 400
+
+    r = client.get(
+        f"{settings.API_V1_STR}/user-api-keys/exchange/{api_key['exchange_type'].lower()}",
+        headers=normal_user_token_headers,
+        params={"is_demo": True},
+    )
+    assert r.status_code == 200
+    assert r.json()["id"] == api_key["id"]
+
+    r = client.patch(
+        f"{settings.API_V1_STR}/user-api-keys/{api_key['id']}",
+        headers=normal_user_token_headers,
+        json={"nickname": "renamed"},
+    )
+    assert r.status_code == 200
+    assert r.json()["nickname"] == "renamed"
+
+    # Updating only the secret keeps the stored key
+    r = client.patch(
+        f"{settings.API_V1_STR}/user-api-keys/{api_key['id']}",
+        headers=normal_user_token_headers,
+        json={"encrypted_api_secret": "new-secret"},
+    )
+    assert r.status_code == 200
+    db_api_key = db.get(UserApiKey, api_key["id"], populate_existing=True)
+    assert db_api_key
+    assert decrypt_api_credentials(db_api_key.encrypted_credentials) == (
+        "plain-key",
+        "new-secret",
+    )
+
+    r = client.post(
+        f"{settings.API_V1_STR}/user-api-keys/{api_key['id']}/deactivate",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 200
+    assert r.json()["is_active"] is False
+
+    r = client.post(
+        f"{settings.API_V1_STR}/user-api-keys/{api_key['id']}/deactivate",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 400
+
+    r = client.delete(
+        f"{settings.API_V1_STR}/user-api-keys/{api_key['id']}",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 200
+
+    r = client.get(
+        f"{settings.API_V1_STR}/user-api-keys/{api_key['id']}",
+        headers=normal_user_token_headers,
+    )
+    assert r.status_code == 404
+
+
+def test_read_user_api_keys_keyset(client: TestClient, db: Session) -> None:
+    headers = authentication_token_from_email(
+        client=client, email=random_email(), db=db
+    )
+    created_ids = []
+    for exchange_type, is_demo in [("KIS", True), ("KIS", False), ("UPBIT", False)]:
+        r = client.post(
+            f"{settings.API_V1_STR}/user-api-keys/",
+            headers=headers,
+            json={
+                "exchange_type": exchange_type,
+                "encrypted_api_key": "plain-key",
+                "encrypted_api_secret": "plain-secret",
+                "is_demo": is_demo,
+            },
+        )
+        created_ids.append(r.json()["id"])
+
+    r = client.get(
+        f"{settings.API_V1_STR}/user-api-keys/", headers=headers, params={"limit": 2}
+    )
+    first_page = r.json()
+    assert [k["id"] for k in first_page["data"]] == created_ids[:0:-1]
+    assert first_page["next_cursor"] == created_ids[1]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/user-api-keys/",
+        headers=headers,
+        params={"limit": 2, "before_id": first_page["next_cursor"]},
+    )
+    second_page = r.json()
+    assert [k["id"] for k in second_page["data"]] == [created_ids[0]]
+    assert second_page["next_cursor"] is None
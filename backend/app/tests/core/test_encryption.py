@@ -0,0 +1,31 @@
+import pytest
+
+from app.core.encryption import (
+    _FERNET,
+    decrypt_api_credentials,
+    decrypt_api_key,
+    encrypt_api_credentials,
+    encrypt_api_key,
+)
+
+
+def test_encrypt_decrypt_round_trip() -> None:
+    encrypted = encrypt_api_credentials("my-key", "my-secret")
+    assert encrypted.startswith("v2:")
+    assert encrypted != encrypt_api_credentials("my-key", "my-secret")
+    assert decrypt_api_credentials(encrypted) == ("my-key", "my-secret")
+
+
+def test_credentials_separator_in_key_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        encrypt_api_credentials("bad\x1fkey", "secret")
+
+
+def test_empty_values_are_not_encrypted() -> None:
+    assert encrypt_api_key("") == ""
+    assert decrypt_api_key("") == ""
+
+
+def test_decrypt_legacy_fernet_token() -> None:
+    legacy = _FERNET.encrypt(b"old-secret").decode()
+    assert decrypt_api_key(legacy) == "old-secret"
@@ -0,0 +1,25 @@
+import json
+import uuid
+from datetime import datetime, timezone
+
+from app.core.responses import FastJSONResponse
+
+
+def test_fast_json_response_matches_json() -> None:
+    content = {
+        "data": [{"id": 1, "name": "삼성전자", "price": 71000.5, "tags": None}],
+        "count": 1,
+    }
+    response = FastJSONResponse(content)
+    assert json.loads(response.body) == content
+    assert response.media_type == "application/json"
+
+
+def test_fast_json_response_encodes_common_types() -> None:
+    user_id = uuid.uuid4()
+    ts = datetime(2024, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+    response = FastJSONResponse({"user_id": user_id, "ts": ts})
+    assert json.loads(response.body) == {
+        "user_id": str(user_id),
+        "ts": "2024-01-02T03:04:05Z",
+    }
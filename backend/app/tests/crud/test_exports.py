@@ -0,0 +1,8 @@
+from app import crud
+
+
+def test_lazy_exports() -> None:
+    assert set(crud.__all__) == set(crud._EXPORTS)
+    for name in crud.__all__:
+        assert callable(getattr(crud, name))
+    assert "create_exchange" in dir(crud)
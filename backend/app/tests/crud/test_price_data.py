@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from sqlmodel import Session
+
+from app.crud import price_data as crud_price_data
+from app.models import PriceDataCreate
+from app.tests.utils.market import create_random_symbol
+
+
+def _daily_price_data(symbol_id: int, days: int) -> list[PriceDataCreate]:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    return [
+        PriceDataCreate(
+            symbol_id=symbol_id,
+            timestamp=start + timedelta(days=day),
+            timeframe="1d",
+            open_price=Decimal("100"),
+            high_price=Decimal("110"),
+            low_price=Decimal("90"),
+            close_price=Decimal("105.5"),
+            volume=Decimal("1000"),
+        )
+        for day in range(days)
+    ]
+
+
+def test_bulk_create_price_data_raw(db: Session) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+    price_data_list = _daily_price_data(symbol.id, 3)
+
+    inserted = crud_price_data.bulk_create_price_data_raw(
+        session=db, price_data_list=price_data_list[:2]
+    )
+    assert inserted == 2
+
+    # 이미 있는 행은 ON CONFLICT DO NOTHING으로 건너뜀
+    inserted = crud_price_data.bulk_create_price_data_raw(
+        session=db, price_data_list=price_data_list
+    )
+    assert inserted == 1
+
+    rows, count = crud_price_data.get_price_data_by_symbol(
+        session=db, symbol_id=symbol.id, timeframe="1d"
+    )
+    assert count == 3
+    assert all(row.created_at is not None for row in rows)
+
+    crud_price_data.delete_price_data_by_symbol(session=db, symbol_id=symbol.id)
+
+
+def test_insert_price_data_rows(db: Session) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+    rows = [item.model_dump() for item in _daily_price_data(symbol.id, 2)]
+
+    assert crud_price_data.insert_price_data_rows(session=db, rows=rows) == 2
+    assert crud_price_data.insert_price_data_rows(session=db, rows=rows) == 0
+    assert crud_price_data.insert_price_data_rows(session=db, rows=[]) == 0
+
+    crud_price_data.delete_price_data_by_symbol(session=db, symbol_id=symbol.id)
+
+
+def test_get_latest_timestamps_by_symbols(db: Session) -> None:
+    symbol = create_random_symbol(db)
+    empty_symbol = create_random_symbol(db)
+    assert symbol.id is not None and empty_symbol.id is not None
+    price_data_list = _daily_price_data(symbol.id, 3)
+    crud_price_data.bulk_create_price_data_raw(
+        session=db, price_data_list=price_data_list
+    )
+
+    latest = crud_price_data.get_latest_timestamps_by_symbols(
+        session=db, symbol_ids=[symbol.id, empty_symbol.id], timeframe="1d"
+    )
+    assert latest == {symbol.id: price_data_list[-1].timestamp}
+
+    crud_price_data.delete_price_data_by_symbol(session=db, symbol_id=symbol.id)
+
+
+def test_copy_price_data(db: Session) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+    price_data_list = _daily_price_data(symbol.id, 3)
+
+    inserted = crud_price_data.copy_price_data(
+        session=db, price_data_rows=iter(price_data_list[:2])
+    )
+    assert inserted == 2
+
+    # 중복 행은 건너뛰고, 같은 세션에서 다시 호출해도 임시 테이블이 충돌하지 않음
+    inserted = crud_price_data.copy_price_data(
+        session=db, price_data_rows=price_data_list
+    )
+    assert inserted == 1
+
+    latest = crud_price_data.get_latest_price_data(
+        session=db, symbol_id=symbol.id, timeframe="1d"
+    )
+    assert latest is not None
+    assert latest.timestamp == price_data_list[-1].timestamp
+    assert latest.close_price == Decimal("105.5")
+
+    crud_price_data.delete_price_data_by_symbol(session=db, symbol_id=symbol.id)
+
+
+def test_snap_time_range() -> None:
+    start = datetime(2024, 1, 1, 10, 30, tzinfo=timezone.utc)
+    end = datetime(2024, 1, 1, 12, 59, tzinfo=timezone.utc)
+
+    # 시작은 다음 봉으로 올림, 끝은 이전 봉으로 내림
+    assert crud_price_data.snap_time_range(start, end, "1h") == (
+        datetime(2024, 1, 1, 11, tzinfo=timezone.utc),
+        datetime(2024, 1, 1, 12, tzinfo=timezone.utc),
+    )
+    # 이미 격자 위의 값과 격자가 보장되지 않는 시간 프레임은 그대로
+    assert crud_price_data.snap_time_range(end, None, "1m") == (end, None)
+    assert crud_price_data.snap_time_range(start, end, "1d") == (start, end)
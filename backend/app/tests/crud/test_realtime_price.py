@@ -0,0 +1,91 @@
+from decimal import Decimal
+
+import pytest
+from sqlmodel import Session
+
+from app.crud import realtime_price as crud_realtime_price
+from app.models import RealtimePriceCreate
+from app.tests.utils.market import create_random_symbol
+
+
+def test_bulk_upsert_realtime_prices(db: Session) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+
+    created = crud_realtime_price.bulk_upsert_realtime_prices(
+        session=db,
+        realtime_price_list=[
+            RealtimePriceCreate(symbol_id=symbol.id, current_price=Decimal("100"))
+        ],
+    )
+    assert len(created) == 1
+
+    upserted = crud_realtime_price.bulk_upsert_realtime_prices(
+        session=db,
+        realtime_price_list=[
+            RealtimePriceCreate(symbol_id=symbol.id, current_price=Decimal("101")),
+            RealtimePriceCreate(
+                symbol_id=symbol.id,
+                current_price=Decimal("102"),
+                bid_price=Decimal("101.5"),
+            ),
+        ],
+    )
+    assert len(upserted) == 1
+    assert upserted[0].id == created[0].id
+    assert upserted[0].current_price == Decimal("102")
+    assert upserted[0].bid_price == Decimal("101.5")
+
+
+def test_get_realtime_prices_by_symbols(db: Session) -> None:
+    symbols = [create_random_symbol(db) for _ in range(2)]
+    symbol_ids = [symbol.id for symbol in symbols if symbol.id is not None]
+    crud_realtime_price.bulk_upsert_realtime_prices(
+        session=db,
+        realtime_price_list=[
+            RealtimePriceCreate(symbol_id=symbol_id, current_price=Decimal("1"))
+            for symbol_id in symbol_ids
+        ],
+    )
+
+    prices = crud_realtime_price.get_realtime_prices_by_symbols(
+        session=db, symbol_ids=[*symbol_ids, symbol_ids[0]]
+    )
+    assert [price.symbol_id for price in prices] == sorted(symbol_ids)
+
+
+def test_bulk_upsert_realtime_prices_copy(
+    db: Session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # 임계값을 낮춰 COPY + INSERT ... SELECT 경로를 사용
+    monkeypatch.setattr(crud_realtime_price, "COPY_UPSERT_MIN_ROWS", 1)
+    symbols = [create_random_symbol(db) for _ in range(2)]
+    symbol_ids = [symbol.id for symbol in symbols if symbol.id is not None]
+
+    created = crud_realtime_price.bulk_upsert_realtime_prices(
+        session=db,
+        realtime_price_list=[
+            RealtimePriceCreate(symbol_id=symbol_ids[0], current_price=Decimal("1"))
+        ],
+    )
+    assert len(created) == 1
+
+    # 기존 종목은 갱신, 새 종목은 생성, 중복 종목은 마지막 항목만 반영
+    upserted = crud_realtime_price.bulk_upsert_realtime_prices(
+        session=db,
+        realtime_price_list=[
+            RealtimePriceCreate(symbol_id=symbol_ids[0], current_price=Decimal("2")),
+            RealtimePriceCreate(symbol_id=symbol_ids[1], current_price=Decimal("5")),
+            RealtimePriceCreate(
+                symbol_id=symbol_ids[0],
+                current_price=Decimal("3"),
+                change_rate=Decimal("1.5"),
+            ),
+        ],
+    )
+    by_symbol = {price.symbol_id: price for price in upserted}
+    assert sorted(by_symbol) == sorted(symbol_ids)
+    assert by_symbol[symbol_ids[0]].id == created[0].id
+    assert by_symbol[symbol_ids[0]].current_price == Decimal("3")
+    assert by_symbol[symbol_ids[0]].change_rate == Decimal("1.5")
+    assert by_symbol[symbol_ids[1]].current_price == Decimal("5")
@@ -0,0 +1,113 @@
+import pytest
+from sqlmodel import Session
+
+from app.crud import symbols as crud_symbol
+from app.models import SymbolCreate, SymbolUpdate
+from app.tests.utils.market import create_random_exchange, create_random_symbol
+from app.tests.utils.utils import random_lower_string
+
+
+def test_symbol_exists(db: Session) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+    assert crud_symbol.symbol_exists(session=db, symbol_id=symbol.id)
+    # 두 번째 호출은 캐시에서 응답
+    assert crud_symbol.symbol_exists(session=db, symbol_id=symbol.id)
+
+    assert crud_symbol.delete_symbol(session=db, symbol_id=symbol.id)
+    assert not crud_symbol.symbol_exists(session=db, symbol_id=symbol.id)
+
+
+def test_symbol_exists_unknown_id(db: Session) -> None:
+    assert not crud_symbol.symbol_exists(session=db, symbol_id=2_000_000_000)
+
+
+def test_create_symbol_without_commit(db: Session) -> None:
+    exchange = create_random_exchange(db)
+    assert exchange.id is not None
+    symbol_in = SymbolCreate(
+        exchange_id=exchange.id, symbol=random_lower_string()[:20], symbol_type="STOCK"
+    )
+
+    # flush만 수행되므로 PK는 채워지지만 rollback하면 남지 않음
+    symbol = crud_symbol.create_symbol(
+        session=db, symbol_create=symbol_in, commit=False
+    )
+    symbol_id = symbol.id
+    assert symbol_id is not None
+    db.rollback()
+    assert not crud_symbol.symbol_exists(session=db, symbol_id=symbol_id)
+
+
+def test_get_symbol_id_by_exchange_and_code(db: Session) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+    lookup = {"exchange_id": symbol.exchange_id, "symbol": symbol.symbol}
+    get_id = crud_symbol.get_symbol_id_by_exchange_and_code
+    assert get_id(session=db, **lookup) == symbol.id
+    # 두 번째 호출은 캐시에서 응답
+    assert get_id(session=db, **lookup) == symbol.id
+
+    assert crud_symbol.delete_symbol(session=db, symbol_id=symbol.id)
+    assert get_id(session=db, **lookup) is None
+
+
+def test_get_symbols_by_ids(db: Session) -> None:
+    symbols = [create_random_symbol(db) for _ in range(2)]
+    symbol_ids = [symbol.id for symbol in symbols]
+
+    found = crud_symbol.get_symbols_by_ids(
+        session=db, symbol_ids=[*symbol_ids, 2_000_000_000]
+    )
+    assert sorted(found) == sorted(symbol_ids)
+    assert crud_symbol.get_symbols_by_ids(session=db, symbol_ids=[]) == {}
+
+
+def test_touch_symbol(db: Session) -> None:
+    symbol = create_random_symbol(db)
+    assert symbol.id is not None
+
+    updated_before = symbol.updated_at
+    touch = crud_symbol.touch_symbol
+    symbol_in = SymbolUpdate(base_asset="KRW")
+    assert touch(session=db, symbol_id=symbol.id, symbol_in=symbol_in) == 1
+    assert touch(session=db, symbol_id=2_000_000_000, symbol_in=symbol_in) == 0
+    db_symbol = crud_symbol.get_symbol(session=db, symbol_id=symbol.id)
+    assert db_symbol is not None
+    assert db_symbol.base_asset == "KRW"
+    assert db_symbol.updated_at > updated_before
+
+    # 수정할 필드가 없으면 빈 SET 절을 보내지 않고 거부
+    with pytest.raises(ValueError):
+        touch(session=db, symbol_id=symbol.id, symbol_in=SymbolUpdate())
+
+
+def test_bulk_upsert_symbols(db: Session) -> None:
+    exchange = create_random_exchange(db)
+    codes = [random_lower_string()[:20] for _ in range(3)]
+    symbols_data = [
+        {
+            "exchange_id": exchange.id,
+            "symbol": code,
+            "base_asset": "before",
+            "symbol_type": "STOCK",
+        }
+        for code in codes
+    ]
+
+    upsert = crud_symbol.bulk_upsert_symbols
+    assert upsert(session=db, symbols_data=symbols_data[:2], batch_size=1) == (2, 0)
+
+    for data in symbols_data:
+        data["base_asset"] = "after"
+    assert upsert(session=db, symbols_data=symbols_data) == (1, 2)
+    assert upsert(session=db, symbols_data=[]) == (0, 0)
+    assert (
+        crud_symbol.count_symbols_by_exchange(session=db, exchange_id=exchange.id) == 3
+    )
+
+    symbol = crud_symbol.get_symbol_by_exchange_and_code(
+        session=db, exchange_id=exchange.id, symbol=codes[0]
+    )
+    assert symbol is not None
+    assert symbol.base_asset == "after"
@@ -0,0 +1,26 @@
+from sqlmodel import Session
+
+from app.crud import exchanges as crud_exchange
+from app.crud import symbols as crud_symbol
+from app.models import Exchange, ExchangeCreate, Symbol, SymbolCreate
+from app.tests.utils.utils import random_lower_string
+
+
+def create_random_exchange(db: Session) -> Exchange:
+    exchange_in = ExchangeCreate(
+        code=random_lower_string()[:20], name=random_lower_string()
+    )
+    return crud_exchange.create_exchange(session=db, exchange_create=exchange_in)
+
+
+def create_random_symbol(db: Session, *, exchange_id: int | None = None) -> Symbol:
+    if exchange_id is None:
+        exchange = create_random_exchange(db)
+        assert exchange.id is not None
+        exchange_id = exchange.id
+    symbol_in = SymbolCreate(
+        exchange_id=exchange_id,
+        symbol=random_lower_string()[:20],
+        symbol_type="STOCK",
+    )
+    return crud_symbol.create_symbol(session=db, symbol_create=symbol_in)
@@ -62,7 +62,7 @@ async def collect_upbit_prices(
 
 def collect_kis_prices(
     market: str | None = None,
-    days_back: int = 1,
+    days_back: int | None = None,
     limit: int | None = None,
 ):
     """
@@ -70,7 +70,8 @@ def collect_kis_prices(
 
     Args:
         market: Market filter ('KOSPI', 'KOSDAQ', or None for all)
-        days_back: Number of days to go back from today
+        days_back: Re-fetch this many days back from today for every symbol
+            (None: only the days after each symbol's latest stored bar)
         limit: Maximum number of symbols to process (None for all)
     """
     logger.info("Starting KIS price data collection (using pykrx)...")
@@ -98,8 +99,14 @@ def collect_kis_prices(
             raise
 
 
-async def main():
-    """Main entry point for price data collection."""
+async def main(argv: list[str] | None = None):
+    """
+    Main entry point for price data collection.
+
+    Args:
+        argv: Command line arguments (default: sys.argv[1:]). The scheduler
+            passes its own list so it never reads the host process's argv.
+    """
     parser = argparse.ArgumentParser(
         description="Collect historical price data from exchanges"
     )
@@ -112,8 +119,10 @@ async def main():
     parser.add_argument(
         "--days-back",
         type=int,
-        default=1,
-        help="Number of days to go back from today (default: 1)",
+        default=None,
+        help="Number of days to go back from today. For KIS this re-fetches "
+        "the whole range for every symbol (backfill); when omitted, KIS fetches "
+        "only the days after each symbol's latest stored bar and Upbit uses 1",
     )
     parser.add_argument(
         "--limit",
@@ -135,12 +144,14 @@ async def main():
         choices=["KOSPI", "KOSDAQ"],
         help="Market filter for KIS (default: None - all markets)",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     try:
         if args.exchange == "upbit":
             await collect_upbit_prices(
-                timeframe=args.timeframe, days_back=args.days_back, limit=args.limit
+                timeframe=args.timeframe,
+                days_back=args.days_back or 1,
+                limit=args.limit,
             )
         elif args.exchange == "kis":
             collect_kis_prices(
@@ -151,7 +162,9 @@ async def main():
         elif args.exchange == "all":
             logger.info("--- Collecting from all exchanges: Upbit and KIS ---")
             await collect_upbit_prices(
-                timeframe=args.timeframe, days_back=args.days_back, limit=args.limit
+                timeframe=args.timeframe,
+                days_back=args.days_back or 1,
+                limit=args.limit,
             )
             logger.info("\n" + "-" * 20 + "\n")
             collect_kis_prices(